@@ -134,6 +134,7 @@ class Settings:
     retrieval_lexical_weight: float
     retrieval_vector_weight: float
     retrieval_debug_stats: bool
+    retrieval_cache_ttl_s: float  # 0 disables the query-path retrieval cache
 
     # ---- Answering ----
     llm_provider: str  # extractive | openai | gemini | ollama
@@ -158,6 +159,11 @@ class Settings:
     ocr_max_pages: int
     ocr_dpi: int
     ocr_min_chars: int
+    # Worker processes for OCR (1 = OCR pages in-process, one at a time; 0 = one per usable
+    # CPU, capped). Each worker loads PyMuPDF and Tesseract, so parallelism is opt-in.
+    ocr_workers: int
+    # Only OCR low-text pages that embed at least one image (skips short title/blank pages).
+    ocr_require_image: bool
 
     @property
     def effective_llm_provider(self) -> str:
@@ -233,6 +239,7 @@ def load_settings() -> Settings:
     retrieval_lexical_weight = max(0.0, _env_float("RETRIEVAL_LEXICAL_WEIGHT", 0.5))
     retrieval_vector_weight = max(0.0, _env_float("RETRIEVAL_VECTOR_WEIGHT", 0.5))
     retrieval_debug_stats = _env_bool("RETRIEVAL_DEBUG_STATS", False)
+    retrieval_cache_ttl_s = max(0.0, _env_float("RETRIEVAL_CACHE_TTL_S", 30.0))
 
     llm_provider = _env_str("LLM_PROVIDER", "extractive").lower().strip()
     if llm_provider not in _ALLOWED_LLM_PROVIDERS:
@@ -255,6 +262,8 @@ def load_settings() -> Settings:
     ocr_max_pages = _env_int("OCR_MAX_PAGES", 10)
     ocr_dpi = _env_int("OCR_DPI", 200)
     ocr_min_chars = _env_int("OCR_MIN_CHARS", 40)
+    ocr_workers = max(0, _env_int("OCR_WORKERS", 1))
+    ocr_require_image = _env_bool("OCR_REQUIRE_IMAGE", True)
 
     s = Settings(
         version=_env_str("APP_VERSION", get_version()),
@@ -294,6 +303,7 @@ def load_settings() -> Settings:
         retrieval_lexical_weight=retrieval_lexical_weight,
         retrieval_vector_weight=retrieval_vector_weight,
         retrieval_debug_stats=retrieval_debug_stats,
+        retrieval_cache_ttl_s=retrieval_cache_ttl_s,
         llm_provider=llm_provider,
         max_context_chunks=max_context_chunks,
         openai_api_key=openai_api_key,
@@ -308,6 +318,8 @@ def load_settings() -> Settings:
         ocr_max_pages=ocr_max_pages,
         ocr_dpi=ocr_dpi,
         ocr_min_chars=ocr_min_chars,
+        ocr_workers=ocr_workers,
+        ocr_require_image=ocr_require_image,
     )
 
     # Safety-first overrides for public demos.
@@ -354,6 +366,7 @@ def load_settings() -> Settings:
             retrieval_lexical_weight=s.retrieval_lexical_weight,
             retrieval_vector_weight=s.retrieval_vector_weight,
             retrieval_debug_stats=s.retrieval_debug_stats,
+            retrieval_cache_ttl_s=s.retrieval_cache_ttl_s,
             llm_provider="extractive",
             max_context_chunks=s.max_context_chunks,
             openai_api_key=None,
@@ -368,6 +381,8 @@ def load_settings() -> Settings:
             ocr_max_pages=s.ocr_max_pages,
             ocr_dpi=s.ocr_dpi,
             ocr_min_chars=s.ocr_min_chars,
+            ocr_workers=s.ocr_workers,
+            ocr_require_image=s.ocr_require_image,
         )
 
     return s
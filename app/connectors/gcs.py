@@ -120,6 +120,18 @@ def download_object_to_file(
             f.write(chunk)
 
 
+def connector_notes(bucket: str, name: str, generation: str | None) -> str:
+    """Provenance note appended to ingest events for a GCS object.
+
+    The notify endpoint matches this exact string to recognise redelivered events.
+    """
+
+    return json.dumps(
+        {"connector": "gcs", "bucket": bucket, "name": name, "generation": generation},
+        separators=(",", ":"),
+    )
+
+
 def ingest_object(
     *,
     bucket: str,
@@ -173,11 +185,7 @@ def ingest_object(
 
         local_size = int(tmp_path.stat().st_size) if tmp_path.exists() else size_hint
         extra_notes = notes or ""
-        connector_notes = json.dumps(
-            {"connector": "gcs", "bucket": bucket_name, "name": name, "generation": generation},
-            separators=(",", ":"),
-        )
-        merged_notes = (extra_notes + "\n\n" + connector_notes).strip()
+        merged_notes = (extra_notes + "\n\n" + connector_notes(bucket_name, name, generation)).strip()
 
         res = ingest_file(
             tmp_path,
@@ -279,11 +287,7 @@ def sync_prefix(
             try:
                 download_object_to_file(bucket=bucket, name=obj.name, dest_path=tmp_path, client=client, token=token)
                 extra_notes = notes or ""
-                connector_notes = json.dumps(
-                    {"connector": "gcs", "bucket": bucket, "name": obj.name, "generation": obj.generation},
-                    separators=(",", ":"),
-                )
-                merged_notes = (extra_notes + "\n\n" + connector_notes).strip()
+                merged_notes = (extra_notes + "\n\n" + connector_notes(bucket, obj.name, obj.generation)).strip()
 
                 res = ingest_file(
                     tmp_path,
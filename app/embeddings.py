@@ -103,9 +103,14 @@ class SentenceTransformerEmbedder:
 
 
 def cosine_sim(query_vec: np.ndarray, mat: np.ndarray) -> np.ndarray:
-    """Cosine similarity between query vector (dim,) and matrix (n, dim)."""
+    """Cosine similarity between query vector (dim,) and matrix (n, dim).
+
+    Both sides are expected to be L2-normalized already (embedders normalize at
+    encode time), so this is a single float32 matrix-vector product. Inputs that
+    are already float32 are used as-is rather than copied.
+    """
     if mat.shape[0] == 0:
         return np.zeros((0,), dtype=np.float32)
-    q = query_vec.astype(np.float32)
-    m = mat.astype(np.float32)
+    q = query_vec.astype(np.float32, copy=False)
+    m = mat.astype(np.float32, copy=False)
     return m @ q
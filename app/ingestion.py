@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import functools
 import hashlib
-import json
 import logging
 import re
 import time
@@ -17,6 +17,7 @@ from .config import settings
 from .contracts.tabular_contract import TabularSnapshot, build_snapshot, load_contract, validate_snapshot
 from .embeddings import Embedder, HashEmbedder, NoEmbedder, SentenceTransformerEmbedder
 from .index_maintenance import ensure_index_compatible
+from .jsonutil import dumps as json_dumps
 from .metadata import normalize_classification, normalize_retention, normalize_tags
 from .ocr import extract_text_from_pdf
 from .storage import (
@@ -36,14 +37,23 @@ from .storage import (
 from .tenant import scope_doc_id
 
 
+@functools.lru_cache(maxsize=8)
+def _pgvector_format(dim: int) -> str:
+    # %.9g round-trips float32 exactly and is shorter than repr() of the widened double.
+    return "[" + ",".join(["%.9g"] * dim) + "]"
+
+
 def _vec_to_pgvector_literal(vec: np.ndarray) -> str:
-    """Convert a 1D numpy vector to pgvector text format: "[1,2,3]"."""
+    """Convert a 1D numpy vector to pgvector text format: "[1,2,3]".
+
+    Formats all elements with one %-operation on a per-dimension template instead
+    of a Python-level str() per element.
+    """
     v = vec.astype(np.float32).reshape(-1)
     n = float(np.linalg.norm(v))
     if n > 0:
         v = v / n
-    vals = v.tolist()
-    return "[" + ",".join(str(float(x)) for x in vals) + "]"
+    return _pgvector_format(int(v.size)) % tuple(v.tolist())
 
 
 logger = logging.getLogger(__name__)
@@ -202,7 +212,7 @@ def ingest_text(
     cls = normalize_classification(classification)
     ret = normalize_retention(retention)
     tag_list = normalize_tags(tags)
-    tags_json = json.dumps(tag_list, ensure_ascii=False)
+    tags_json = json_dumps(tag_list)
 
     chunks = chunk_text(text, settings.chunk_size_chars, settings.chunk_overlap_chars)
     chunk_objs: list[Chunk] = []
@@ -247,7 +257,7 @@ def ingest_text(
         if effective_validation_status == "pass" and inferred_drifted:
             effective_validation_status = "warn"
         validation_errors_json = (
-            json.dumps(validation_errors or [], ensure_ascii=False) if validation_errors is not None else None
+            json_dumps(validation_errors or []) if validation_errors is not None else None
         )
 
         upsert_doc(
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from importlib import import_module
+from typing import Any
+
+# orjson is an optional extra (`uv sync --extra speedups`). Without it we fall
+# back to the stdlib encoder.
+_orjson: Any
+try:
+    _orjson = import_module("orjson")
+except Exception:  # pragma: no cover - depends on installed extras
+    _orjson = None
+
+HAS_ORJSON = _orjson is not None
+
+_ORJSON_OPTS = _orjson.OPT_NON_STR_KEYS if _orjson is not None else 0
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize `obj` to compact UTF-8 JSON bytes (non-ASCII is kept, not escaped).
+
+    The stdlib fallback matches Starlette's `JSONResponse.render`: no whitespace
+    after separators, and NaN/Infinity raise `ValueError`.
+    """
+
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_ORJSON_OPTS)
+        except TypeError:
+            # orjson rejects a few inputs stdlib accepts (e.g. >64-bit ints).
+            pass
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize `obj` to a JSON str (equivalent to `json.dumps(obj, ensure_ascii=False)`)."""
+
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_ORJSON_OPTS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Parse JSON from str or UTF-8 bytes."""
+
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
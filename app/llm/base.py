@@ -20,12 +20,42 @@ class Answer:
     provider: str = "unknown"
 
 
+class ContextChunk(Protocol):
+    """Attribute view of a context entry (e.g. `app.retrieval.RetrievedChunk`)."""
+
+    @property
+    def chunk_id(self) -> str: ...
+
+    @property
+    def doc_id(self) -> str: ...
+
+    @property
+    def idx(self) -> int: ...
+
+    @property
+    def text(self) -> str: ...
+
+
+ContextEntry = tuple[str, str, int, str] | ContextChunk
+
+
+def context_fields(entry: ContextEntry) -> tuple[str, str, int, str]:
+    """Return (chunk_id, doc_id, idx, text) for a tuple or attribute-style entry."""
+    if isinstance(entry, tuple):
+        return entry
+    return entry.chunk_id, entry.doc_id, entry.idx, entry.text
+
+
 class AnswerProvider(Protocol):
     name: str
 
     def answer(self, question: str, context: list[tuple[str, str, int, str]]) -> Answer:
         """
         context entries are (chunk_id, doc_id, idx, text)
+
+        Providers that set `accepts_retrieved = True` also accept `ContextChunk`
+        entries, which lets the API hand over retrieval results without copying
+        them into tuples first.
         """
         ...
 
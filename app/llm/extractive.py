@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import re
-from typing import Iterator
+from typing import Iterator, Sequence
 
-from .base import Answer, Citation
+from .base import Answer, Citation, ContextEntry, context_fields
 
 _SENT_RE = re.compile(r"(?<=[.!?])\s+")
 
@@ -15,8 +15,9 @@ class ExtractiveAnswerer:
     """
 
     name = "extractive"
+    accepts_retrieved = True
 
-    def stream_answer(self, question: str, context: list[tuple[str, str, int, str]]) -> Iterator[str]:
+    def stream_answer(self, question: str, context: Sequence[ContextEntry]) -> Iterator[str]:
         ans = self.answer(question, context)
         text = (ans.text or "").strip()
         if not text:
@@ -28,7 +29,7 @@ class ExtractiveAnswerer:
         for p in parts:
             yield p
 
-    def answer(self, question: str, context: list[tuple[str, str, int, str]]) -> Answer:
+    def answer(self, question: str, context: Sequence[ContextEntry]) -> Answer:
         if not context:
             return Answer(
                 text="I don't have enough information in the provided sources to answer that.",
@@ -41,7 +42,8 @@ class ExtractiveAnswerer:
         chosen: list[str] = []
         citations: list[Citation] = []
 
-        for chunk_id, doc_id, idx, text in context[:3]:
+        for entry in context[:3]:
+            chunk_id, doc_id, idx, text = context_fields(entry)
             # Pick up to 2 sentences that overlap with question terms
             sents = _SENT_RE.split(text.strip())
             picked: list[str] = []
@@ -2,22 +2,37 @@ from __future__ import annotations
 
 import base64
 import binascii
+import contextvars
+import functools
+import gzip
 import hashlib
-import json
+import heapq
 import logging
+import os
 import re
+import threading
 import time
 import uuid
 import asyncio
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Iterable, Iterator
 
 from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
+from starlette.routing import Match
 
 from .answering import get_answerer
 from .auth import AuthContext, AuthError, effective_auth_mode, require_role, resolve_auth_context
@@ -25,6 +40,9 @@ from .bootstrap import bootstrap_demo_corpus
 from .config import settings
 from .eval import run_eval
 from .ingestion import ingest_file, ingest_text
+from .jsonutil import dumps as json_dumps
+from .jsonutil import dumps_bytes as json_dumps_bytes
+from .jsonutil import loads as json_loads
 from .metadata import CLASSIFICATIONS, RETENTIONS, normalize_classification, normalize_retention, normalize_tags
 from .otel import (
     record_generation_metric,
@@ -42,19 +60,26 @@ from .observability import (
     parse_cloud_trace_context,
     request_id_from_headers,
 )
-from .ratelimit import SlidingWindowRateLimiter
-from .retrieval import RetrievedChunk, effective_hybrid_weights, invalidate_cache, retrieve
+from .ratelimit import SlidingWindowRateLimiter, client_key
+from .retrieval import RetrievedChunk, cache_version, effective_hybrid_weights, invalidate_cache, retrieve
 from .safety import detect_prompt_injection
 from .storage import (
+    DocRef,
+    begin_immediate,
     complete_ingestion_run,
     connect,
+    connect_pooled,
     create_ingestion_run,
     delete_doc,
     get_eval_run,
-    get_chunk,
+    get_chunk_with_doc,
+    get_doc_refs_by_ids,
     get_doc,
     get_ingestion_run,
-    get_meta,
+    get_latest_chunk_overlap,
+    get_meta_many,
+    get_stats_agg,
+    latest_ingest_note_for_source,
     get_previous_eval_run,
     init_db,
     insert_eval_run,
@@ -64,188 +89,194 @@ from .storage import (
     list_ingest_events_for_run,
     update_doc_metadata,
     list_ingestion_runs,
-    list_all_chunks_for_doc,
+    count_chunks_for_doc,
+    list_chunk_texts_for_doc,
     list_chunks_for_doc,
     list_docs,
     list_ingest_events,
     list_recent_ingest_events,
+    top_doc_tags,
 )
-from .tenant import reset_tenant_id, set_tenant_id
+from .tenant import current_tenant_id, reset_tenant_id, set_tenant_id
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
 
-_STOPWORDS = {
-    "a",
-    "an",
-    "the",
-    "and",
-    "or",
-    "but",
-    "if",
-    "then",
-    "else",
-    "when",
-    "while",
-    "to",
-    "of",
-    "for",
-    "in",
-    "on",
-    "at",
-    "by",
-    "with",
-    "about",
-    "against",
-    "between",
-    "into",
-    "through",
-    "during",
-    "before",
-    "after",
-    "above",
-    "below",
-    "from",
-    "up",
-    "down",
-    "out",
-    "over",
-    "under",
-    "again",
-    "further",
-    "once",
-    "here",
-    "there",
-    "all",
-    "any",
-    "both",
-    "each",
-    "few",
-    "more",
-    "most",
-    "other",
-    "some",
-    "such",
-    "no",
-    "nor",
-    "not",
-    "only",
-    "own",
-    "same",
-    "so",
-    "than",
-    "too",
-    "very",
-    "can",
-    "will",
-    "just",
-    "should",
-    "could",
-    "would",
-    "may",
-    "might",
-    "must",
-    "do",
-    "does",
-    "did",
-    "doing",
-    "done",
-    "is",
-    "are",
-    "was",
-    "were",
-    "be",
-    "been",
-    "being",
-    "have",
-    "has",
-    "had",
-    "having",
-    "i",
-    "you",
-    "he",
-    "she",
-    "it",
-    "we",
-    "they",
-    "me",
-    "him",
-    "her",
-    "us",
-    "them",
-    "my",
-    "your",
-    "yours",
-    "his",
-    "hers",
-    "its",
-    "our",
-    "their",
-    "what",
-    "which",
-    "who",
-    "whom",
-    "whose",
-    "where",
-    "when",
-    "why",
-    "how",
-    "tell",
-    "show",
-    "explain",
-    "describe",
-    "list",
-    "give",
-    "summarize",
-    "summarise",
-    "define",
-    "meaning",
-    "mean",
-    "means",
-    "stand",
-    "stands",
-    "refers",
-    "refer",
-    "related",
-    "relation",
-    "relate",
-    "about",
-    "information",
-    "info",
-    "source",
-    "sources",
-    "provided",
-    "provide",
-    "using",
-    "use",
-    "used",
-    "usage",
-    "vs",
-    "versus",
-    "example",
-    "examples",
-    "please",
-    "thanks",
-    "thank",
-}
+_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "the",
+        "and",
+        "or",
+        "but",
+        "if",
+        "then",
+        "else",
+        "when",
+        "while",
+        "to",
+        "of",
+        "for",
+        "in",
+        "on",
+        "at",
+        "by",
+        "with",
+        "about",
+        "against",
+        "between",
+        "into",
+        "through",
+        "during",
+        "before",
+        "after",
+        "above",
+        "below",
+        "from",
+        "up",
+        "down",
+        "out",
+        "over",
+        "under",
+        "again",
+        "further",
+        "once",
+        "here",
+        "there",
+        "all",
+        "any",
+        "both",
+        "each",
+        "few",
+        "more",
+        "most",
+        "other",
+        "some",
+        "such",
+        "no",
+        "nor",
+        "not",
+        "only",
+        "own",
+        "same",
+        "so",
+        "than",
+        "too",
+        "very",
+        "can",
+        "will",
+        "just",
+        "should",
+        "could",
+        "would",
+        "may",
+        "might",
+        "must",
+        "do",
+        "does",
+        "did",
+        "doing",
+        "done",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "having",
+        "i",
+        "you",
+        "he",
+        "she",
+        "it",
+        "we",
+        "they",
+        "me",
+        "him",
+        "her",
+        "us",
+        "them",
+        "my",
+        "your",
+        "yours",
+        "his",
+        "hers",
+        "its",
+        "our",
+        "their",
+        "what",
+        "which",
+        "who",
+        "whom",
+        "whose",
+        "where",
+        "when",
+        "why",
+        "how",
+        "tell",
+        "show",
+        "explain",
+        "describe",
+        "list",
+        "give",
+        "summarize",
+        "summarise",
+        "define",
+        "meaning",
+        "mean",
+        "means",
+        "stand",
+        "stands",
+        "refers",
+        "refer",
+        "related",
+        "relation",
+        "relate",
+        "about",
+        "information",
+        "info",
+        "source",
+        "sources",
+        "provided",
+        "provide",
+        "using",
+        "use",
+        "used",
+        "usage",
+        "vs",
+        "versus",
+        "example",
+        "examples",
+        "please",
+        "thanks",
+        "thank",
+    }
+)
 
-_RELATIONSHIP_TERMS = {
-    "related",
-    "relationship",
-    "relate",
-    "between",
-    "compare",
-    "comparison",
-    "difference",
-    "different",
-    "vs",
-    "versus",
-    "associate",
-    "associated",
-    "link",
-    "linked",
-    "connection",
-    "connected",
-}
+_RELATIONSHIP_TERMS = frozenset(
+    {
+        "related",
+        "relationship",
+        "relate",
+        "between",
+        "compare",
+        "comparison",
+        "difference",
+        "different",
+        "vs",
+        "versus",
+        "associate",
+        "associated",
+        "link",
+        "linked",
+        "connection",
+        "connected",
+    }
+)
 
 
 # ---- Security headers ----
@@ -264,6 +295,17 @@ _CSP_SWAGGER = (
 )
 
 
+_STATIC_SEC_HEADERS: dict[str, str] = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "no-referrer",
+    "Permissions-Policy": "camera=(), microphone=(), geolocation=(), payment=()",
+}
+_HSTS = "max-age=31536000; includeSubDomains"
+_NO_STORE_HEADERS: dict[str, str] = {"Cache-Control": "no-store", "Pragma": "no-cache"}
+
+
+@functools.lru_cache(maxsize=512)
 def _csp_for_path(path: str) -> str:
     p = path or ""
     # Swagger/Redoc need a looser CSP (inline/eval) to run correctly.
@@ -272,7 +314,24 @@ def _csp_for_path(path: str) -> str:
     return _CSP_STRICT
 
 
-def _term_variants(term: str) -> list[str]:
+@functools.lru_cache(maxsize=512)
+def _response_headers_for_path(path: str) -> tuple[tuple[str, str], ...]:
+    """Security (and, for API/probe routes, no-store) headers for `path`.
+
+    Resolved once per distinct path so responses only merge a cached tuple.
+    """
+
+    headers = dict(_STATIC_SEC_HEADERS)
+    headers["Content-Security-Policy"] = _csp_for_path(path)
+    # Avoid caching API responses in browsers/proxies.
+    # (Useful for private deployments where responses may contain sensitive snippets.)
+    if path.startswith("/api/") or path in ("/health", "/ready"):
+        headers.update(_NO_STORE_HEADERS)
+    return tuple(headers.items())
+
+
+@functools.lru_cache(maxsize=4096)
+def _term_variants(term: str) -> tuple[str, ...]:
     variants = [term]
     if term.endswith("ies") and len(term) > 4:
         variants.append(f"{term[:-3]}y")
@@ -280,44 +339,81 @@ def _term_variants(term: str) -> list[str]:
         variants.append(term[:-2])
     if term.endswith("s") and len(term) > 3:
         variants.append(term[:-1])
-    return variants
+    return tuple(variants)
+
+
+_NON_ALPHA_TOKEN_CHARS = "0123456789_"
+
+
+@functools.lru_cache(maxsize=2048)
+def _tokens_and_flags(question: str) -> tuple[tuple[str, ...], bool]:
+    """Return (key_terms, is_relationship_question) from one tokenizer pass.
+
+    Key terms are lowercased tokens that are not stopwords, have at least three
+    characters, and contain a letter.
+    """
+    tokens = _TOKEN_RE.findall((question or "").lower())
+    terms = tuple(t for t in tokens if len(t) >= 3 and t not in _STOPWORDS and t.strip(_NON_ALPHA_TOKEN_CHARS))
+    return terms, not _RELATIONSHIP_TERMS.isdisjoint(tokens)
+
+
+@functools.lru_cache(maxsize=1024)
+def _search_terms(query: str) -> tuple[str, tuple[str, ...], tuple[str, ...]]:
+    """Parse a chunk-search query once: (fts_query, distinct terms, LIKE patterns).
+
+    Tokens are lowercased in one pass and stopwords dropped. Cached because the
+    UI tends to repeat the same searches.
+    """
+    tokens = [t for t in _TOKEN_RE.findall(query.lower()) if t not in _STOPWORDS]
+    terms = tuple(dict.fromkeys(tokens))
+    return " ".join(tokens), terms, tuple(_like_contains(t) for t in terms)
 
 
 def _extract_key_terms(question: str) -> list[str]:
-    tokens = [t.lower() for t in _TOKEN_RE.findall(question or "")]
-    terms = []
-    for t in tokens:
-        if t in _STOPWORDS:
-            continue
-        if len(t) < 3:
-            continue
-        if not any(ch.isalpha() for ch in t):
-            continue
-        terms.append(t)
-    return terms
+    return list(_tokens_and_flags(question)[0])
+
 
+@functools.lru_cache(maxsize=1024)
+def _term_matcher(terms: tuple[str, ...]) -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    """Compile one scan over every variant of `terms`.
 
-def _is_relationship_question(question: str) -> bool:
-    tokens = {t.lower() for t in _TOKEN_RE.findall(question or "")}
-    return any(t in _RELATIONSHIP_TERMS for t in tokens)
+    The lookahead reports the longest variant starting at each offset. Every
+    shorter variant at that offset is a prefix of it, so a hit also implies
+    the terms behind those prefixes; this keeps plain substring semantics.
+    """
+    variant_terms: dict[str, set[str]] = {}
+    for term in terms:
+        for v in _term_variants(term):
+            variant_terms.setdefault(v, set()).add(term)
+    variants = sorted(variant_terms, key=len, reverse=True)
+    implied = {w: frozenset(t for v, ts in variant_terms.items() if w.startswith(v) for t in ts) for w in variants}
+    pattern = re.compile("(?=(" + "|".join(re.escape(v) for v in variants) + "))")
+    return pattern, implied
 
 
 def _is_unrelated_question(question: str, retrieved: list[Any]) -> bool:
-    terms = _extract_key_terms(question)
+    terms, is_relationship = _tokens_and_flags(question)
     if not terms:
         return False
-    text = " ".join(r.text for r in retrieved[: settings.max_context_chunks]).lower()
-    if not text:
-        return True
-    hits = 0
-    for term in terms:
-        if any(v in text for v in _term_variants(term)):
-            hits += 1
+    pattern, implied = _term_matcher(terms)
+    wanted = len(set(terms))
+    matched: set[str] = set()
+    # Variants never contain whitespace, so scanning chunk by chunk matches the
+    # same terms as scanning the joined context, and can stop at the first
+    # chunk that completes the set.
+    for r in retrieved[: settings.max_context_chunks]:
+        for m in pattern.finditer(r.text.lower()):
+            matched |= implied[m.group(1)]
+            if len(matched) == wanted:
+                break
+        if len(matched) == wanted:
+            break
+    hits = sum(1 for term in terms if term in matched)
 
     if hits == 0:
         return True
 
-    if _is_relationship_question(question) and len(terms) >= 2:
+    if is_relationship and len(terms) >= 2:
         return hits < len(terms)
 
     if len(terms) <= 2:
@@ -331,6 +427,13 @@ WEB_DIR = (APP_DIR.parent / "web").resolve()
 DIST_DIR = (WEB_DIR / "dist").resolve()
 
 
+class _JSONResponse(JSONResponse):
+    """Default response class: renders through the shared encoder (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps_bytes(content)
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """FastAPI lifespan.
@@ -354,6 +457,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=_JSONResponse,
 )
 
 # Configure JSON logging early so Cloud Run/Cloud Logging parses fields.
@@ -371,6 +475,10 @@ _limiter = SlidingWindowRateLimiter(
 )
 
 
+# Parsed once; settings are immutable for the life of the process.
+_RATE_LIMIT_SCOPE = (settings.rate_limit_scope or "query").strip().lower()
+
+
 def _should_rate_limit(path: str) -> bool:
     """Decide whether to apply rate limiting for a given path.
 
@@ -379,8 +487,7 @@ def _should_rate_limit(path: str) -> bool:
     """
 
     p = path or ""
-    scope = (settings.rate_limit_scope or "query").strip().lower()
-    if scope == "api":
+    if _RATE_LIMIT_SCOPE == "api":
         if not p.startswith("/api/"):
             return False
         # Don't rate limit API docs; they can be chatty (assets + schema fetches).
@@ -415,7 +522,7 @@ def _log_auth_denied(*, request_id: str, path: str, status: int, reason: str) ->
     """Emit a dedicated auth-denied event for security/audit filtering."""
 
     logger.warning(
-        json.dumps(
+        json_dumps_bytes(
             {
                 "severity": "WARNING",
                 "event": "auth.denied",
@@ -424,8 +531,7 @@ def _log_auth_denied(*, request_id: str, path: str, status: int, reason: str) ->
                 "status": int(status),
                 "reason": reason,
                 "auth_mode": effective_auth_mode(),
-            },
-            ensure_ascii=False,
+            }
         )
     )
 
@@ -438,7 +544,7 @@ def _auth_denied_reason_from_response(request: Request, status: int, response: A
     body = getattr(response, "body", None)
     if isinstance(body, (bytes, bytearray)) and body:
         try:
-            payload = json.loads(body.decode("utf-8"))
+            payload = json_loads(body)
             detail = payload.get("detail")
             if isinstance(detail, str) and detail.strip():
                 return detail.strip()
@@ -448,21 +554,41 @@ def _auth_denied_reason_from_response(request: Request, status: int, response: A
     return "Unauthorized" if int(status) == 401 else "Forbidden"
 
 
+def _http_route(request: Request) -> str:
+    """Route template for HTTP metrics, e.g. `/api/docs/{doc_id}` rather than the raw path.
+
+    Templates keep metric attributes (and the attribute cache in `otel`) bounded.
+    Requests rejected before routing (auth, payload size, rate limit) are matched here.
+    """
+
+    route = request.scope.get("route")
+    if route is None:
+        for candidate in request.app.router.routes:
+            match, _ = candidate.matches(request.scope)
+            if match is not Match.NONE:
+                route = candidate
+                break
+    return str(getattr(route, "path", "") or "unmatched")
+
+
 @app.middleware("http")
 async def _request_middleware(request: Request, call_next):
     """Attach request ID, enforce demo safety controls, emit structured logs."""
 
     timer = Timer()
-    rid = request_id_from_headers({k.lower(): v for k, v in request.headers.items()})
+    path = request.url.path
+    # Starlette's Headers mapping is already case-insensitive.
+    req_headers = request.headers
+    rid = request_id_from_headers(req_headers)
     request.state.request_id = rid
 
     # Prefer X-Forwarded-For in managed environments (Cloud Run).
-    xff = request.headers.get("x-forwarded-for")
+    xff = req_headers.get("x-forwarded-for")
     remote_ip = (xff.split(",")[0].strip() if xff else None) or (request.client.host if request.client else "unknown")
-    user_agent = request.headers.get("user-agent", "")
+    user_agent = req_headers.get("user-agent", "")
 
     # Cloud Trace correlation (if present).
-    trace_id, span_id = parse_cloud_trace_context({k.lower(): v for k, v in request.headers.items()})
+    trace_id, span_id = parse_cloud_trace_context(req_headers)
 
     def _effective_trace_context() -> tuple[str | None, str | None]:
         nonlocal trace_id, span_id
@@ -482,13 +608,13 @@ async def _request_middleware(request: Request, call_next):
         latency_ms = timer.ms()
         _log_auth_denied(
             request_id=rid,
-            path=request.url.path,
+            path=path,
             status=int(ae.status_code),
             reason=str(ae.detail),
         )
         record_http_request_metric(
             method=request.method,
-            path=request.url.path,
+            route=_http_route(request),
             status_code=int(ae.status_code),
             latency_ms=latency_ms,
         )
@@ -497,7 +623,7 @@ async def _request_middleware(request: Request, call_next):
             request_id=rid,
             method=request.method,
             url=str(request.url),
-            path=request.url.path,
+            path=path,
             status=int(ae.status_code),
             latency_ms=latency_ms,
             remote_ip=remote_ip,
@@ -523,7 +649,7 @@ async def _request_middleware(request: Request, call_next):
         latency_ms = timer.ms()
         record_http_request_metric(
             method=request.method,
-            path=request.url.path,
+            route=_http_route(request),
             status_code=413,
             latency_ms=latency_ms,
         )
@@ -532,7 +658,7 @@ async def _request_middleware(request: Request, call_next):
             request_id=rid,
             method=request.method,
             url=str(request.url),
-            path=request.url.path,
+            path=path,
             status=413,
             latency_ms=latency_ms,
             remote_ip=remote_ip,
@@ -551,12 +677,12 @@ async def _request_middleware(request: Request, call_next):
 
     # ---- Rate limiting (defense-in-depth) ----
     # In demo mode this is enabled by default; private deployments can opt in via RATE_LIMIT_ENABLED=1.
-    if settings.rate_limit_enabled and _should_rate_limit(request.url.path):
-        if not _limiter.allow(remote_ip):
+    if settings.rate_limit_enabled and _should_rate_limit(path):
+        if not _limiter.allow(client_key(remote_ip)):
             latency_ms = timer.ms()
             record_http_request_metric(
                 method=request.method,
-                path=request.url.path,
+                route=_http_route(request),
                 status_code=429,
                 latency_ms=latency_ms,
             )
@@ -565,7 +691,7 @@ async def _request_middleware(request: Request, call_next):
                 request_id=rid,
                 method=request.method,
                 url=str(request.url),
-                path=request.url.path,
+                path=path,
                 status=429,
                 latency_ms=latency_ms,
                 remote_ip=remote_ip,
@@ -590,13 +716,13 @@ async def _request_middleware(request: Request, call_next):
         if int(he.status_code) in {401, 403}:
             _log_auth_denied(
                 request_id=rid,
-                path=request.url.path,
+                path=path,
                 status=int(he.status_code),
                 reason=str(he.detail),
             )
         record_http_request_metric(
             method=request.method,
-            path=request.url.path,
+            route=_http_route(request),
             status_code=int(he.status_code),
             latency_ms=latency_ms,
         )
@@ -605,7 +731,7 @@ async def _request_middleware(request: Request, call_next):
             request_id=rid,
             method=request.method,
             url=str(request.url),
-            path=request.url.path,
+            path=path,
             status=int(he.status_code),
             latency_ms=latency_ms,
             remote_ip=remote_ip,
@@ -621,7 +747,7 @@ async def _request_middleware(request: Request, call_next):
         latency_ms = timer.ms()
         record_http_request_metric(
             method=request.method,
-            path=request.url.path,
+            route=_http_route(request),
             status_code=500,
             latency_ms=latency_ms,
         )
@@ -630,7 +756,7 @@ async def _request_middleware(request: Request, call_next):
             request_id=rid,
             method=request.method,
             url=str(request.url),
-            path=request.url.path,
+            path=path,
             status=500,
             latency_ms=latency_ms,
             remote_ip=remote_ip,
@@ -647,37 +773,26 @@ async def _request_middleware(request: Request, call_next):
     response.headers["X-Request-Id"] = rid
 
     # Basic security headers (safe defaults for a SPA + JSON API).
-    response.headers.setdefault("X-Content-Type-Options", "nosniff")
-    response.headers.setdefault("X-Frame-Options", "DENY")
-    response.headers.setdefault("Referrer-Policy", "no-referrer")
-    response.headers.setdefault(
-        "Permissions-Policy",
-        "camera=(), microphone=(), geolocation=(), payment=()",
-    )
-    response.headers.setdefault("Content-Security-Policy", _csp_for_path(request.url.path))
+    headers = response.headers
+    for name, value in _response_headers_for_path(path):
+        headers.setdefault(name, value)
 
     # Only set HSTS when we're actually behind HTTPS.
-    if request.headers.get("x-forwarded-proto") == "https":
-        response.headers.setdefault("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
-
-    # Avoid caching API responses in browsers/proxies.
-    # (Useful for private deployments where responses may contain sensitive snippets.)
-    if request.url.path.startswith("/api/") or request.url.path in ("/health", "/ready"):
-        response.headers.setdefault("Cache-Control", "no-store")
-        response.headers.setdefault("Pragma", "no-cache")
+    if req_headers.get("x-forwarded-proto") == "https":
+        headers.setdefault("Strict-Transport-Security", _HSTS)
 
     latency_ms = timer.ms()
     status_code = int(response.status_code)
     if status_code in {401, 403}:
         _log_auth_denied(
             request_id=rid,
-            path=request.url.path,
+            path=path,
             status=status_code,
             reason=_auth_denied_reason_from_response(request, status_code, response),
         )
     record_http_request_metric(
         method=request.method,
-        path=request.url.path,
+        route=_http_route(request),
         status_code=status_code,
         latency_ms=latency_ms,
     )
@@ -686,7 +801,7 @@ async def _request_middleware(request: Request, call_next):
         request_id=rid,
         method=request.method,
         url=str(request.url),
-        path=request.url.path,
+        path=path,
         status=status_code,
         latency_ms=latency_ms,
         remote_ip=remote_ip,
@@ -699,24 +814,19 @@ async def _request_middleware(request: Request, call_next):
     return response
 
 
-@app.exception_handler(HTTPException)
-async def _http_exception_handler(request: Request, exc: HTTPException):
-    """Ensure error responses include X-Request-Id and basic security headers."""
+def _error_response_headers(request: Request) -> dict[str, str]:
     rid = getattr(request.state, "request_id", None)
-    headers: dict[str, str] = {}
-    if rid:
-        headers["X-Request-Id"] = rid
-    headers["X-Content-Type-Options"] = "nosniff"
-    headers["X-Frame-Options"] = "DENY"
-    headers["Referrer-Policy"] = "no-referrer"
-    headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=(), payment=()"
-    headers["Content-Security-Policy"] = _csp_for_path(request.url.path)
+    headers: dict[str, str] = {"X-Request-Id": rid} if rid else {}
+    headers.update(_response_headers_for_path(request.url.path))
     if request.headers.get("x-forwarded-proto") == "https":
-        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        headers["Strict-Transport-Security"] = _HSTS
+    return headers
+
 
-    if request.url.path.startswith("/api/") or request.url.path in ("/health", "/ready"):
-        headers["Cache-Control"] = "no-store"
-        headers["Pragma"] = "no-cache"
+@app.exception_handler(HTTPException)
+async def _http_exception_handler(request: Request, exc: HTTPException):
+    """Ensure error responses include X-Request-Id and basic security headers."""
+    headers = _error_response_headers(request)
 
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
 
@@ -724,21 +834,7 @@ async def _http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def _unhandled_exception_handler(request: Request, exc: Exception):
     """Return a safe JSON 500 (and keep request correlation + security headers)."""
-    rid = getattr(request.state, "request_id", None)
-    headers: dict[str, str] = {}
-    if rid:
-        headers["X-Request-Id"] = rid
-    headers["X-Content-Type-Options"] = "nosniff"
-    headers["X-Frame-Options"] = "DENY"
-    headers["Referrer-Policy"] = "no-referrer"
-    headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=(), payment=()"
-    headers["Content-Security-Policy"] = _csp_for_path(request.url.path)
-    if request.headers.get("x-forwarded-proto") == "https":
-        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-    if request.url.path.startswith("/api/") or request.url.path in ("/health", "/ready"):
-        headers["Cache-Control"] = "no-store"
-        headers["Pragma"] = "no-cache"
+    headers = _error_response_headers(request)
 
     return JSONResponse(status_code=500, content={"detail": "Internal Server Error"}, headers=headers)
 
@@ -804,18 +900,19 @@ def _first_nonempty_str(*values: Any) -> str:
     for value in values:
         if value is None:
             continue
-        s = str(value).strip()
+        # Pub/Sub attributes are already strings; only coerce JSON numbers.
+        s = (value if isinstance(value, str) else str(value)).strip()
         if s:
             return s
     return ""
 
 
-def _coerce_int_or_none(value: Any) -> int | None:
-    if value is None:
+def _coerce_int_or_none(value: str) -> int | None:
+    if not value:
         return None
     try:
-        return int(str(value).strip())
-    except Exception:
+        return int(value)
+    except ValueError:
         return None
 
 
@@ -828,8 +925,9 @@ def _decode_pubsub_message_data(raw_data: str) -> dict[str, Any]:
     except binascii.Error as e:
         raise ValueError("Invalid Pub/Sub message.data (base64 decode failed)") from e
     try:
-        payload = json.loads(decoded.decode("utf-8"))
-    except Exception as e:
+        # Parse the decoded bytes directly; no intermediate str copy.
+        payload = json_loads(decoded)
+    except (ValueError, RecursionError) as e:
         raise ValueError("Invalid Pub/Sub message.data (JSON decode failed)") from e
     if not isinstance(payload, dict):
         raise ValueError("Invalid Pub/Sub message.data (expected JSON object)")
@@ -843,9 +941,8 @@ def _extract_gcs_notify_payload(body: dict[str, Any]) -> dict[str, Any]:
 
     attributes = message.get("attributes")
     attrs = attributes if isinstance(attributes, dict) else {}
-    data_payload: dict[str, Any] = {}
-    if "data" in message and message.get("data") is not None:
-        data_payload = _decode_pubsub_message_data(str(message.get("data")))
+    raw_data = message.get("data")
+    data_payload = _decode_pubsub_message_data(str(raw_data)) if raw_data is not None else {}
 
     bucket = _first_nonempty_str(
         attrs.get("bucketId"),
@@ -889,24 +986,48 @@ _AUDIT_REDACT_KEY_FRAGMENTS = {
 }
 
 
+_AUDIT_REDACT_KEY_RE = re.compile(
+    "|".join(re.escape(fragment) for fragment in sorted(_AUDIT_REDACT_KEY_FRAGMENTS)),
+    re.IGNORECASE,
+)
+
+
 def _sanitize_audit_metadata(value: Any, *, key: str | None = None) -> Any:
-    if key is not None:
-        k = key.strip().lower()
-        if any(fragment in k for fragment in _AUDIT_REDACT_KEY_FRAGMENTS):
-            return "[redacted]"
-
-    if value is None or isinstance(value, (bool, int, float)):
-        return value
-    if isinstance(value, str):
-        return value[:500]
-    if isinstance(value, list):
-        return [_sanitize_audit_metadata(v) for v in value[:100]]
-    if isinstance(value, dict):
-        out: dict[str, Any] = {}
-        for k, v in value.items():
-            out[str(k)] = _sanitize_audit_metadata(v, key=str(k))
-        return out
-    return str(value)
+    """Redact sensitive keys, truncate strings, and cap list lengths.
+
+    Walks nested dicts/lists with an explicit stack rather than recursion.
+    """
+
+    if key is not None and _AUDIT_REDACT_KEY_RE.search(key):
+        return "[redacted]"
+
+    root: list[Any] = [None]
+    # (container, slot, value) — each value is sanitized and stored at container[slot].
+    stack: list[tuple[Any, Any, Any]] = [(root, 0, value)]
+    while stack:
+        container, slot, v = stack.pop()
+        if v is None or isinstance(v, (bool, int, float)):
+            container[slot] = v
+        elif isinstance(v, str):
+            container[slot] = v[:500]
+        elif isinstance(v, list):
+            items = v[:100]
+            out_list: list[Any] = [None] * len(items)
+            container[slot] = out_list
+            stack.extend((out_list, i, item) for i, item in enumerate(items))
+        elif isinstance(v, dict):
+            out: dict[str, Any] = {}
+            container[slot] = out
+            for k, child in v.items():
+                sk = str(k)
+                if _AUDIT_REDACT_KEY_RE.search(sk):
+                    out[sk] = "[redacted]"
+                else:
+                    out[sk] = None  # reserve the slot so key order is preserved
+                    stack.append((out, sk, child))
+        else:
+            container[slot] = str(v)
+    return root[0]
 
 
 def _record_audit_event(
@@ -919,8 +1040,9 @@ def _record_audit_event(
     target_id: str | None,
     metadata: dict[str, Any] | None = None,
 ) -> None:
-    metadata_obj = metadata or {}
-    metadata_json = json.dumps(_sanitize_audit_metadata(metadata_obj), ensure_ascii=False)
+    # Written on the caller's connection so the audit row commits (or rolls back)
+    # atomically with the action it records; no separate round trip is added.
+    metadata_json = json_dumps(_sanitize_audit_metadata(metadata or {}))
     request_id = getattr(getattr(request, "state", None), "request_id", None) if request is not None else None
     insert_audit_event(
         conn,
@@ -935,16 +1057,57 @@ def _record_audit_event(
     )
 
 
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
 def _sanitize_upload_filename(raw_name: str, *, default: str = "upload.txt") -> str:
     """Return a best-effort safe filename for temp storage and suffix checks."""
 
     safe_name = Path(str(raw_name or default)).name
-    safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", safe_name)
+    safe_name = _UNSAFE_FILENAME_CHARS_RE.sub("_", safe_name)
     if not safe_name:
         return default
     return safe_name
 
 
+_UPLOAD_COPY_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def _spooled_upload_size(src: Any, *, max_bytes: int) -> int:
+    # The form is fully parsed by the time an endpoint runs, so the spool's length is the
+    # upload size and oversized files are rejected before reading anything.
+    size = src.seek(0, 2)
+    if size > max_bytes:
+        raise ValueError(f"File too large (max {max_bytes} bytes)")
+    src.seek(0)
+    return size
+
+
+def _read_upload_text(src: Any, *, max_bytes: int) -> str:
+    """Decode a received text upload straight from Starlette's spool (universal newlines, like `read_text`)."""
+
+    _spooled_upload_size(src, max_bytes=max_bytes)
+    text = src.read().decode("utf-8")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _copy_upload_to_path(src: Any, dest: Path, *, max_bytes: int) -> int:
+    """Copy a received upload (Starlette's spooled temp file) to `dest`; returns bytes written.
+
+    Meant for a worker thread; data moves through one reused buffer.
+    """
+
+    size = _spooled_upload_size(src, max_bytes=max_bytes)
+    buf = bytearray(min(max(size, 1), _UPLOAD_COPY_CHUNK_BYTES))
+    view = memoryview(buf)
+    total = 0
+    with dest.open("wb") as out:
+        while n := src.readinto(buf):
+            out.write(view[:n])
+            total += n
+    return total
+
+
 def _normalize_upload_relative_path(raw_name: str) -> str:
     """Normalize and sanitize browser-supplied relative paths for directory uploads."""
 
@@ -954,7 +1117,7 @@ def _normalize_upload_relative_path(raw_name: str) -> str:
         token = segment.strip()
         if not token or token in {".", ".."}:
             continue
-        safe = re.sub(r"[^A-Za-z0-9._-]", "_", token)
+        safe = _UNSAFE_FILENAME_CHARS_RE.sub("_", token)
         if not safe:
             continue
         parts.append(safe)
@@ -1113,28 +1276,133 @@ class AuditEventsResponse(BaseModel):
 
 
 # ---- Health ----
-@app.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
-
-
-@app.get("/ready")
-def ready() -> dict[str, object]:
+# Probes and UI polls arrive far more often than the index changes, so the DB
+# part of /ready and /api/meta is served from short-lived snapshots. Both
+# endpoints stay sync `def` handlers (FastAPI runs them in the threadpool).
+_READY_SNAPSHOT_TTL_S = 1.0
+_META_SNAPSHOT_TTL_S = 2.0
+# `_snapshot_lock` only guards the dicts below; computations run under a
+# per-key lock so a slow tenant never blocks other tenants' snapshots.
+_snapshot_lock = threading.Lock()
+_snapshot_key_locks: dict[tuple[str, str, int], threading.Lock] = {}
+_ready_ok_at: float | None = None
+_meta_snapshots: dict[tuple[str, int], tuple[float, dict[str, Any]]] = {}
+# /api/stats scans docs for GROUP BYs and tags; dashboards poll it, so it gets a
+# longer TTL. API writes still show up immediately via the cache version.
+_STATS_SNAPSHOT_TTL_S = 30.0
+_stats_snapshots: dict[tuple[str, int], tuple[float, StatsResponse]] = {}
+
+
+# Probe bodies never change for the life of the process; encode them once.
+_HEALTH_BODY = json_dumps_bytes({"status": "ok"})
+_READY_BODY = json_dumps_bytes({"ready": True, "version": app.version, "public_demo_mode": settings.public_demo_mode})
+
+
+@app.get("/health", response_class=JSONResponse)
+def health() -> Response:
+    # A fresh Response per call: middleware mutates headers on the way out.
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+
+@app.get("/ready", response_class=JSONResponse)
+def ready() -> Response:
     """Readiness probe.
 
     Checks that the app can open the backing store and run a trivial query.
-    Returns 503 if initialization fails.
+    Returns 503 if initialization fails. A successful check is reused for
+    `_READY_SNAPSHOT_TTL_S`; failures are never cached.
     """
 
-    try:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            conn.execute("SELECT 1").fetchone()
-    except Exception as e:
-        logger.exception("Readiness probe failed")
-        raise HTTPException(status_code=503, detail=f"not ready: {e}") from e
+    global _ready_ok_at
+    ok_at = _ready_ok_at
+    if ok_at is None or time.monotonic() - ok_at >= _READY_SNAPSHOT_TTL_S:
+        try:
+            with connect_pooled(settings.sqlite_path) as conn:
+                init_db(conn)
+                conn.execute("SELECT 1").fetchone()
+        except Exception as e:
+            _ready_ok_at = None
+            logger.exception("Readiness probe failed")
+            raise HTTPException(status_code=503, detail=f"not ready: {e}") from e
+        _ready_ok_at = time.monotonic()
+
+    return Response(content=_READY_BODY, media_type="application/json")
+
+
+_INDEX_SIGNATURE_KEYS = (
+    "index.embeddings_backend",
+    "index.embeddings_model",
+    "index.embedding_dim",
+    "index.hash_embedder_version",
+    "index.chunk_size_chars",
+    "index.chunk_overlap_chars",
+)
+
+
+def _snapshot_key_lock(kind: str, key: tuple[str, int]) -> threading.Lock:
+    """Return the lock that serializes recomputing one (kind, tenant, version) snapshot."""
+
+    lock_key = (kind, key[0], key[1])
+    with _snapshot_lock:
+        lock = _snapshot_key_locks.get(lock_key)
+        if lock is None:
+            for stale in [k for k in _snapshot_key_locks if k[2] != key[1]]:
+                del _snapshot_key_locks[stale]
+            lock = _snapshot_key_locks[lock_key] = threading.Lock()
+        return lock
+
+
+def _meta_index_snapshot(tenant_id: str) -> dict[str, Any]:
+    """Return cached `{"stats": ..., "index_signature": ...}` for /api/meta.
+
+    Keyed on the retrieval cache version so API writes are visible immediately;
+    the TTL bounds staleness for out-of-band writes (CLI, other instances).
+    """
+
+    key = (tenant_id, cache_version())
+    cached = _meta_snapshots.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _META_SNAPSHOT_TTL_S:
+        return cached[1]
 
-    return {"ready": True, "version": app.version, "public_demo_mode": settings.public_demo_mode}
+    with _snapshot_key_lock("meta", key):
+        cached = _meta_snapshots.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _META_SNAPSHOT_TTL_S:
+            return cached[1]
+
+        with connect_pooled(settings.sqlite_path) as conn:
+            init_db(conn)
+            ph = _sql_ph(conn)
+            # One round trip for all three counts.
+            counts = conn.execute(
+                f"""
+                SELECT
+                  (SELECT COUNT(1) FROM docs WHERE tenant_id={ph}) AS docs,
+                  (SELECT COUNT(1) FROM chunks WHERE tenant_id={ph}) AS chunks,
+                  (
+                    SELECT COUNT(1)
+                    FROM embeddings e
+                    JOIN chunks c ON c.chunk_id = e.chunk_id
+                    WHERE c.tenant_id={ph}
+                  ) AS embeddings
+                """,
+                (tenant_id, tenant_id, tenant_id),
+            ).fetchone()
+            index_signature = get_meta_many(conn, _INDEX_SIGNATURE_KEYS)
+
+        snapshot: dict[str, Any] = {
+            "stats": {
+                "docs": int(counts["docs"]),
+                "chunks": int(counts["chunks"]),
+                "embeddings": int(counts["embeddings"]),
+            },
+            "index_signature": index_signature,
+        }
+        with _snapshot_lock:
+            # Drop snapshots from older index versions so the dict stays bounded.
+            for stale in [k for k in _meta_snapshots if k[1] != key[1]]:
+                del _meta_snapshots[stale]
+            _meta_snapshots[key] = (time.monotonic(), snapshot)
+        return snapshot
 
 
 @app.get("/api/meta")
@@ -1147,37 +1415,7 @@ def meta(_auth: AuthContext = Depends(require_role("reader"))) -> dict[str, obje
     chunk_view_enabled = bool(settings.allow_chunk_view and not settings.public_demo_mode)
     doc_delete_enabled = bool(settings.allow_doc_delete and not settings.public_demo_mode)
     tenant_id = str(getattr(_auth, "tenant_id", "default"))
-
-    with connect(settings.sqlite_path) as conn:
-        init_db(conn)
-        ph = _sql_ph(conn)
-        doc_count = int(
-            conn.execute(f"SELECT COUNT(1) AS n FROM docs WHERE tenant_id={ph}", (tenant_id,)).fetchone()["n"]
-        )
-        chunk_count = int(
-            conn.execute(f"SELECT COUNT(1) AS n FROM chunks WHERE tenant_id={ph}", (tenant_id,)).fetchone()["n"]
-        )
-        embedding_rows = int(
-            conn.execute(
-                f"""
-                SELECT COUNT(1) AS n
-                FROM embeddings e
-                JOIN chunks c ON c.chunk_id = e.chunk_id
-                WHERE c.tenant_id={ph}
-                """,
-                (tenant_id,),
-            ).fetchone()["n"]
-        )
-
-        sig_keys = [
-            "index.embeddings_backend",
-            "index.embeddings_model",
-            "index.embedding_dim",
-            "index.hash_embedder_version",
-            "index.chunk_size_chars",
-            "index.chunk_overlap_chars",
-        ]
-        index_signature = {k: get_meta(conn, k) for k in sig_keys}
+    snapshot = _meta_index_snapshot(tenant_id)
 
     return {
         "version": app.version,
@@ -1205,93 +1443,81 @@ def meta(_auth: AuthContext = Depends(require_role("reader"))) -> dict[str, obje
         "llm_provider": settings.effective_llm_provider,
         "embeddings_backend": settings.embeddings_backend,
         "ocr_enabled": settings.ocr_enabled,
-        "stats": {
-            "docs": doc_count,
-            "chunks": chunk_count,
-            "embeddings": embedding_rows,
-        },
-        "index_signature": index_signature,
+        "stats": dict(snapshot["stats"]),
+        "index_signature": dict(snapshot["index_signature"]),
         "doc_classifications": list(CLASSIFICATIONS),
         "doc_retentions": list(RETENTIONS),
     }
 
 
-@app.get("/api/stats", response_model=StatsResponse)
-def stats_api(_auth: Any = Depends(require_role("reader"))) -> StatsResponse:
-    """Index-level statistics for dashboards and diagnostics."""
+def _stats_snapshot(tenant_id: str) -> StatsResponse:
+    """Return cached /api/stats aggregates (same keying as `_meta_index_snapshot`)."""
 
-    tenant_id = str(getattr(_auth, "tenant_id", "default"))
-    with connect(settings.sqlite_path) as conn:
+    key = (tenant_id, cache_version())
+    cached = _stats_snapshots.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _STATS_SNAPSHOT_TTL_S:
+        return cached[1]
+
+    with _snapshot_key_lock("stats", key):
+        cached = _stats_snapshots.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _STATS_SNAPSHOT_TTL_S:
+            return cached[1]
+        stats = _compute_stats(tenant_id)
+        with _snapshot_lock:
+            for stale in [k for k in _stats_snapshots if k[1] != key[1]]:
+                del _stats_snapshots[stale]
+            _stats_snapshots[key] = (time.monotonic(), stats)
+    return stats
+
+
+def _compute_stats(tenant_id: str) -> StatsResponse:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         ph = _sql_ph(conn)
 
-        docs = int(conn.execute(f"SELECT COUNT(1) AS n FROM docs WHERE tenant_id={ph}", (tenant_id,)).fetchone()["n"])
-        chunks = int(
-            conn.execute(f"SELECT COUNT(1) AS n FROM chunks WHERE tenant_id={ph}", (tenant_id,)).fetchone()["n"]
-        )
-        embeddings = int(
-            conn.execute(
-                f"""
-                SELECT COUNT(1) AS n
+        # One round trip for all four counters.
+        counts = conn.execute(
+            f"""
+            SELECT
+              (SELECT COUNT(1) FROM docs WHERE tenant_id={ph}) AS docs,
+              (SELECT COUNT(1) FROM chunks WHERE tenant_id={ph}) AS chunks,
+              (
+                SELECT COUNT(1)
                 FROM embeddings e
                 JOIN chunks c ON c.chunk_id = e.chunk_id
                 WHERE c.tenant_id={ph}
-                """,
-                (tenant_id,),
-            ).fetchone()["n"]
-        )
-        ingest_events = int(
-            conn.execute(f"SELECT COUNT(1) AS n FROM ingest_events WHERE tenant_id={ph}", (tenant_id,)).fetchone()["n"]
-        )
-
-        by_classification: dict[str, int] = {}
-        cur = conn.execute(
-            f"SELECT classification, COUNT(1) AS n FROM docs WHERE tenant_id={ph} GROUP BY classification",
-            (tenant_id,),
-        )
-        for r in cur.fetchall():
-            by_classification[str(r["classification"])] = int(r["n"])
-
-        by_retention: dict[str, int] = {}
-        cur = conn.execute(
-            f"SELECT retention, COUNT(1) AS n FROM docs WHERE tenant_id={ph} GROUP BY retention",
-            (tenant_id,),
-        )
-        for r in cur.fetchall():
-            by_retention[str(r["retention"])] = int(r["n"])
-
-        # Tags are stored as JSON text; SQLite json1 is not always available,
-        # so compute in Python.
-        tag_counts: dict[str, int] = {}
-        cur = conn.execute(f"SELECT tags_json FROM docs WHERE tenant_id={ph}", (tenant_id,))
-        for r in cur.fetchall():
-            try:
-                tags = json.loads(r["tags_json"] or "[]")
-            except Exception:
-                tags = []
-            if not isinstance(tags, list):
-                continue
-            for t in tags:
-                k = str(t).strip().lower()
-                if not k:
-                    continue
-                tag_counts[k] = tag_counts.get(k, 0) + 1
+              ) AS embeddings,
+              (SELECT COUNT(1) FROM ingest_events WHERE tenant_id={ph}) AS ingest_events
+            """,
+            (tenant_id, tenant_id, tenant_id, tenant_id),
+        ).fetchone()
+        docs = int(counts["docs"])
+        chunks = int(counts["chunks"])
+        embeddings = int(counts["embeddings"])
+        ingest_events = int(counts["ingest_events"])
 
-        top_tags = [
-            TopTagStat(tag=t, count=c) for t, c in sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:25]
-        ]
+        # Breakdowns are pre-aggregated on write on SQLite; Postgres groups on read.
+        agg = get_stats_agg(conn, tenant_id=tenant_id)
+        top_tags = [TopTagStat(tag=t, count=c) for t, c in top_doc_tags(conn, tenant_id=tenant_id, limit=25)]
 
     return StatsResponse(
         docs=docs,
         chunks=chunks,
         embeddings=embeddings,
         ingest_events=ingest_events,
-        by_classification=by_classification,
-        by_retention=by_retention,
+        by_classification=agg["classification"],
+        by_retention=agg["retention"],
         top_tags=top_tags,
     )
 
 
+@app.get("/api/stats", response_model=StatsResponse)
+def stats_api(_auth: Any = Depends(require_role("reader"))) -> StatsResponse:
+    """Index-level statistics for dashboards and diagnostics."""
+
+    return _stats_snapshot(str(getattr(_auth, "tenant_id", "default")))
+
+
 # ---- Maintenance (safe read-only helpers) ----
 @app.get("/api/maintenance/retention/expired", response_model=ExpiredDocsResponse)
 def maintenance_retention_expired(
@@ -1310,7 +1536,7 @@ def maintenance_retention_expired(
     now_i = int(now) if now is not None else int(time.time())
     from .maintenance import find_expired_docs
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         expired = find_expired_docs(conn, now=now_i)
 
@@ -1331,7 +1557,7 @@ def maintenance_retention_expired(
 # ---- Docs ----
 @app.get("/api/docs")
 def docs(_auth: Any = Depends(require_role("reader"))) -> dict[str, Any]:
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         items = list_docs(conn)
     return {"docs": [d.to_dict() for d in items]}
@@ -1339,7 +1565,7 @@ def docs(_auth: Any = Depends(require_role("reader"))) -> dict[str, Any]:
 
 @app.get("/api/docs/{doc_id}")
 def doc_detail(doc_id: str, _auth: Any = Depends(require_role("reader"))) -> dict[str, Any]:
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         doc = get_doc(conn, doc_id)
         if doc is None:
@@ -1399,7 +1625,7 @@ def doc_update(
     tags_json: str | None = None
     if req.tags is not None:
         try:
-            tags_json = json.dumps(normalize_tags(req.tags))
+            tags_json = json_dumps(normalize_tags(req.tags))
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid tags: {e}") from e
 
@@ -1446,6 +1672,9 @@ def doc_update(
                 },
             )
         conn.commit()
+        if changed_fields:
+            # Retention/classification edits change what retrieval may return.
+            invalidate_cache()
 
         updated = get_doc(conn, doc_id)
         if updated is None:
@@ -1462,7 +1691,7 @@ def list_ingest_events_api(
 ) -> dict[str, Any]:
     """List recent ingest events across docs (audit/lineage view)."""
     limit = max(1, min(int(limit), 500))
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         events = list_recent_ingest_events(conn, limit=limit, doc_id=doc_id)
     return {"events": [e.to_dict() for e in events]}
@@ -1471,7 +1700,7 @@ def list_ingest_events_api(
 @app.get("/api/ingestion-runs", response_model=IngestionRunsResponse)
 def ingestion_runs_api(limit: int = 100, _auth: Any = Depends(require_role("reader"))) -> IngestionRunsResponse:
     limit = max(1, min(int(limit), 500))
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         runs = list_ingestion_runs(conn, limit=limit)
     return IngestionRunsResponse(runs=[IngestionRunSummary.model_validate(r.to_dict()) for r in runs])
@@ -1479,7 +1708,7 @@ def ingestion_runs_api(limit: int = 100, _auth: Any = Depends(require_role("read
 
 @app.get("/api/ingestion-runs/{run_id}", response_model=IngestionRunDetailResponse)
 def ingestion_run_detail_api(run_id: str, _auth: Any = Depends(require_role("reader"))) -> IngestionRunDetailResponse:
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         run = get_ingestion_run(conn, run_id)
         if run is None:
@@ -1503,7 +1732,7 @@ def audit_events_api(
     if since is not None and until is not None and int(since) > int(until):
         raise HTTPException(status_code=400, detail="since must be <= until")
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         events = list_audit_events(
             conn,
@@ -1526,7 +1755,7 @@ def doc_chunks(
     if settings.public_demo_mode or not settings.allow_chunk_view:
         raise HTTPException(status_code=403, detail="Chunk view is disabled in this deployment")
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         doc = get_doc(conn, doc_id)
         if doc is None:
@@ -1549,8 +1778,61 @@ def doc_chunks(
     }
 
 
-@app.get("/api/docs/{doc_id}/text")
-def doc_text(doc_id: str, _auth: Any = Depends(require_role("admin"))) -> PlainTextResponse:
+def _deoverlap_chunk_texts(texts: Iterable[str], overlap: int) -> Iterator[str]:
+    """Yield non-empty, stripped chunk texts with the overlapped prefix removed.
+
+    Reconstruction is best-effort: a chunk's prefix is dropped only when it
+    matches the previous chunk's last `overlap` characters exactly.
+    """
+    if overlap <= 0:
+        for txt in texts:
+            part = txt.strip()
+            if part:
+                yield part
+        return
+
+    prev_tail: str | None = None
+    for raw in texts:
+        txt = raw
+        # Any newline left after the overlap is removed by strip() below.
+        if prev_tail is not None and txt.startswith(prev_tail):
+            txt = txt[len(prev_tail) :]
+        part = txt.strip()
+        if part:
+            yield part
+        prev_tail = raw[-overlap:]
+
+
+# Same hard bound the list-based export used; streaming keeps memory flat, but an
+# export still should not run unbounded.
+_DOC_EXPORT_MAX_CHUNKS = 20000
+_DOC_EXPORT_BATCH = 256
+
+
+def _iter_doc_chunk_texts(doc_id: str, *, tenant_id: str, limit: int) -> Iterator[str]:
+    """Page through a doc's chunk texts in `idx` order.
+
+    Each batch uses its own (pooled) connection: Starlette advances sync streaming
+    generators on arbitrary threadpool threads, and SQLite connections are bound
+    to the thread that opened them.
+    """
+    after_idx = -1
+    remaining = limit
+    while remaining > 0:
+        with connect_pooled(settings.sqlite_path) as conn:
+            rows = list_chunk_texts_for_doc(
+                conn, doc_id, after_idx=after_idx, limit=min(_DOC_EXPORT_BATCH, remaining), tenant_id=tenant_id
+            )
+        if not rows:
+            return
+        for _, text in rows:
+            yield text
+        after_idx = rows[-1][0]
+        remaining -= len(rows)
+
+
+@app.get("/api/docs/{doc_id}/text", response_class=PlainTextResponse)
+def doc_text(doc_id: str, _auth: Any = Depends(require_role("admin"))) -> StreamingResponse:
     """Export a doc as plain text.
 
     This is useful for debugging and for copying a document out of the system.
@@ -1558,39 +1840,25 @@ def doc_text(doc_id: str, _auth: Any = Depends(require_role("admin"))) -> PlainT
 
     Note: because we store overlapped chunks for retrieval, export attempts to
     *de-overlap* using the latest ingest event's chunk_overlap_chars.
+
+    The body is streamed: the header is sent first, then chunks as they are read.
     """
 
     if settings.public_demo_mode or not settings.allow_chunk_view:
         raise HTTPException(status_code=403, detail="Doc export is disabled in this deployment")
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         doc = get_doc(conn, doc_id)
         if doc is None:
             raise HTTPException(status_code=404, detail="Doc not found")
 
-        events = list_ingest_events(conn, doc_id, limit=1)
-        overlap = int(events[0].chunk_overlap_chars) if events else int(settings.chunk_overlap_chars)
-
-        chunks = list_all_chunks_for_doc(conn, doc_id, limit=doc.num_chunks)
-
-    # Reconstruct in a best-effort way.
-    out_parts: list[str] = []
-    prev_text: str | None = None
-    truncated = len(chunks) < doc.num_chunks
-    for c in chunks:
-        txt = c.text
-        if prev_text is not None and overlap > 0:
-            prev_tail = prev_text[-overlap:]
-            if txt.startswith(prev_tail + "\n"):
-                txt = txt[len(prev_tail) + 1 :]
-            elif txt.startswith(prev_tail):
-                txt = txt[len(prev_tail) :]
-                txt = txt.lstrip("\n")
-        out_parts.append(txt.strip())
-        prev_text = c.text
-
-    body = "\n\n".join([p for p in out_parts if p])
+        latest_overlap = get_latest_chunk_overlap(conn, doc_id)
+        overlap = latest_overlap if latest_overlap is not None else int(settings.chunk_overlap_chars)
+
+        limit = max(1, min(int(doc.num_chunks), _DOC_EXPORT_MAX_CHUNKS))
+        exported = min(count_chunks_for_doc(conn, doc_id), limit)
+
     header_lines = [
         f"Title: {doc.title}",
         f"Doc ID: {doc.doc_id}",
@@ -1601,12 +1869,31 @@ def doc_text(doc_id: str, _auth: Any = Depends(require_role("admin"))) -> PlainT
         f"Tags: {', '.join(doc.tags) if doc.tags else ''}",
         f"Export overlap_chars={overlap}",
     ]
-    if truncated:
-        header_lines.append(f"WARNING: export truncated at {len(chunks)}/{doc.num_chunks} chunks")
+    if exported < doc.num_chunks:
+        header_lines.append(f"WARNING: export truncated at {exported}/{doc.num_chunks} chunks")
     header_lines.append("")
 
-    text = "\n".join(header_lines) + body + "\n"
-    return PlainTextResponse(text, media_type="text/plain")
+    # The tenant context may be reset before the body is iterated; bind it now.
+    texts = _iter_doc_chunk_texts(doc.doc_id, tenant_id=current_tenant_id(), limit=limit)
+
+    def _render() -> Iterator[str]:
+        yield "\n".join(header_lines)
+        # Coalesce parts into ~64KB writes; each step of a sync iterator is a threadpool hop.
+        buf: list[str] = []
+        size = 0
+        for i, part in enumerate(_deoverlap_chunk_texts(texts, overlap)):
+            if i:
+                buf.append("\n\n")
+            buf.append(part)
+            size += len(part)
+            if size >= 65536:
+                yield "".join(buf)
+                buf.clear()
+                size = 0
+        buf.append("\n")
+        yield "".join(buf)
+
+    return StreamingResponse(_render(), media_type="text/plain")
 
 
 @app.get("/api/chunks/{chunk_id}")
@@ -1614,12 +1901,12 @@ def chunk_detail(chunk_id: str, _auth: Any = Depends(require_role("admin"))) ->
     if settings.public_demo_mode or not settings.allow_chunk_view:
         raise HTTPException(status_code=403, detail="Chunk view is disabled in this deployment")
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
-        c = get_chunk(conn, chunk_id)
-        if c is None:
+        found = get_chunk_with_doc(conn, chunk_id)
+        if found is None:
             raise HTTPException(status_code=404, detail="Chunk not found")
-        doc = get_doc(conn, c.doc_id)
+        c, doc_title, doc_source = found
 
     return {
         "chunk": {
@@ -1627,12 +1914,96 @@ def chunk_detail(chunk_id: str, _auth: Any = Depends(require_role("admin"))) ->
             "doc_id": c.doc_id,
             "idx": c.idx,
             "text": c.text,
-            "doc_title": doc.title if doc else None,
-            "doc_source": doc.source if doc else None,
+            "doc_title": doc_title,
+            "doc_source": doc_source,
         }
     }
 
 
+def _parse_tags_json(raw: Any) -> list[str]:
+    try:
+        tags = json_loads(raw or "[]")
+    except Exception:
+        return []
+    return [str(t) for t in tags] if isinstance(tags, list) else []
+
+
+# Chunk-search statements are module constants so every call sends byte-identical SQL
+# and the per-connection statement cache (see `storage.connect_pooled`) can reuse them.
+_FTS_CHUNK_SQL = """
+SELECT
+    c.chunk_id,
+    c.doc_id,
+    c.idx,
+    substr(c.text, 1, 240) AS preview,
+    bm25(chunks_fts) AS bm,
+    d.title AS doc_title,
+    d.source AS doc_source,
+    d.classification AS classification,
+    d.tags_json AS tags_json
+FROM chunks_fts
+JOIN chunks c ON chunks_fts.chunk_id = c.chunk_id
+JOIN docs d ON c.doc_id = d.doc_id AND d.tenant_id = c.tenant_id
+WHERE chunks_fts MATCH ?
+  AND c.tenant_id = ?
+ORDER BY bm
+LIMIT ?
+"""
+
+_PG_FTS_CHUNK_SQL = """
+SELECT
+    c.chunk_id,
+    c.doc_id,
+    c.idx,
+    LEFT(c.text, 240) AS preview,
+    ts_rank_cd(
+        to_tsvector('english', c.text),
+        plainto_tsquery('english', %s)
+    ) AS rank,
+    d.title AS doc_title,
+    d.source AS doc_source,
+    d.classification AS classification,
+    d.tags_json AS tags_json
+FROM chunks c
+JOIN docs d ON c.doc_id = d.doc_id AND d.tenant_id = c.tenant_id
+WHERE c.tenant_id = %s
+  AND to_tsvector('english', c.text) @@ plainto_tsquery('english', %s)
+ORDER BY rank DESC, d.updated_at DESC, c.idx ASC
+LIMIT %s
+"""
+
+
+@functools.lru_cache(maxsize=64)
+def _lexical_chunk_sql(n_terms: int, postgres: bool) -> str:
+    """Lexical fallback query for `n_terms` distinct terms.
+
+    SQL keeps only chunks containing some term as a substring (one escaped
+    `%term%` pattern per term). That is a superset of the chunks with real
+    token overlap, so no LIMIT is applied here: substring-only hits ("cat" in
+    "category") must not crowd out true matches before Python scores tokens.
+    Cached so repeated searches reuse identical SQL text.
+    """
+
+    like = "ILIKE" if postgres else "LIKE"
+    ph = "%s" if postgres else "?"
+    where = " OR ".join([f"c.text {like} {ph} ESCAPE '\\'"] * n_terms)
+    return f"""
+SELECT c.chunk_id, c.doc_id, c.idx, c.text,
+       d.title AS doc_title, d.source AS doc_source,
+       d.classification AS classification, d.tags_json AS tags_json
+FROM chunks c
+JOIN docs d ON c.doc_id = d.doc_id AND d.tenant_id = c.tenant_id
+WHERE c.tenant_id = {ph}
+  AND ({where})
+ORDER BY d.updated_at DESC, c.idx ASC
+"""
+
+
+def _like_contains(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
 @app.get("/api/search/chunks", response_model=ChunkSearchResponse)
 def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("reader"))) -> ChunkSearchResponse:
     """Lightweight chunk search for the UI.
@@ -1642,52 +2013,22 @@ def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("re
     """
 
     limit = max(1, min(int(limit), 50))
-    tokens = [t.lower() for t in _TOKEN_RE.findall(q) if t.lower() not in _STOPWORDS]
-    if not tokens:
+    fts_query, terms, patterns = _search_terms(q)
+    if not terms:
         return ChunkSearchResponse(query=q, results=[])
 
-    fts_query = " ".join(tokens)
-
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         tenant_id = str(getattr(_auth, "tenant_id", "default"))
-        ph = _sql_ph(conn)
-        is_postgres = ph == "%s"
+        is_postgres = _sql_ph(conn) == "%s"
 
         results: list[ChunkSearchResult] = []
 
         # Prefer backend-native full-text search first.
         if is_postgres:
             try:
-                cur = conn.execute(
-                    f"""
-                    SELECT
-                        c.chunk_id,
-                        c.doc_id,
-                        c.idx,
-                        LEFT(c.text, 240) AS preview,
-                        ts_rank_cd(
-                            to_tsvector('english', c.text),
-                            plainto_tsquery('english', {ph})
-                        ) AS rank,
-                        d.title AS doc_title,
-                        d.source AS doc_source,
-                        d.classification AS classification,
-                        d.tags_json AS tags_json
-                    FROM chunks c
-                    JOIN docs d ON c.doc_id = d.doc_id AND d.tenant_id = c.tenant_id
-                    WHERE c.tenant_id = {ph}
-                      AND to_tsvector('english', c.text) @@ plainto_tsquery('english', {ph})
-                    ORDER BY rank DESC, d.updated_at DESC, c.idx ASC
-                    LIMIT {ph}
-                    """,
-                    (fts_query, tenant_id, fts_query, limit),
-                )
+                cur = conn.execute(_PG_FTS_CHUNK_SQL, (fts_query, tenant_id, fts_query, limit))
                 for r in cur.fetchall():
-                    try:
-                        tags = json.loads(r["tags_json"] or "[]")
-                    except Exception:
-                        tags = []
                     results.append(
                         ChunkSearchResult(
                             chunk_id=str(r["chunk_id"]),
@@ -1698,7 +2039,7 @@ def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("re
                             doc_title=str(r["doc_title"]),
                             doc_source=str(r["doc_source"]),
                             classification=str(r["classification"]),
-                            tags=[str(t) for t in tags] if isinstance(tags, list) else [],
+                            tags=_parse_tags_json(r["tags_json"]),
                         )
                     )
 
@@ -1712,33 +2053,8 @@ def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("re
         else:
             # Prefer SQLite FTS5 when available.
             try:
-                cur = conn.execute(
-                    f"""
-                    SELECT
-                        c.chunk_id,
-                        c.doc_id,
-                        c.idx,
-                        substr(c.text, 1, 240) AS preview,
-                        bm25(chunks_fts) AS bm,
-                        d.title AS doc_title,
-                        d.source AS doc_source,
-                        d.classification AS classification,
-                        d.tags_json AS tags_json
-                    FROM chunks_fts
-                    JOIN chunks c ON chunks_fts.chunk_id = c.chunk_id
-                    JOIN docs d ON c.doc_id = d.doc_id AND d.tenant_id = c.tenant_id
-                    WHERE chunks_fts MATCH {ph}
-                      AND c.tenant_id = {ph}
-                    ORDER BY bm
-                    LIMIT {ph}
-                    """,
-                    (fts_query, tenant_id, limit),
-                )
+                cur = conn.execute(_FTS_CHUNK_SQL, (fts_query, tenant_id, limit))
                 for r in cur.fetchall():
-                    try:
-                        tags = json.loads(r["tags_json"] or "[]")
-                    except Exception:
-                        tags = []
                     # bm25: smaller is better; expose a "higher is better" score.
                     bm = float(r["bm"])
                     score = -bm
@@ -1752,7 +2068,7 @@ def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("re
                             doc_title=str(r["doc_title"]),
                             doc_source=str(r["doc_source"]),
                             classification=str(r["classification"]),
-                            tags=[str(t) for t in tags] if isinstance(tags, list) else [],
+                            tags=_parse_tags_json(r["tags_json"]),
                         )
                     )
 
@@ -1762,30 +2078,16 @@ def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("re
                 pass
 
         # Lexical fallback (token overlap).
-        cur = conn.execute(
-            f"""
-            SELECT c.chunk_id, c.doc_id, c.idx, c.text,
-                   d.title AS doc_title, d.source AS doc_source,
-                   d.classification AS classification, d.tags_json AS tags_json
-            FROM chunks c
-            JOIN docs d ON c.doc_id = d.doc_id AND d.tenant_id = c.tenant_id
-            WHERE c.tenant_id = {ph}
-            ORDER BY d.updated_at DESC, c.idx ASC
-            """,
-            (tenant_id,),
-        )
+        cur = conn.execute(_lexical_chunk_sql(len(terms), is_postgres), (tenant_id, *patterns))
         scored: list[tuple[float, ChunkSearchResult]] = []
-        tokset = set(tokens)
+        tokset = set(terms)
         for r in cur.fetchall():
             text = str(r["text"] or "")
-            ctoks = {t.lower() for t in _TOKEN_RE.findall(text)}
-            overlap = len(tokset & ctoks)
+            # Lowercase the chunk once; intersecting against the (small) query set avoids
+            # building a per-chunk token set.
+            overlap = len(tokset.intersection(_TOKEN_RE.findall(text.lower())))
             if overlap == 0:
                 continue
-            try:
-                tags = json.loads(r["tags_json"] or "[]")
-            except Exception:
-                tags = []
             scored.append(
                 (
                     float(overlap),
@@ -1798,13 +2100,14 @@ def search_chunks(q: str, limit: int = 20, _auth: Any = Depends(require_role("re
                         doc_title=str(r["doc_title"]),
                         doc_source=str(r["doc_source"]),
                         classification=str(r["classification"]),
-                        tags=[str(t) for t in tags] if isinstance(tags, list) else [],
+                        tags=_parse_tags_json(r["tags_json"]),
                     ),
                 )
             )
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return ChunkSearchResponse(query=q, results=[r for _, r in scored[:limit]])
+        # Equivalent to a stable descending sort truncated to `limit`, without sorting every candidate.
+        top = heapq.nlargest(limit, scored, key=lambda x: x[0])
+        return ChunkSearchResponse(query=q, results=[r for _, r in top])
 
 
 @app.delete("/api/docs/{doc_id}")
@@ -1841,6 +2144,17 @@ def delete_doc_api(
 
 
 # ---- Ingest ----
+def _ingest_result_payload(res: Any) -> dict[str, Any]:
+    return {
+        "doc_id": res.doc_id,
+        "doc_version": res.doc_version,
+        "changed": res.changed,
+        "num_chunks": res.num_chunks,
+        "embedding_dim": res.embedding_dim,
+        "content_sha256": res.content_sha256,
+    }
+
+
 @app.post("/api/ingest/text")
 def ingest_text_api(req: IngestTextRequest, _auth: Any = Depends(require_role("editor"))) -> dict[str, Any]:
     if settings.public_demo_mode or not settings.allow_uploads:
@@ -1860,17 +2174,26 @@ def ingest_text_api(req: IngestTextRequest, _auth: Any = Depends(require_role("e
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     invalidate_cache()
-    return {
-        "doc_id": res.doc_id,
-        "doc_version": res.doc_version,
-        "changed": res.changed,
-        "num_chunks": res.num_chunks,
-        "embedding_dim": res.embedding_dim,
-        "content_sha256": res.content_sha256,
-    }
+    return _ingest_result_payload(res)
 
 
 # ---- Connectors ----
+def _fail_ingestion_run(conn: Any, *, run_id: str, objects_scanned: int, error: Exception) -> None:
+    """Mark a connector run failed and commit; shared by the sync and notify error paths."""
+    begin_immediate(conn)
+    complete_ingestion_run(
+        conn,
+        run_id=run_id,
+        status="failed",
+        objects_scanned=objects_scanned,
+        docs_changed=0,
+        docs_unchanged=0,
+        bytes_processed=0,
+        errors_json=json_dumps([str(error)]),
+    )
+    conn.commit()
+
+
 @app.post("/api/connectors/gcs/sync")
 def gcs_sync_api(
     req: GCSSyncRequest, request: Request, _auth: AuthContext = Depends(require_role("admin"))
@@ -1899,13 +2222,17 @@ def gcs_sync_api(
     scheduler_job_name = (request.headers.get("x-cloudscheduler-jobname") or "").strip()
     is_scheduled_trigger = bool((request.headers.get("x-cloudscheduler") or "").strip() or scheduler_job_name)
 
+    # One connection for the whole run and one write transaction on each side of the
+    # sync: the start row + audit event commit together so progress is visible, and the
+    # write lock is released while the sync does network IO.
     with connect(settings.sqlite_path) as conn:
         init_db(conn)
+        begin_immediate(conn)
         create_ingestion_run(
             conn,
             run_id=run_id,
             trigger_type="connector",
-            trigger_payload_json=json.dumps(trigger_payload, ensure_ascii=False),
+            trigger_payload_json=json_dumps(trigger_payload),
             principal=principal,
         )
         _record_audit_event(
@@ -1927,93 +2254,52 @@ def gcs_sync_api(
         )
         conn.commit()
 
-    try:
-        res = sync_prefix(
-            bucket=req.bucket,
-            prefix=req.prefix or "",
-            max_objects=req.max_objects,
-            dry_run=req.dry_run,
-            classification=req.classification,
-            retention=req.retention,
-            tags=req.tags,
-            notes=req.notes,
-            run_id=run_id,
-        )
-        bytes_processed = sum(int(r.get("size") or 0) for r in (res.get("results") or []))
-        docs_changed = int(res.get("changed") or 0)
-        docs_ingested = int(res.get("ingested") or 0)
-        docs_unchanged = max(0, docs_ingested - docs_changed)
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
-                run_id=run_id,
-                status="succeeded",
-                objects_scanned=int(res.get("scanned") or 0),
-                docs_changed=docs_changed,
-                docs_unchanged=docs_unchanged,
-                bytes_processed=bytes_processed,
-                errors_json=json.dumps(res.get("errors") or [], ensure_ascii=False),
-            )
-            conn.commit()
-    except ValueError as e:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
-                run_id=run_id,
-                status="failed",
-                objects_scanned=0,
-                docs_changed=0,
-                docs_unchanged=0,
-                bytes_processed=0,
-                errors_json=json.dumps([str(e)], ensure_ascii=False),
-            )
-            conn.commit()
-        raise HTTPException(status_code=400, detail=str(e))
-    except RuntimeError as e:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
-                run_id=run_id,
-                status="failed",
-                objects_scanned=0,
-                docs_changed=0,
-                docs_unchanged=0,
-                bytes_processed=0,
-                errors_json=json.dumps([str(e)], ensure_ascii=False),
-            )
-            conn.commit()
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
+        try:
+            res = sync_prefix(
+                bucket=req.bucket,
+                prefix=req.prefix or "",
+                max_objects=req.max_objects,
+                dry_run=req.dry_run,
+                classification=req.classification,
+                retention=req.retention,
+                tags=req.tags,
+                notes=req.notes,
                 run_id=run_id,
-                status="failed",
-                objects_scanned=0,
-                docs_changed=0,
-                docs_unchanged=0,
-                bytes_processed=0,
-                errors_json=json.dumps([str(e)], ensure_ascii=False),
             )
-            conn.commit()
-        raise
+            bytes_processed = sum(int(r.get("size") or 0) for r in (res.get("results") or []))
+            docs_changed = int(res.get("changed") or 0)
+            docs_ingested = int(res.get("ingested") or 0)
+            docs_unchanged = max(0, docs_ingested - docs_changed)
+        except Exception as e:
+            _fail_ingestion_run(conn, run_id=run_id, objects_scanned=0, error=e)
+            if isinstance(e, (ValueError, RuntimeError)):
+                raise HTTPException(status_code=400, detail=str(e))
+            raise
+
+        begin_immediate(conn)
+        complete_ingestion_run(
+            conn,
+            run_id=run_id,
+            status="succeeded",
+            objects_scanned=int(res.get("scanned") or 0),
+            docs_changed=docs_changed,
+            docs_unchanged=docs_unchanged,
+            bytes_processed=bytes_processed,
+            errors_json=json_dumps(res.get("errors") or []),
+        )
+        conn.commit()
 
     invalidate_cache()
     if is_scheduled_trigger:
         logger.info(
-            json.dumps(
+            json_dumps(
                 {
                     "event": "connector.gcs.sync.scheduled",
                     "job_name": scheduler_job_name or "unknown",
                     "bucket": req.bucket,
                     "prefix": req.prefix or "",
                     "run_id": run_id,
-                },
-                ensure_ascii=False,
+                }
             )
         )
     return res
@@ -2026,7 +2312,7 @@ def gcs_notify_api(
 ) -> dict[str, Any]:
     """Handle a Pub/Sub push envelope for a single GCS object finalize event."""
 
-    from .connectors.gcs import ingest_object
+    from .connectors.gcs import connector_notes, ingest_object
 
     timer = Timer()
     try:
@@ -2044,7 +2330,7 @@ def gcs_notify_api(
 
     if event_type and event_type not in _GCS_FINALIZE_EVENT_TYPES:
         logger.info(
-            json.dumps(
+            json_dumps(
                 {
                     "event": "connector.gcs.notify",
                     "pubsub_message_id": message_id,
@@ -2052,8 +2338,7 @@ def gcs_notify_api(
                     "result": "ignored_event",
                     "event_type": event_type,
                     "latency_ms": timer.ms(),
-                },
-                ensure_ascii=False,
+                }
             )
         )
         return {
@@ -2076,91 +2361,80 @@ def gcs_notify_api(
     principal = getattr(_auth, "principal", None)
     with connect(settings.sqlite_path) as conn:
         init_db(conn)
+
+        # Pub/Sub redelivers (and GCS may notify twice for) the same object generation.
+        # A generation is immutable, so if it is already the latest ingested version there
+        # is nothing to download or record.
+        if isinstance(generation, str):
+            latest = latest_ingest_note_for_source(conn, gcs_uri)
+            if latest is not None and connector_notes(bucket, object_name, generation) in latest[1]:
+                logger.info(
+                    json_dumps(
+                        {
+                            "event": "connector.gcs.notify",
+                            "pubsub_message_id": message_id,
+                            "gcs_uri": gcs_uri,
+                            "result": "unchanged",
+                            "run_id": None,
+                            "latency_ms": timer.ms(),
+                        }
+                    )
+                )
+                return {
+                    "accepted": True,
+                    "run_id": None,
+                    "pubsub_message_id": message_id,
+                    "gcs_uri": gcs_uri,
+                    "result": "unchanged",
+                    "changed": False,
+                    "doc_id": latest[0],
+                }
+
+        begin_immediate(conn)
         create_ingestion_run(
             conn,
             run_id=run_id,
             trigger_type="connector",
-            trigger_payload_json=json.dumps(trigger_payload, ensure_ascii=False),
+            trigger_payload_json=json_dumps(trigger_payload),
             principal=principal,
         )
         conn.commit()
 
-    try:
-        result = ingest_object(
-            bucket=bucket,
-            object_name=object_name,
-            generation=generation if isinstance(generation, str) else None,
-            notes=f"pubsub_message_id={message_id}" if message_id else None,
-            run_id=run_id,
-            expected_size=size if isinstance(size, int) else None,
-        )
-        action = str(result.get("action") or "accepted")
-        docs_changed = 1 if bool(result.get("changed")) else 0
-        docs_unchanged = 1 if action == "unchanged" else 0
-        bytes_processed = int(result.get("size") or 0)
-
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
-                run_id=run_id,
-                status="succeeded",
-                objects_scanned=1,
-                docs_changed=docs_changed,
-                docs_unchanged=docs_unchanged,
-                bytes_processed=bytes_processed,
-                errors_json="[]",
-            )
-            conn.commit()
-    except ValueError as e:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
-                run_id=run_id,
-                status="failed",
-                objects_scanned=1,
-                docs_changed=0,
-                docs_unchanged=0,
-                bytes_processed=0,
-                errors_json=json.dumps([str(e)], ensure_ascii=False),
-            )
-            conn.commit()
-        raise HTTPException(status_code=400, detail=str(e)) from e
-    except RuntimeError as e:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
-                run_id=run_id,
-                status="failed",
-                objects_scanned=1,
-                docs_changed=0,
-                docs_unchanged=0,
-                bytes_processed=0,
-                errors_json=json.dumps([str(e)], ensure_ascii=False),
-            )
-            conn.commit()
-        raise HTTPException(status_code=400, detail=str(e)) from e
-    except Exception as e:
-        with connect(settings.sqlite_path) as conn:
-            init_db(conn)
-            complete_ingestion_run(
-                conn,
+        try:
+            result = ingest_object(
+                bucket=bucket,
+                object_name=object_name,
+                generation=generation if isinstance(generation, str) else None,
+                notes=f"pubsub_message_id={message_id}" if message_id else None,
                 run_id=run_id,
-                status="failed",
-                objects_scanned=1,
-                docs_changed=0,
-                docs_unchanged=0,
-                bytes_processed=0,
-                errors_json=json.dumps([str(e)], ensure_ascii=False),
+                expected_size=size if isinstance(size, int) else None,
             )
-            conn.commit()
-        raise
+            action = str(result.get("action") or "accepted")
+            docs_changed = 1 if bool(result.get("changed")) else 0
+            docs_unchanged = 1 if action == "unchanged" else 0
+            bytes_processed = int(result.get("size") or 0)
+        except Exception as e:
+            _fail_ingestion_run(conn, run_id=run_id, objects_scanned=1, error=e)
+            if isinstance(e, (ValueError, RuntimeError)):
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            raise
+
+        begin_immediate(conn)
+        complete_ingestion_run(
+            conn,
+            run_id=run_id,
+            status="succeeded",
+            objects_scanned=1,
+            docs_changed=docs_changed,
+            docs_unchanged=docs_unchanged,
+            bytes_processed=bytes_processed,
+            errors_json="[]",
+        )
+        conn.commit()
 
     invalidate_cache()
     logger.info(
-        json.dumps(
+        json_dumps(
             {
                 "event": "connector.gcs.notify",
                 "pubsub_message_id": message_id,
@@ -2168,8 +2442,7 @@ def gcs_notify_api(
                 "result": str(result.get("action") or "accepted"),
                 "run_id": run_id,
                 "latency_ms": timer.ms(),
-            },
-            ensure_ascii=False,
+            }
         )
     )
     return {
@@ -2218,20 +2491,36 @@ async def ingest_file_api(
     stem = Path(safe_name).stem
     tmp_path = tmp_dir / f"{stem}_{uuid.uuid4().hex}{suffix}"
 
-    # Stream upload to disk with size limit.
-    total = 0
+    if suffix in {".md", ".txt"} and contract_bytes is None:
+        # Plain text needs no path-based parser: decode it from the upload spool instead of
+        # copying it to disk and reading it back. Defaults match what ingest_file derives.
+        try:
+            text = await asyncio.to_thread(_read_upload_text, file.file, max_bytes=settings.max_upload_bytes)
+        except UnicodeDecodeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e)) from None
+        try:
+            res = ingest_text(
+                title=title or tmp_path.stem,
+                source=source or tmp_path.name,
+                text=text,
+                classification=classification,
+                retention=retention,
+                tags=tags,
+                notes=notes,
+            )
+        except (ValueError, RuntimeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        invalidate_cache()
+        return _ingest_result_payload(res)
+
+    # Copy the upload to disk (size-limited) off the event loop.
     try:
-        with tmp_path.open("wb") as f:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                total += len(chunk)
-                if total > settings.max_upload_bytes:
-                    raise HTTPException(
-                        status_code=413, detail=f"File too large (max {settings.max_upload_bytes} bytes)"
-                    )
-                f.write(chunk)
+        try:
+            await asyncio.to_thread(_copy_upload_to_path, file.file, tmp_path, max_bytes=settings.max_upload_bytes)
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e)) from None
 
         try:
             res = ingest_file(
@@ -2254,14 +2543,7 @@ async def ingest_file_api(
         except FileNotFoundError:
             pass
     invalidate_cache()
-    return {
-        "doc_id": res.doc_id,
-        "doc_version": res.doc_version,
-        "changed": res.changed,
-        "num_chunks": res.num_chunks,
-        "embedding_dim": res.embedding_dim,
-        "content_sha256": res.content_sha256,
-    }
+    return _ingest_result_payload(res)
 
 
 @app.post("/api/ingest/directory", response_model=DirectoryIngestResponse)
@@ -2294,11 +2576,12 @@ async def ingest_directory_api(
 
     with connect(settings.sqlite_path) as conn:
         init_db(conn)
+        begin_immediate(conn)
         create_ingestion_run(
             conn,
             run_id=run_id,
             trigger_type="ui",
-            trigger_payload_json=json.dumps(trigger_payload, ensure_ascii=False),
+            trigger_payload_json=json_dumps(trigger_payload),
             principal=principal,
         )
         conn.commit()
@@ -2339,15 +2622,9 @@ async def ingest_directory_api(
             tmp_path = tmp_dir / f"{stem}_{uuid.uuid4().hex}{suffix}"
             total = 0
             try:
-                with tmp_path.open("wb") as out:
-                    while True:
-                        chunk = await upload.read(1024 * 1024)
-                        if not chunk:
-                            break
-                        total += len(chunk)
-                        if total > settings.max_upload_bytes:
-                            raise ValueError(f"File too large (max {settings.max_upload_bytes} bytes)")
-                        out.write(chunk)
+                total = await asyncio.to_thread(
+                    _copy_upload_to_path, upload.file, tmp_path, max_bytes=settings.max_upload_bytes
+                )
 
                 source_value = f"{normalized_source_prefix}/{relative_path}"
                 res = ingest_file(
@@ -2401,6 +2678,7 @@ async def ingest_directory_api(
     finished_at = int(time.time())
     with connect(settings.sqlite_path) as conn:
         init_db(conn)
+        begin_immediate(conn)
         complete_ingestion_run(
             conn,
             run_id=run_id,
@@ -2409,7 +2687,7 @@ async def ingest_directory_api(
             docs_changed=changed,
             docs_unchanged=unchanged,
             bytes_processed=bytes_processed,
-            errors_json=json.dumps(errors, ensure_ascii=False),
+            errors_json=json_dumps(errors),
             finished_at=finished_at,
         )
         conn.commit()
@@ -2439,28 +2717,153 @@ async def ingest_directory_api(
 _STREAM_SENT_RE = re.compile(r"(?<=[.!?])\s+")
 
 
-def _sse_event(event: str, data: Any) -> str:
-    payload = json.dumps(data, ensure_ascii=False)
-    return f"event: {event}\ndata: {payload}\n\n"
+def _sse_event(event: str, data: Any) -> bytes:
+    # Frames are built as bytes so StreamingResponse sends them without re-encoding.
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + json_dumps_bytes(data) + b"\n\n"
+
+
+_STREAM_COALESCE_CHARS = 8192
+_STREAM_COALESCE_DELAY_S = 0.05
+
+
+_STREAM_END = object()
+# Strong references to provider-reading tasks; a stream may end before its task does.
+_stream_producers: set[asyncio.Future[None]] = set()
+
+
+async def _coalesce_stream_pieces(pieces: Iterable[Any]) -> AsyncIterator[str]:
+    """Merge provider text deltas into fewer SSE token frames.
+
+    The first delta is passed through as soon as it arrives so time-to-first-token is
+    unchanged; later ones are buffered until ~8K chars have accumulated or the oldest
+    buffered delta is 50 ms old. The provider iterator runs on a worker thread, so the
+    50 ms bound holds even while the provider stalls between deltas (and the blocking
+    reads stay off the event loop).
+    """
 
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[Any, BaseException | None]] = asyncio.Queue()
+    stop = threading.Event()
 
-def _stream_text_chunks(text: str) -> list[str]:
+    def _produce() -> None:
+        error: BaseException | None = None
+        try:
+            for piece in pieces:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, (piece, None))
+        except BaseException as e:
+            error = e
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, (_STREAM_END, error))
+
+    producer = asyncio.ensure_future(run_in_threadpool(_produce))
+    _stream_producers.add(producer)
+    producer.add_done_callback(_stream_producers.discard)
+    getter: asyncio.Future[tuple[Any, BaseException | None]] | None = None
+    buf: list[str] = []
+    size = 0
+    first = True
+    deadline = 0.0
+    try:
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(queue.get())
+            # asyncio.wait (unlike wait_for) never cancels the getter, so no delta is lost on timeout.
+            done, _ = await asyncio.wait({getter}, timeout=max(0.0, deadline - loop.time()) if buf else None)
+            if not done:
+                yield "".join(buf)
+                buf.clear()
+                size = 0
+                continue
+            piece, error = getter.result()
+            getter = None
+            if piece is _STREAM_END:
+                if error is not None:
+                    raise error
+                if buf:
+                    yield "".join(buf)
+                return
+            text = str(piece) if piece else ""
+            if not text:
+                continue
+            if first:
+                first = False
+                yield text
+                continue
+            if not buf:
+                deadline = loop.time() + _STREAM_COALESCE_DELAY_S
+            buf.append(text)
+            size += len(text)
+            if size >= _STREAM_COALESCE_CHARS:
+                yield "".join(buf)
+                buf.clear()
+                size = 0
+    finally:
+        # On early exit (client gone, error) the worker stops after its current delta.
+        stop.set()
+        if getter is not None:
+            getter.cancel()
+
+
+def _stream_text_chunks(text: str) -> Iterator[str]:
     raw = (text or "").strip()
     if not raw:
-        return []
-    chunks = [c.strip() for c in _STREAM_SENT_RE.split(raw) if c.strip()]
-    if chunks:
-        return chunks
-    return [raw]
+        return
+    # `raw` is stripped and each match consumes a whole whitespace run after [.!?],
+    # so the slices between matches are already non-empty and stripped.
+    start = 0
+    for m in _STREAM_SENT_RE.finditer(raw):
+        yield raw[start : m.start()]
+        start = m.end()
+    yield raw[start:]
 
 
-def _load_doc_map(doc_ids: set[str] | None = None) -> dict[str, Any]:
-    with connect(settings.sqlite_path) as conn:
-        init_db(conn)
-        docs = list_docs(conn)
+# Explain payloads describe at most this many retrieved chunks.
+_EXPLAIN_EVIDENCE_MAX = 8
+
+
+def _load_doc_map(doc_ids: set[str]) -> dict[str, DocRef]:
+    # Fetch just the docs (and fields) citations and explain payloads show.
     if not doc_ids:
-        return {d.doc_id: d for d in docs}
-    return {d.doc_id: d for d in docs if d.doc_id in doc_ids}
+        return {}
+    with connect_pooled(settings.sqlite_path) as conn:
+        init_db(conn)
+        return get_doc_refs_by_ids(conn, sorted(doc_ids))
+
+
+def _evidence_doc_ids(retrieved: list[RetrievedChunk]) -> set[str]:
+    return {r.doc_id for r in retrieved[:_EXPLAIN_EVIDENCE_MAX]}
+
+
+def _uncached_cited_doc_ids(citations: Iterable[Any] | None, doc_map: dict[str, Any]) -> set[str]:
+    # Answers may cite any context chunk, including ones past the explain slice.
+    return {c.doc_id for c in citations or []} - doc_map.keys()
+
+
+def _citation_payload(chunk_id: str, doc_id: str, idx: int, quote: str, doc_map: dict[str, Any]) -> dict[str, Any]:
+    d = doc_map.get(doc_id)
+    return {
+        "chunk_id": chunk_id,
+        "doc_id": doc_id,
+        "idx": idx,
+        "quote": quote,
+        "doc_title": d.title if d else None,
+        "doc_source": d.source if d else None,
+        "doc_version": d.doc_version if d else None,
+    }
+
+
+def _enrich_citations(citations: Iterable[Any] | None, doc_map: dict[str, Any]) -> list[dict[str, Any]]:
+    """Answer citations plus the doc metadata the UI shows next to each quote."""
+    return [_citation_payload(c.chunk_id, c.doc_id, c.idx, c.quote, doc_map) for c in citations or []]
+
+
+def _answer_context(answerer: Any, retrieved: list[RetrievedChunk]) -> list[Any]:
+    """Context for `answerer.answer`, skipping the tuple copy when the provider reads attributes."""
+    if getattr(answerer, "accepts_retrieved", False):
+        return retrieved
+    return [(r.chunk_id, r.doc_id, r.idx, r.text) for r in retrieved]
 
 
 def _retrieval_debug_payload(retrieved: list[RetrievedChunk], *, include_text: bool) -> list[dict[str, Any]]:
@@ -2473,7 +2876,7 @@ def _retrieval_debug_payload(retrieved: list[RetrievedChunk], *, include_text: b
             "score": r.score,
             "lexical_score": r.lexical_score,
             "vector_score": r.vector_score,
-            "text_preview": r.text[:240],
+            "text_preview": r.text_preview,
         }
         if include_text:
             item["text"] = r.text
@@ -2493,26 +2896,42 @@ def _signal_summary(r: RetrievedChunk) -> str:
     return "hybrid relevance"
 
 
-def _citations_are_weak(question: str, citations_out: list[dict[str, Any]]) -> bool:
-    """Heuristic guardrail: reject answers backed by weak/unrelated citations."""
+@functools.lru_cache(maxsize=2048)
+def _question_term_variants(question: str) -> frozenset[str]:
+    """Morphological variants of the question's first key terms (cached per question)."""
+    terms = _extract_key_terms(question)[:8]
+    return frozenset(v for term in terms for v in _term_variants(term))
+
+
+@functools.lru_cache(maxsize=2048)
+def _quote_tokens(quote: str) -> frozenset[str]:
+    return frozenset(_TOKEN_RE.findall(quote.lower()))
+
+
+def _citations_are_weak(question_variants: frozenset[str], citations_out: list[dict[str, Any]]) -> bool:
+    """Heuristic guardrail: reject answers backed by weak/unrelated citations.
+
+    `question_variants` comes from `_question_term_variants(question)` so the
+    question is tokenized once per request rather than once per check.
+    """
     if not citations_out:
         return True
 
-    quotes = [str(c.get("quote") or "").strip() for c in citations_out if str(c.get("quote") or "").strip()]
+    quotes = [q for q in (str(c.get("quote") or "").strip() for c in citations_out) if q]
     if not quotes:
         return True
 
-    combined = " ".join(quotes).lower()
-
-    terms = _extract_key_terms(question)[:8]
-    if not terms:
+    if not question_variants:
         return False
 
-    matches = 0
-    for term in terms:
-        if any(v in combined for v in _term_variants(term)):
-            matches += 1
-    return matches == 0
+    # Whole-token hits are the common case and resolve with a set intersection.
+    for quote in quotes:
+        if not question_variants.isdisjoint(_quote_tokens(quote)):
+            return False
+
+    # Preserve substring semantics (e.g. "deploy" inside "deployment").
+    combined = " ".join(quotes).lower()
+    return not any(v in combined for v in question_variants)
 
 
 def _refusal_details(refusal_reason: str | None, *, safety_reasons: list[str] | None = None) -> dict[str, Any]:
@@ -2570,33 +2989,33 @@ def _build_explain_payload(
     debug: bool,
     safety_reasons: list[str] | None = None,
 ) -> dict[str, Any]:
-    selected_chunk_ids = {str(c.get("chunk_id", "")) for c in citations_out if c.get("chunk_id")}
     evidence: list[dict[str, Any]] = []
-    capped = retrieved[: min(8, len(retrieved))]
-    private_detail_enabled = bool(debug) and not bool(settings.public_demo_mode)
-
-    for r in capped:
-        d = doc_map.get(r.doc_id) if isinstance(doc_map, dict) else None
-        selected = r.chunk_id in selected_chunk_ids
-        item: dict[str, Any] = {
-            "doc_id": r.doc_id,
-            "doc_title": d.title if d else None,
-            "doc_source": d.source if d else None,
-            "snippet": r.text[:240],
-            "selected": selected,
-            "why_selected": "used in the final cited answer" if selected else f"high {_signal_summary(r)}",
-        }
-        if private_detail_enabled:
-            item.update(
-                {
-                    "chunk_id": r.chunk_id,
-                    "idx": r.idx,
-                    "score": r.score,
-                    "lexical_score": r.lexical_score,
-                    "vector_score": r.vector_score,
-                }
-            )
-        evidence.append(item)
+    public_demo_mode = settings.public_demo_mode
+    private_detail_enabled = debug and not public_demo_mode
+
+    # Refusal paths pass no citations, and the early ones no retrieval results either.
+    if retrieved:
+        selected_chunk_ids = {str(c.get("chunk_id", "")) for c in citations_out if c.get("chunk_id")}
+        docs = doc_map if isinstance(doc_map, dict) else {}
+        for r in retrieved[:_EXPLAIN_EVIDENCE_MAX]:
+            d = docs.get(r.doc_id)
+            selected = r.chunk_id in selected_chunk_ids
+            item: dict[str, Any] = {
+                "doc_id": r.doc_id,
+                "doc_title": d.title if d else None,
+                "doc_source": d.source if d else None,
+                "snippet": r.text_preview,
+                "selected": selected,
+                "why_selected": "used in the final cited answer" if selected else f"high {_signal_summary(r)}",
+            }
+            if private_detail_enabled:
+                # Assign in place rather than item.update({...}), which builds a throwaway dict per row.
+                item["chunk_id"] = r.chunk_id
+                item["idx"] = r.idx
+                item["score"] = r.score
+                item["lexical_score"] = r.lexical_score
+                item["vector_score"] = r.vector_score
+            evidence.append(item)
 
     return {
         "question": question,
@@ -2605,15 +3024,77 @@ def _build_explain_payload(
             "summary": "Hybrid retrieval combines lexical keyword matching and semantic similarity, then reranks chunks.",
             "top_k": int(top_k),
             "retrieved_chunks": len(retrieved),
-            "public_demo_mode": bool(settings.public_demo_mode),
+            "public_demo_mode": public_demo_mode,
             "debug_details_included": private_detail_enabled,
         },
         "refusal": _refusal_details(refusal_reason, safety_reasons=safety_reasons),
     }
 
 
+# Repeat questions (demo prompts, retries, UI re-renders) skip hybrid retrieval.
+# Entries are keyed on the retrieval cache version, so API writes invalidate them
+# immediately; the TTL bounds staleness for retention expiry and out-of-band
+# writes. Entries past half their TTL are served while a background refresh runs.
+_RETRIEVAL_CACHE_MAX_ENTRIES = 1024
+_retrieval_cache: OrderedDict[tuple[str, int, str, int], tuple[float, list[RetrievedChunk]]] = OrderedDict()
+_retrieval_cache_lock = threading.Lock()
+_retrieval_refreshing: set[tuple[str, int, str, int]] = set()
+
+
+def _store_retrieval(key: tuple[str, int, str, int], retrieved: list[RetrievedChunk]) -> None:
+    with _retrieval_cache_lock:
+        if key[1] != cache_version():
+            return
+        if _retrieval_cache and next(iter(_retrieval_cache))[1] != key[1]:
+            _retrieval_cache.clear()
+        _retrieval_cache[key] = (time.monotonic(), list(retrieved))
+        _retrieval_cache.move_to_end(key)
+        while len(_retrieval_cache) > _RETRIEVAL_CACHE_MAX_ENTRIES:
+            _retrieval_cache.popitem(last=False)
+
+
+def _refresh_retrieval(key: tuple[str, int, str, int]) -> None:
+    try:
+        _store_retrieval(key, retrieve(key[2], top_k=key[3]))
+    except Exception:
+        logger.exception("Background retrieval refresh failed")
+    finally:
+        with _retrieval_cache_lock:
+            _retrieval_refreshing.discard(key)
+
+
+def _retrieve_cached(question: str, *, top_k: int) -> list[RetrievedChunk]:
+    """`retrieve()` behind a small stale-while-revalidate cache."""
+
+    ttl = settings.retrieval_cache_ttl_s
+    if ttl <= 0:
+        return retrieve(question, top_k=top_k)
+
+    key = (current_tenant_id(), cache_version(), question, top_k)
+    with _retrieval_cache_lock:
+        cached = _retrieval_cache.get(key)
+        if cached is not None:
+            _retrieval_cache.move_to_end(key)
+    if cached is not None:
+        age = time.monotonic() - cached[0]
+        if age < ttl:
+            if age >= ttl / 2:
+                with _retrieval_cache_lock:
+                    start_refresh = key not in _retrieval_refreshing
+                    _retrieval_refreshing.add(key)
+                if start_refresh:
+                    # Copy the context so the refresh sees the caller's tenant.
+                    ctx = contextvars.copy_context()
+                    threading.Thread(target=ctx.run, args=(_refresh_retrieval, key), daemon=True).start()
+            return list(cached[1])
+
+    retrieved = retrieve(question, top_k=top_k)
+    _store_retrieval(key, retrieved)
+    return retrieved
+
+
 @app.post("/api/query")
-def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -> dict[str, Any]:
+async def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -> dict[str, Any]:
     """Core query endpoint.
 
     Staff-grade behaviors:
@@ -2629,17 +3110,21 @@ def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -
     if len(question) > settings.max_question_chars:
         raise HTTPException(status_code=400, detail=f"Question too long (max {settings.max_question_chars} chars)")
 
+    # Settings are immutable; resolve the per-request knobs once.
+    public_demo_mode = settings.public_demo_mode
+    citations_required = settings.citations_required
+
     # Clamp knobs for public demos.
     top_k = max(1, min(int(req.top_k or settings.top_k_default), settings.max_top_k))
-    debug = bool(req.debug) and not settings.public_demo_mode
-    include_retrieval_text = bool(settings.allow_chunk_view) and not settings.public_demo_mode
+    debug = req.debug and not public_demo_mode
+    include_retrieval_text = settings.allow_chunk_view and not public_demo_mode
     refusal_reason: str | None = None
 
     # --- Prompt-injection/circumvention detection ---
     safety_start = time.perf_counter()
     with span(
         "safety.prompt_injection_scan",
-        attributes={"question_length": len(question), "otel_debug_content": bool(settings.otel_debug_content)},
+        attributes={"question_length": len(question), "otel_debug_content": settings.otel_debug_content},
     ):
         inj = detect_prompt_injection(question)
     record_safety_scan_metric(latency_ms=(time.perf_counter() - safety_start) * 1000.0)
@@ -2670,15 +3155,16 @@ def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -
         "retrieval.retrieve",
         attributes={"top_k": top_k, "embeddings_backend": settings.embeddings_backend},
     ):
-        retrieved = retrieve(question, top_k=top_k)
+        # Retrieval and generation block for a while; run them in the AnyIO threadpool that sync
+        # endpoints use (its 40-token limiter, not the small asyncio default executor). Worker
+        # threads inherit the request's tenant/trace context.
+        retrieved = await run_in_threadpool(_retrieve_cached, question, top_k=top_k)
     record_retrieval_metric(
         latency_ms=(time.perf_counter() - retrieval_start) * 1000.0,
         top_k=top_k,
         backend=settings.embeddings_backend,
     )
-    context = [(r.chunk_id, r.doc_id, r.idx, r.text) for r in retrieved]
-
-    if not context:
+    if not retrieved:
         refusal_reason = "insufficient_evidence"
         out_no_context: dict[str, Any] = {
             "question": question,
@@ -2701,9 +3187,12 @@ def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -
         )
         return out_no_context
 
+    # Docs for the explain evidence, shared by the refusal and answer paths below; cited docs
+    # outside that slice are added once the answer is in.
+    doc_map = await run_in_threadpool(_load_doc_map, _evidence_doc_ids(retrieved))
+
     if _is_unrelated_question(question, retrieved):
         refusal_reason = "insufficient_evidence"
-        doc_map = _load_doc_map({r.doc_id for r in retrieved})
         out_unrelated: dict[str, Any] = {
             "question": question,
             "answer": "I don’t have enough evidence in the indexed sources to answer that.",
@@ -2726,20 +3215,22 @@ def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -
         return out_unrelated
 
     # --- Answer ---
-    answerer = get_answerer()
+    # Building the answerer may import or configure a provider client; keep it off the loop.
+    answerer = await run_in_threadpool(get_answerer)
+    provider_name = answerer.name
     try:
         generation_start = time.perf_counter()
         with span(
             "generation.answer",
             attributes={
-                "provider": getattr(answerer, "name", settings.effective_llm_provider),
-                "context_chunks": len(context),
+                "provider": provider_name,
+                "context_chunks": len(retrieved),
             },
         ):
-            ans = answerer.answer(question, context)
+            ans = await run_in_threadpool(answerer.answer, question, _answer_context(answerer, retrieved))
         record_generation_metric(
             latency_ms=(time.perf_counter() - generation_start) * 1000.0,
-            provider=str(getattr(answerer, "name", settings.effective_llm_provider)),
+            provider=provider_name,
             streaming=False,
         )
     except Exception:
@@ -2767,27 +3258,15 @@ def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -
         return out_internal
 
     # Enrich citations with doc metadata.
-    citations_out: list[dict[str, Any]] = []
-    doc_map = _load_doc_map({r.doc_id for r in retrieved})
-
-    for c in ans.citations or []:
-        d = doc_map.get(c.doc_id)
-        citations_out.append(
-            {
-                "chunk_id": c.chunk_id,
-                "doc_id": c.doc_id,
-                "idx": c.idx,
-                "quote": c.quote,
-                "doc_title": d.title if d else None,
-                "doc_source": d.source if d else None,
-                "doc_version": d.doc_version if d else None,
-            }
-        )
+    missing_doc_ids = _uncached_cited_doc_ids(ans.citations, doc_map)
+    if missing_doc_ids:
+        doc_map.update(await run_in_threadpool(_load_doc_map, missing_doc_ids))
+    citations_out = _enrich_citations(ans.citations, doc_map)
 
     # Enforce grounding (citations required).
     # - In PUBLIC_DEMO_MODE this is always on.
     # - In private mode it is controlled by CITATIONS_REQUIRED (default: true).
-    if bool(getattr(ans, "refused", False)):
+    if ans.refused:
         refusal_reason = "insufficient_evidence"
         out_refused: dict[str, Any] = {
             "question": question,
@@ -2810,7 +3289,7 @@ def query_api(req: QueryRequest, _auth: Any = Depends(require_role("reader"))) -
         )
         return out_refused
 
-    if bool(settings.citations_required) and _citations_are_weak(question, citations_out):
+    if citations_required and _citations_are_weak(_question_term_variants(question), citations_out):
         refusal_reason = "insufficient_evidence"
         out_no_citations: dict[str, Any] = {
             "question": question,
@@ -2866,16 +3345,21 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
     if len(question) > settings.max_question_chars:
         raise HTTPException(status_code=400, detail=f"Question too long (max {settings.max_question_chars} chars)")
 
+    # Settings are immutable; resolve the per-request knobs once.
+    public_demo_mode = settings.public_demo_mode
+    citations_required = settings.citations_required
+    otel_debug_content = settings.otel_debug_content
+
     top_k = max(1, min(int(req.top_k or settings.top_k_default), settings.max_top_k))
-    debug = bool(req.debug) and not settings.public_demo_mode
-    include_retrieval_text = bool(settings.allow_chunk_view) and not settings.public_demo_mode
+    debug = req.debug and not public_demo_mode
+    include_retrieval_text = settings.allow_chunk_view and not public_demo_mode
 
     async def _events():
         try:
             safety_start = time.perf_counter()
             with span(
                 "safety.prompt_injection_scan",
-                attributes={"question_length": len(question), "otel_debug_content": bool(settings.otel_debug_content)},
+                attributes={"question_length": len(question), "otel_debug_content": otel_debug_content},
             ):
                 inj = detect_prompt_injection(question)
             record_safety_scan_metric(latency_ms=(time.perf_counter() - safety_start) * 1000.0)
@@ -2911,7 +3395,7 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
                 "retrieval.retrieve",
                 attributes={"top_k": top_k, "embeddings_backend": settings.embeddings_backend},
             ):
-                retrieved = retrieve(question, top_k=top_k)
+                retrieved = _retrieve_cached(question, top_k=top_k)
             record_retrieval_metric(
                 latency_ms=(time.perf_counter() - retrieval_start) * 1000.0,
                 top_k=top_k,
@@ -2919,7 +3403,7 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
             )
             retrieval_out = _retrieval_debug_payload(retrieved, include_text=include_retrieval_text)
             yield _sse_event("retrieval", retrieval_out)
-            doc_map = _load_doc_map({r.doc_id for r in retrieved}) if retrieved else {}
+            doc_map = _load_doc_map(_evidence_doc_ids(retrieved))
 
             if not retrieved or _is_unrelated_question(question, retrieved):
                 refusal_text = "I don’t have enough evidence in the indexed sources to answer that."
@@ -2947,39 +3431,24 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
                 )
                 return
 
-            context = [(r.chunk_id, r.doc_id, r.idx, r.text) for r in retrieved]
             answerer = get_answerer()
+            context = _answer_context(answerer, retrieved)
+            question_variants = _question_term_variants(question)
 
-            provider_name = str(getattr(answerer, "name", settings.effective_llm_provider))
+            provider_name = answerer.name
             stream_fn = getattr(answerer, "stream_answer", None)
             if callable(stream_fn):
-                stream_citations: list[dict[str, Any]] = []
-                for r in retrieved[: min(3, len(retrieved))]:
-                    d = doc_map.get(r.doc_id)
-                    stream_citations.append(
-                        {
-                            "chunk_id": r.chunk_id,
-                            "doc_id": r.doc_id,
-                            "idx": r.idx,
-                            "quote": r.text[:300],
-                            "doc_title": d.title if d else None,
-                            "doc_source": d.source if d else None,
-                            "doc_version": d.doc_version if d else None,
-                        }
-                    )
+                stream_citations = [
+                    _citation_payload(r.chunk_id, r.doc_id, r.idx, r.text[:300], doc_map) for r in retrieved[:3]
+                ]
 
                 streamed_parts: list[str] = []
                 generation_start = time.perf_counter()
                 with span(
                     "generation.answer",
-                    attributes={"provider": provider_name, "context_chunks": len(context), "streaming": True},
+                    attributes={"provider": provider_name, "context_chunks": len(retrieved), "streaming": True},
                 ):
-                    for piece in stream_fn(question, context):
-                        if not piece:
-                            continue
-                        token_text = str(piece)
-                        if not token_text:
-                            continue
+                    async for token_text in _coalesce_stream_pieces(stream_fn(question, context)):
                         streamed_parts.append(token_text)
                         yield _sse_event("token", {"text": token_text})
                         await asyncio.sleep(0)
@@ -2999,16 +3468,12 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
                     answer_text = "I don’t have enough evidence in the indexed sources to answer that."
                     stream_citations = []
 
-                if bool(settings.citations_required) and not refused and not stream_citations:
+                if citations_required and not refused and not stream_citations:
                     refused = True
                     refusal_reason = "insufficient_evidence"
                     answer_text = "I don’t have enough evidence in the indexed sources to answer that."
                     stream_citations = []
-                if (
-                    bool(settings.citations_required)
-                    and not refused
-                    and _citations_are_weak(question, stream_citations)
-                ):
+                if citations_required and not refused and _citations_are_weak(question_variants, stream_citations):
                     refused = True
                     refusal_reason = "insufficient_evidence"
                     answer_text = "I don’t have enough evidence in the indexed sources to answer that."
@@ -3041,7 +3506,7 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
                 "generation.answer",
                 attributes={
                     "provider": provider_name,
-                    "context_chunks": len(context),
+                    "context_chunks": len(retrieved),
                     "streaming": False,
                 },
             ):
@@ -3052,22 +3517,12 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
                 streaming=False,
             )
 
-            citations_out: list[dict[str, Any]] = []
-            for c in ans.citations or []:
-                d = doc_map.get(c.doc_id)
-                citations_out.append(
-                    {
-                        "chunk_id": c.chunk_id,
-                        "doc_id": c.doc_id,
-                        "idx": c.idx,
-                        "quote": c.quote,
-                        "doc_title": d.title if d else None,
-                        "doc_source": d.source if d else None,
-                        "doc_version": d.doc_version if d else None,
-                    }
-                )
+            missing_doc_ids = _uncached_cited_doc_ids(ans.citations, doc_map)
+            if missing_doc_ids:
+                doc_map.update(_load_doc_map(missing_doc_ids))
+            citations_out = _enrich_citations(ans.citations, doc_map)
 
-            refused = bool(getattr(ans, "refused", False))
+            refused = ans.refused
             refusal_reason = "insufficient_evidence" if refused else None
             answer_text = ans.text
             provider = ans.provider
@@ -3076,7 +3531,7 @@ async def query_stream_api(req: QueryRequest, _auth: Any = Depends(require_role(
                 answer_text = "I don’t have enough evidence in the indexed sources to answer that."
                 citations_out = []
 
-            if bool(settings.citations_required) and not refused and _citations_are_weak(question, citations_out):
+            if citations_required and not refused and _citations_are_weak(question_variants, citations_out):
                 refused = True
                 refusal_reason = "insufficient_evidence"
                 answer_text = "I don’t have enough evidence in the indexed sources to answer that."
@@ -3336,11 +3791,11 @@ def eval_api(req: EvalRequest, request: Request, _auth: AuthContext = Depends(re
             app_version=str(settings.version),
             embeddings_backend=str(settings.embeddings_backend),
             embeddings_model=str(settings.embeddings_model),
-            retrieval_config_json=json.dumps(retrieval_config, ensure_ascii=False),
-            provider_config_json=json.dumps(provider_config, ensure_ascii=False),
-            summary_json=json.dumps(summary, ensure_ascii=False),
-            diff_from_prev_json=json.dumps(diff_from_prev, ensure_ascii=False),
-            details_json=json.dumps(details, ensure_ascii=False),
+            retrieval_config_json=json_dumps(retrieval_config),
+            provider_config_json=json_dumps(provider_config),
+            summary_json=json_dumps(summary),
+            diff_from_prev_json=json_dumps(diff_from_prev),
+            details_json=json_dumps(details),
             error=None,
         )
         _record_audit_event(
@@ -3391,7 +3846,7 @@ def eval_runs_api(
     if settings.public_demo_mode or not settings.allow_eval:
         raise HTTPException(status_code=403, detail="Eval endpoint disabled in this deployment")
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         runs = list_eval_runs(conn, limit=limit)
     return {"runs": [r.to_dict(include_case_details=False) for r in runs]}
@@ -3405,7 +3860,7 @@ def eval_run_detail_api(
     if settings.public_demo_mode or not settings.allow_eval:
         raise HTTPException(status_code=403, detail="Eval endpoint disabled in this deployment")
 
-    with connect(settings.sqlite_path) as conn:
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         run = get_eval_run(conn, run_id)
     if run is None:
@@ -3423,42 +3878,105 @@ def eval_run_detail_api(
 #   - `pnpm build` emits ./web/dist
 #   - the API serves ./web/dist as a SPA
 
+
+class _ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for Vite's /assets output.
+
+    Vite puts a content hash in every filename under dist/assets, so a given URL
+    never changes content and browsers can cache it for a year without
+    revalidating. (index.html, which references them, is served with no-cache.)
+    """
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 if (DIST_DIR / "assets").exists():
-    app.mount("/assets", StaticFiles(directory=str(DIST_DIR / "assets")), name="assets")
+    app.mount("/assets", _ImmutableStaticFiles(directory=str(DIST_DIR / "assets")), name="assets")
 
 
-@app.get("/", response_class=HTMLResponse)
-def ui_index() -> Any:
+# index.html path -> (mtime_ns, size, body, etag, gzip body or None)
+_index_html_cache: dict[Path, tuple[int, int, bytes, str, bytes | None]] = {}
+
+
+def _index_html_response(request: Request) -> Response | None:
+    """Serve dist/index.html from memory, re-reading it only after a rebuild changes the file.
+
+    A gzip copy is compressed once per build at the highest level and served to
+    clients that accept it (GZipMiddleware leaves already-encoded responses alone).
+    """
+
     index = DIST_DIR / "index.html"
-    if index.exists():
-        return FileResponse(str(index))
+    try:
+        st = index.stat()
+    except OSError:
+        return None
+    cached = _index_html_cache.get(index)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        body = index.read_bytes()
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        cached = (st.st_mtime_ns, st.st_size, body, etag, compressed if len(compressed) < len(body) else None)
+        _index_html_cache[index] = cached
+    _, _, body, etag, gz = cached
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if gz is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        # Each encoding is a distinct representation, so it gets its own strong ETag.
+        body, etag = gz, etag[:-1] + '-gz"'
+        headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = etag
+    if etag in request.headers.get("if-none-match", ""):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
+@app.get("/", response_class=HTMLResponse)
+def ui_index(request: Request) -> Any:
+    index_response = _index_html_response(request)
+    if index_response is not None:
+        return index_response
     return HTMLResponse(
         "<h1>Grounded Knowledge Platform</h1>"
         "<p>Frontend not built yet. See README for <code>pnpm dev</code> or <code>pnpm build</code>.</p>"
     )
 
 
+# First path segments the SPA fallback must never answer for.
+_UI_RESERVED_ROOTS = frozenset({"api", "openapi", "openapi.json", "redoc", "health"})
+
+
+def _dist_file_path(path: str) -> str | None:
+    """Return the file under DIST_DIR that `path` names, or None.
+
+    SECURITY: rejects absolute paths and anything that normalizes to outside the
+    dist root (e.g. /../../pyproject.toml). This is a string check plus a single
+    stat rather than a realpath; dist is our own build output, so symlinks inside
+    it are trusted.
+    """
+
+    norm = os.path.normpath(path)
+    if os.path.isabs(norm) or norm == os.pardir or norm.startswith(os.pardir + os.sep):
+        return None
+    candidate = os.path.join(DIST_DIR, norm)
+    return candidate if os.path.isfile(candidate) else None
+
+
 @app.get("/{path:path}")
-def ui_fallback(path: str) -> Any:
+def ui_fallback(path: str, request: Request) -> Any:
     # Don't mask API/Swagger endpoints.
-    if path.startswith(("api", "openapi", "redoc", "health")):
+    if path.partition("/")[0] in _UI_RESERVED_ROOTS:
         raise HTTPException(status_code=404)
 
     # Serve file if it exists at dist root (e.g., favicon.svg).
-    #
-    # SECURITY: Prevent path traversal (e.g. /../../pyproject.toml).
-    root = DIST_DIR
-    try:
-        candidate = (DIST_DIR / path).resolve()
-        candidate.relative_to(root)
-    except Exception:
-        candidate = None
-
-    if candidate and candidate.exists() and candidate.is_file():
-        return FileResponse(str(candidate))
+    candidate = _dist_file_path(path)
+    if candidate is not None:
+        return FileResponse(candidate)
 
     # SPA fallback
-    index = DIST_DIR / "index.html"
-    if index.exists():
-        return FileResponse(str(index))
+    index_response = _index_html_response(request)
+    if index_response is not None:
+        return index_response
     raise HTTPException(status_code=404, detail="Frontend not built")
@@ -24,7 +24,7 @@ from __future__ import annotations
 import time
 from typing import Iterable
 
-from .storage import Doc, delete_doc, list_docs
+from .storage import Doc, list_expired_doc_ids, list_expired_docs, purge_docs_by_ids
 
 
 RETENTION_TTLS_SECONDS: dict[str, int] = {
@@ -53,16 +53,27 @@ def retention_is_expired(retention: str, *, updated_at: int, now: int | None = N
 
 def iter_expired_docs(docs: Iterable[Doc], *, now: int | None = None) -> list[Doc]:
     """Return the subset of docs whose retention policy has expired."""
+    cutoffs = retention_cutoffs(now=now)
     expired: list[Doc] = []
     for d in docs:
-        if retention_is_expired(str(d.retention), updated_at=int(d.updated_at), now=now):
+        cutoff = cutoffs.get(d.retention)
+        if cutoff is not None and d.updated_at <= cutoff:
             expired.append(d)
     return expired
 
 
+def retention_cutoffs(*, now: int | None = None) -> dict[str, int]:
+    """Map each expiring retention policy to the latest `updated_at` that has expired."""
+    now_i = int(time.time()) if now is None else int(now)
+    return {retention: now_i - ttl for retention, ttl in RETENTION_TTLS_SECONDS.items()}
+
+
 def find_expired_docs(conn, *, now: int | None = None) -> list[Doc]:
-    """Find docs in the DB whose retention policy has expired."""
-    return iter_expired_docs(list_docs(conn), now=now)
+    """Find docs in the DB whose retention policy has expired.
+
+    The retention predicate runs in SQL so unexpired docs are never loaded.
+    """
+    return list_expired_docs(conn, retention_cutoffs(now=now))
 
 
 def purge_expired_docs(conn, *, now: int | None = None, apply: bool = False) -> list[str]:
@@ -72,12 +83,9 @@ def purge_expired_docs(conn, *, now: int | None = None, apply: bool = False) ->
 
     If `apply` is False, no deletes are performed and the function acts as a dry-run.
     """
-    expired = find_expired_docs(conn, now=now)
-    ids = [d.doc_id for d in expired]
+    ids = list_expired_doc_ids(conn, retention_cutoffs(now=now))
     if not apply:
         return ids
 
-    for doc_id in ids:
-        delete_doc(conn, doc_id)
-    conn.commit()
+    purge_docs_by_ids(conn, ids)
     return ids
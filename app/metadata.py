@@ -5,13 +5,17 @@ import re
 CLASSIFICATIONS: tuple[str, ...] = ("public", "internal", "confidential", "restricted")
 RETENTIONS: tuple[str, ...] = ("none", "30d", "90d", "1y", "indefinite")
 
-ALLOWED_CLASSIFICATIONS: set[str] = set(CLASSIFICATIONS)
-ALLOWED_RETENTIONS: set[str] = set(RETENTIONS)
+ALLOWED_CLASSIFICATIONS: frozenset[str] = frozenset(CLASSIFICATIONS)
+ALLOWED_RETENTIONS: frozenset[str] = frozenset(RETENTIONS)
 
 _TAG_RE = re.compile(r"[^a-z0-9:_\-]+")
+_TAG_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789:_-")
 
 
 def normalize_classification(value: str | None) -> str:
+    # Fast path: values that are already normalized need no strip/lower copies.
+    if type(value) is str and value in ALLOWED_CLASSIFICATIONS:
+        return value
     if value is None or not str(value).strip():
         return "public"
     v = str(value).strip().lower()
@@ -21,6 +25,8 @@ def normalize_classification(value: str | None) -> str:
 
 
 def normalize_retention(value: str | None) -> str:
+    if type(value) is str and value in ALLOWED_RETENTIONS:
+        return value
     if value is None or not str(value).strip():
         return "indefinite"
     v = str(value).strip().lower()
@@ -30,35 +36,28 @@ def normalize_retention(value: str | None) -> str:
 
 
 def normalize_tags(value: str | list[str] | None) -> list[str]:
-    tags: list[str] = []
     if value is None:
-        return tags
+        return []
 
     if isinstance(value, str):
         raw = [t.strip() for t in value.split(",")]
     else:
         raw = [str(t).strip() for t in value]
 
+    # de-dupe while preserving order (dict keys keep insertion order)
+    out: dict[str, None] = {}
     for t in raw:
         if not t:
             continue
         t2 = t.lower()
-        t2 = _TAG_RE.sub("-", t2).strip("-")
+        # Most tags are already clean; only run the regex when a character needs replacing.
+        if not _TAG_CHARS.issuperset(t2):
+            t2 = _TAG_RE.sub("-", t2)
+        t2 = t2.strip("-")
         if not t2:
             continue
-        if len(t2) > 32:
-            t2 = t2[:32]
-        tags.append(t2)
-
-    # de-dupe while preserving order
-    out: list[str] = []
-    seen: set[str] = set()
-    for t in tags:
-        if t in seen:
-            continue
-        seen.add(t)
-        out.append(t)
+        out[t2[:32]] = None
         if len(out) >= 20:
             break
 
-    return out
+    return list(out)
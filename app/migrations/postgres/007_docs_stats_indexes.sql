@@ -0,0 +1,5 @@
+-- 007_docs_stats_indexes.sql
+-- Covering indexes for the per-tenant classification/retention GROUP BYs in /api/stats.
+
+CREATE INDEX IF NOT EXISTS idx_docs_tenant_classification ON docs(tenant_id, classification);
+CREATE INDEX IF NOT EXISTS idx_docs_tenant_retention ON docs(tenant_id, retention);
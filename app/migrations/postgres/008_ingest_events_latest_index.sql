@@ -0,0 +1,4 @@
+-- 008_ingest_events_latest_index.sql
+-- Serves "latest ingest event for a doc" lookups (e.g. doc export overlap) from the index.
+
+CREATE INDEX IF NOT EXISTS idx_events_tenant_doc_ingested_at ON ingest_events(tenant_id, doc_id, ingested_at);
@@ -0,0 +1,20 @@
+-- 009_doc_tags.sql
+-- Normalized doc/tag rows so /api/stats top tags is an index scan instead of parsing docs.tags_json.
+
+CREATE TABLE IF NOT EXISTS doc_tags (
+  doc_id TEXT NOT NULL REFERENCES docs(doc_id) ON DELETE CASCADE,
+  tenant_id TEXT NOT NULL DEFAULT 'default',
+  tag TEXT NOT NULL,
+  PRIMARY KEY (doc_id, tag)
+);
+
+CREATE INDEX IF NOT EXISTS idx_doc_tags_tenant_tag ON doc_tags(tenant_id, tag);
+
+INSERT INTO doc_tags (doc_id, tenant_id, tag)
+SELECT DISTINCT d.doc_id, d.tenant_id, lower(btrim(t.value))
+FROM docs d
+CROSS JOIN LATERAL jsonb_array_elements_text(
+  CASE WHEN jsonb_typeof(d.tags_json::jsonb) = 'array' THEN d.tags_json::jsonb ELSE '[]'::jsonb END
+) AS t(value)
+WHERE btrim(t.value) <> ''
+ON CONFLICT DO NOTHING;
@@ -11,12 +11,18 @@ CREATE TABLE IF NOT EXISTS schema_migrations (
 );
 """
 
+# Arbitrary app-wide key for pg_advisory_xact_lock; serializes concurrent boots
+# (e.g. several Cloud Run instances starting at once) so each migration runs once.
+_MIGRATIONS_LOCK_KEY = 0x676B705F6D696772
+
 
 def apply_postgres_migrations(conn: Any, *, migrations_dir: Path | None = None) -> list[str]:
     """Apply Postgres SQL migrations in filename order.
 
     - Uses a simple schema_migrations table (filename -> applied_at).
     - Each migration file should be idempotent and safe to rerun, but we still track applied files.
+    - Holds a transaction-scoped advisory lock while checking and applying, so concurrent
+      callers wait and then see the migrations the first one applied.
 
     Returns a list of newly-applied migration filenames (in order).
     """
@@ -28,6 +34,7 @@ def apply_postgres_migrations(conn: Any, *, migrations_dir: Path | None = None)
 
     applied: set[str] = set()
     with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_MIGRATIONS_LOCK_KEY,))
         cur.execute(_MIGRATIONS_TABLE_SQL)
         cur.execute("SELECT filename FROM schema_migrations")
         rows = cur.fetchall()
@@ -1,12 +1,81 @@
 from __future__ import annotations
 
-import json
+import atexit
+import functools
 import logging
 import os
+import queue
 import time
 import uuid
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Mapping, Optional, Tuple
 
+from .jsonutil import dumps_bytes
+
+
+def _is_preserialized(record: logging.LogRecord) -> bool:
+    return isinstance(record.msg, (str, bytes)) and not record.args and not record.exc_info and not record.stack_info
+
+
+class JSONLineHandler(logging.StreamHandler):
+    """Stream handler that writes pre-serialized JSON log lines verbatim.
+
+    Structured events are already JSON (str or UTF-8 bytes), so they skip the
+    Formatter and are written in a single call. Records that need formatting
+    (%-style args, exceptions, stack info) fall back to the normal path.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        msg = record.msg
+        if not _is_preserialized(record):
+            super().emit(record)
+            return
+        try:
+            stream = self.stream
+            if isinstance(msg, bytes):
+                buffer = getattr(stream, "buffer", None)
+                if buffer is not None:
+                    # Flush the text layer first so lines stay ordered.
+                    stream.flush()
+                    buffer.write(msg + b"\n")
+                else:
+                    stream.write(msg.decode("utf-8") + self.terminator)
+            else:
+                stream.write(msg + self.terminator)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _JSONQueueHandler(QueueHandler):
+    """Queue handler that passes pre-serialized JSON lines through untouched.
+
+    The stock `prepare()` formats every record into a str, which would turn a
+    bytes payload into its repr. Other records keep the stock behavior.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if _is_preserialized(record):
+            return record
+        return super().prepare(record)
+
+
+_LOGGER = logging.getLogger("gkp")
+_LOG_LISTENER: QueueListener | None = None
+
+
+def _stop_log_listener() -> None:
+    global _LOG_LISTENER
+    if _LOG_LISTENER is not None:
+        # stop() drains the queue before returning, so no queued lines are lost.
+        _LOG_LISTENER.stop()
+        _LOG_LISTENER = None
+
+
+atexit.register(_stop_log_listener)
+
 
 def configure_logging() -> None:
     """Configure application logging.
@@ -16,8 +85,13 @@ def configure_logging() -> None:
 
     This keeps the demo lightweight (no extra logging dependencies) while still
     enabling structured filtering by request_id, latency, status, etc.
+
+    With `LOG_ASYNC=1`, request threads only enqueue records and a background
+    listener thread does the stdout/stderr writes.
     """
 
+    global _LOG_LISTENER
+
     level_name = os.getenv("LOG_LEVEL", "INFO").upper().strip()
     level = getattr(logging, level_name, logging.INFO)
 
@@ -26,20 +100,31 @@ def configure_logging() -> None:
     logger = logging.getLogger("gkp")
     logger.setLevel(level)
 
-    handler = logging.StreamHandler()
+    handler = JSONLineHandler()
     handler.setFormatter(logging.Formatter("%(message)s"))
 
     # Replace handlers so repeated imports don't duplicate logs.
+    _stop_log_listener()
     logger.handlers.clear()
-    logger.addHandler(handler)
     logger.propagate = False
 
+    if os.getenv("LOG_ASYNC", "0").strip().lower() in {"1", "true", "yes", "on"}:
+        log_queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        _LOG_LISTENER = QueueListener(log_queue, handler, respect_handler_level=True)
+        _LOG_LISTENER.start()
+        logger.addHandler(_JSONQueueHandler(log_queue))
+    else:
+        logger.addHandler(handler)
+
 
 def parse_cloud_trace_context(headers: Mapping[str, str]) -> Tuple[Optional[str], Optional[str]]:
     """Parse the Cloud Trace header.
 
     Cloud Run (and other GCP services) often forward `X-Cloud-Trace-Context`:
     "TRACE_ID/SPAN_ID;o=TRACE_TRUE".
+
+    `headers` must resolve lowercase names: a Starlette `Headers` object
+    (case-insensitive) or a dict with lowercased keys.
     """
 
     raw = headers.get("x-cloud-trace-context")
@@ -77,15 +162,26 @@ def current_trace_context() -> Tuple[Optional[str], Optional[str]]:
         return None, None
 
 
+@functools.lru_cache(maxsize=1)
+def _log_static_fields() -> Tuple[str, str, str]:
+    """Return (service, revision, trace_prefix) for request logs.
+
+    These come from the deployment environment and do not change while the
+    process runs, so they are read once instead of on every request.
+    """
+
+    service = os.getenv("K_SERVICE", "grounded-knowledge-platform")
+    revision = os.getenv("K_REVISION", "")
+    project = (os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT") or os.getenv("PROJECT_ID") or "").strip()
+    trace_prefix = f"projects/{project}/traces/" if project else ""
+    return service, revision, trace_prefix
+
+
 def _cloud_trace_resource(trace_id: Optional[str]) -> Optional[str]:
     """Return a trace resource name for Cloud Logging, if possible."""
 
-    if not trace_id:
-        return None
-    project = (os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT") or os.getenv("PROJECT_ID") or "").strip()
-    if not project:
-        return None
-    return f"projects/{project}/traces/{trace_id}"
+    trace_prefix = _log_static_fields()[2]
+    return f"{trace_prefix}{trace_id}" if trace_prefix and trace_id else None
 
 
 def request_id_from_headers(headers: Mapping[str, str]) -> str:
@@ -95,6 +191,8 @@ def request_id_from_headers(headers: Mapping[str, str]) -> str:
       1) X-Request-Id (reverse proxies)
       2) X-Correlation-Id (some enterprise setups)
       3) generated UUID4
+
+    Accepts the same header mappings as `parse_cloud_trace_context`.
     """
 
     rid = headers.get("x-request-id") or headers.get("x-correlation-id")
@@ -119,13 +217,12 @@ def log_http_request(
 ) -> None:
     """Emit a Cloud Logging-friendly structured request log."""
 
-    logger = logging.getLogger("gkp")
-
+    service, revision, _trace_prefix = _log_static_fields()
     payload: dict[str, Any] = {
         "severity": severity,
         "message": "http_request",
-        "service": os.getenv("K_SERVICE", "grounded-knowledge-platform"),
-        "revision": os.getenv("K_REVISION", ""),
+        "service": service,
+        "revision": revision,
         "request_id": request_id,
         "path": path,
         "limited": limited,
@@ -151,14 +248,20 @@ def log_http_request(
     if span_id:
         payload["logging.googleapis.com/spanId"] = span_id
 
-    logger.info(json.dumps(payload, ensure_ascii=False))
+    _LOGGER.info(dumps_bytes(payload))
 
 
 class Timer:
-    """Tiny helper for timing blocks."""
+    """Tiny helper for timing blocks.
+
+    Uses integer nanoseconds so elapsed time stays exact however long the
+    process has been up; it becomes a float only in `ms()`.
+    """
+
+    __slots__ = ("_t0",)
 
     def __init__(self) -> None:
-        self._t0 = time.perf_counter()
+        self._t0 = time.perf_counter_ns()
 
     def ms(self) -> float:
-        return (time.perf_counter() - self._t0) * 1000.0
+        return (time.perf_counter_ns() - self._t0) / 1_000_000
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -20,6 +23,10 @@ def extract_text_from_pdf(path: str | Path) -> PdfTextResult:
     Strategy:
       1) Try native text extraction per-page via PyMuPDF.
       2) If a page has very little text and OCR is enabled, OCR that page with Tesseract.
+         Pages without any embedded image are skipped unless `OCR_REQUIRE_IMAGE=0`
+         (a short title page has nothing more for OCR to find).
+         If `OCR_WORKERS` allows more than one worker, such pages are OCR'd in
+         parallel worker processes.
 
     Everything stays local and open source.
     """
@@ -32,41 +39,95 @@ def extract_text_from_pdf(path: str | Path) -> PdfTextResult:
 
     used_ocr = 0
     skipped_ocr = 0
-    empty_pages = 0
     warnings: list[str] = []
-    texts: list[str] = []
+    page_texts: list[str] = []
+    ocr_indexes: list[int] = []
 
     with fitz.open(str(path)) as doc:
         total_pages = int(getattr(doc, "page_count", 0) or 0)
-        for _, page in enumerate(doc):
+        for i, page in enumerate(doc):
             page_text = (page.get_text("text") or "").strip()
-
-            # If extracted text is very small, the page is likely scanned.
-            if settings.ocr_enabled and len(page_text) < settings.ocr_min_chars:
-                if used_ocr < settings.ocr_max_pages:
-                    ocr_text = _ocr_page(page)
-                    if ocr_text.strip():
-                        page_text = ocr_text.strip()
-                        used_ocr += 1
+            page_texts.append(page_text)
+
+            # If extracted text is very small and the page has an image, it is likely scanned.
+            if (
+                settings.ocr_enabled
+                and len(page_text) < settings.ocr_min_chars
+                and (not settings.ocr_require_image or page.get_images(full=False))
+            ):
+                if len(ocr_indexes) < settings.ocr_max_pages:
+                    ocr_indexes.append(i)
                 else:
                     skipped_ocr += 1
 
-            if page_text:
-                texts.append(page_text)
-            else:
-                empty_pages += 1
+        workers = _ocr_worker_count(len(ocr_indexes))
+        if workers <= 1:
+            ocr_texts = [_ocr_page(doc[i]) for i in ocr_indexes]
+
+    if workers > 1:
+        # Spawn (not fork): the caller may be a threaded server, and each worker
+        # reopens the PDF itself so nothing PyMuPDF-owned crosses processes.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            ocr_texts = list(
+                pool.map(
+                    _ocr_page_by_index,
+                    [str(path)] * len(ocr_indexes),
+                    ocr_indexes,
+                    [int(settings.ocr_dpi)] * len(ocr_indexes),
+                    [settings.ocr_lang] * len(ocr_indexes),
+                )
+            )
+
+    for i, ocr_text in zip(ocr_indexes, ocr_texts):
+        if ocr_text.strip():
+            page_texts[i] = ocr_text.strip()
+            used_ocr += 1
+
+    empty_pages = page_texts.count("")
 
     if skipped_ocr:
         warnings.append(f"ocr_skipped_pages={skipped_ocr}")
     if empty_pages:
         warnings.append(f"empty_pages={empty_pages}")
 
-    return PdfTextResult(text="\n\n".join(texts), pages=total_pages, ocr_pages=used_ocr, warnings=tuple(warnings))
+    return PdfTextResult(
+        text="\n\n".join(filter(None, page_texts)), pages=total_pages, ocr_pages=used_ocr, warnings=tuple(warnings)
+    )
+
+
+# Upper bound for `OCR_WORKERS=0`. Host CPU counts overstate what a container may use,
+# and every worker is a fresh interpreter holding PyMuPDF, Tesseract and a page image.
+_OCR_AUTO_MAX_WORKERS = 4
+
+
+def _ocr_worker_count(pages: int) -> int:
+    workers = settings.ocr_workers
+    if workers <= 0:
+        try:
+            usable = len(os.sched_getaffinity(0))
+        except AttributeError:  # pragma: no cover - not available on macOS/Windows
+            usable = os.cpu_count() or 1
+        workers = min(usable, _OCR_AUTO_MAX_WORKERS)
+    return max(1, min(workers, pages))
+
+
+def _ocr_page_by_index(pdf_path: str, index: int, dpi: int, lang: str) -> str:
+    """Process-pool entry point: OCR one page of the PDF at `pdf_path`."""
+    import fitz  # PyMuPDF
+
+    try:
+        with fitz.open(pdf_path) as doc:
+            return _ocr_page(doc[index], dpi=dpi, lang=lang)
+    except Exception as e:
+        # Some pytesseract errors cannot be unpickled in the parent, which would
+        # surface as an opaque BrokenProcessPool; re-raise as a plain RuntimeError.
+        raise RuntimeError(f"OCR failed on page {index + 1}: {type(e).__name__}: {e}") from None
 
 
-def _ocr_page(page) -> str:
+def _ocr_page(page, *, dpi: int | None = None, lang: str | None = None) -> str:
     """OCR a PyMuPDF page using Tesseract (via pytesseract)."""
     try:
+        import fitz  # PyMuPDF
         import pytesseract  # type: ignore[import-untyped]
         from PIL import Image
     except Exception as e:
@@ -74,9 +135,8 @@ def _ocr_page(page) -> str:
             "OCR requires `pytesseract` and `Pillow`. Install dependencies and ensure `tesseract-ocr` is available."
         ) from e
 
-    pix = page.get_pixmap(dpi=int(settings.ocr_dpi))
-    mode = "RGB" if pix.alpha == 0 else "RGBA"
-    img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
-    if mode == "RGBA":
-        img = img.convert("RGB")
-    return pytesseract.image_to_string(img, lang=settings.ocr_lang)
+    # Render straight to 3-channel RGB and wrap the pixmap's memory instead of copying
+    # it (`samples` / `frombytes`) and converting RGBA -> RGB (`convert`).
+    pix = page.get_pixmap(dpi=int(settings.ocr_dpi if dpi is None else dpi), colorspace=fitz.csRGB, alpha=False)
+    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+    return pytesseract.image_to_string(img, lang=settings.ocr_lang if lang is None else lang)
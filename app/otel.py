@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
-from contextlib import contextmanager
-from typing import Any, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
 
 from .config import settings
 
@@ -17,6 +19,8 @@ _HTTP_LATENCY_MS: Any = None
 _RETRIEVAL_LATENCY_MS: Any = None
 _GENERATION_LATENCY_MS: Any = None
 _SAFETY_LATENCY_MS: Any = None
+# Stateless, so one instance can be shared by every disabled `span()` call.
+_NOOP_SPAN: AbstractContextManager[Any] = nullcontext()
 
 
 def otel_enabled() -> bool:
@@ -145,27 +149,29 @@ def setup_otel(app: Any) -> bool:
     return True
 
 
-@contextmanager
-def span(name: str, attributes: dict[str, Any] | None = None) -> Iterator[Any]:
-    """Start a tracing span when OTEL is active; otherwise no-op."""
+def span(name: str, attributes: dict[str, Any] | None = None) -> AbstractContextManager[Any]:
+    """Start a tracing span when OTEL is active; otherwise no-op.
+
+    The disabled path returns a shared no-op context manager, so it costs no
+    generator or context-manager allocation per call.
+    """
 
     if not _OTEL_READY or _TRACER is None:
-        yield None
-        return
+        return _NOOP_SPAN
+    return _active_span(name, attributes)
+
 
+@contextmanager
+def _active_span(name: str, attributes: dict[str, Any] | None) -> Iterator[Any]:
     with _TRACER.start_as_current_span(name) as s:
         if attributes:
-            for k, v in attributes.items():
-                if v is None:
-                    continue
-                # Guard against non-serializable values.
-                if isinstance(v, (str, bool, int, float)):
-                    s.set_attribute(k, v)
-                else:
-                    s.set_attribute(k, str(v))
+            s.set_attributes(_attrs(attributes))
         yield s
 
 
+_SCALAR_TYPES = frozenset({str, bool, int, float})
+
+
 def _attrs(attrs: dict[str, Any] | None) -> dict[str, Any]:
     out: dict[str, Any] = {}
     if not attrs:
@@ -173,14 +179,27 @@ def _attrs(attrs: dict[str, Any] | None) -> dict[str, Any]:
     for k, v in attrs.items():
         if v is None:
             continue
-        out[str(k)] = v if isinstance(v, (str, bool, int, float)) else str(v)
+        # Exact-type set lookup first; isinstance only for subclasses (e.g. enums).
+        # Anything else is stringified to guard against non-serializable values.
+        if type(v) in _SCALAR_TYPES or isinstance(v, (str, bool, int, float)):
+            out[str(k)] = v
+        else:
+            out[str(k)] = str(v)
     return out
 
 
-def record_http_request_metric(*, method: str, path: str, status_code: int, latency_ms: float) -> None:
+@functools.lru_cache(maxsize=1024)
+def _http_attrs(method: str, route: str, status_code: int) -> Mapping[str, Any]:
+    # Callers pass route templates, so (method, route, status) repeats across requests;
+    # reuse one read-only mapping per combination.
+    return MappingProxyType({"http.method": method, "http.route": route, "http.status_code": status_code})
+
+
+def record_http_request_metric(*, method: str, route: str, status_code: int, latency_ms: float) -> None:
+    """Record one HTTP request; `route` is the matched route template, not the raw URL path."""
     if not _OTEL_READY:
         return
-    attrs = _attrs({"http.method": method, "http.route": path, "http.status_code": int(status_code)})
+    attrs = _http_attrs(str(method), str(route), int(status_code))
     if _HTTP_COUNTER is not None:
         _HTTP_COUNTER.add(1, attributes=attrs)
     if _HTTP_LATENCY_MS is not None:
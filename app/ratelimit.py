@@ -1,30 +1,78 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 import time
-from collections import defaultdict, deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+
+def client_key(remote_ip: str) -> int:
+    """Hash a client address into a 64-bit limiter key.
+
+    Buckets are keyed by the digest so the limiter never retains raw IPs.
+    """
+
+    return int.from_bytes(hashlib.blake2b(remote_ip.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@dataclass
+class BucketState:
+    prev_count: int
+    curr_count: int
+    curr_window_start: float
 
 
 @dataclass
 class SlidingWindowRateLimiter:
     """Small in-process rate limiter.
 
+    Uses the sliding-window-counter approximation: each key keeps only the
+    request counts for the current and previous fixed windows, and the
+    previous count is weighted by how much of it still overlaps the sliding
+    window. That keeps `allow()` O(1) in time and memory per key.
+
     Note: this is per-instance. In Cloud Run (or any scaled deployment), each
     instance enforces its own window.
     """
 
     window_s: int = 60
     max_requests: int = 30
+    _buckets: dict[int, BucketState] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _last_sweep: float = field(default=0.0, init=False, repr=False)
+
+    def allow(self, key: int) -> bool:
+        window = float(self.window_s)
+        if window <= 0:
+            return True
+        now = time.monotonic()
+        window_start = (now // window) * window
+
+        with self._lock:
+            if now - self._last_sweep >= window:
+                self._evict_stale(window_start, window)
+                self._last_sweep = now
+
+            state = self._buckets.get(key)
+            if state is None:
+                state = BucketState(prev_count=0, curr_count=0, curr_window_start=window_start)
+                self._buckets[key] = state
+            elif state.curr_window_start != window_start:
+                # Roll forward. If more than one window passed, the old counts no longer overlap.
+                adjacent = window_start - state.curr_window_start == window
+                state.prev_count = state.curr_count if adjacent else 0
+                state.curr_count = 0
+                state.curr_window_start = window_start
+
+            weight = 1.0 - (now - window_start) / window
+            if state.prev_count * weight + state.curr_count >= self.max_requests:
+                return False
+            state.curr_count += 1
+            return True
 
-    def __post_init__(self) -> None:
-        self._hits: dict[str, deque[float]] = defaultdict(deque)
-
-    def allow(self, key: str) -> bool:
-        now = time.time()
-        q = self._hits[key]
-        while q and now - q[0] > self.window_s:
-            q.popleft()
-        if len(q) >= self.max_requests:
-            return False
-        q.append(now)
-        return True
+    def _evict_stale(self, window_start: float, window: float) -> None:
+        # Keys idle for two full windows carry no weight; drop them to bound memory.
+        cutoff = window_start - window
+        stale = [k for k, s in self._buckets.items() if s.curr_window_start < cutoff]
+        for k in stale:
+            del self._buckets[k]
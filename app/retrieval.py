@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import functools
 import logging
 import re
 import sqlite3
 import time
 from dataclasses import dataclass
+from importlib import import_module
 from threading import Lock
 from typing import Any, Optional
 
@@ -14,20 +16,43 @@ from .config import settings
 from .embeddings import Embedder, HashEmbedder, NoEmbedder, SentenceTransformerEmbedder, cosine_sim
 from .index_maintenance import ensure_index_compatible
 from .maintenance import retention_is_expired
-from .storage import Chunk, connect, get_chunks_by_ids, get_embeddings_by_ids, init_db, list_chunks
+from .storage import Chunk, connect_pooled, get_chunks_by_ids, get_embeddings_by_ids, init_db, list_chunks
 from .tenant import current_tenant_id
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
 
 
-def _vec_to_pgvector_literal(vec: np.ndarray) -> str:
-    """Convert a 1D numpy vector to pgvector text format: "[1,2,3]"."""
+def _vec_to_pgvector_binary(vec: np.ndarray) -> bytes:
+    """Encode a normalized vector in pgvector's binary wire format (what `vector_recv` reads).
+
+    Layout: int16 dim, int16 unused (0), then dim big-endian float4 values.
+    """
     v = vec.astype(np.float32).reshape(-1)
     n = float(np.linalg.norm(v))
     if n > 0:
         v = v / n
-    vals = v.tolist()
-    return "[" + ",".join(str(float(x)) for x in vals) + "]"
+    return int(v.size).to_bytes(2, "big") + b"\x00\x00" + v.astype(">f4").tobytes()
+
+
+@dataclass(frozen=True)
+class _PgVectorParam:
+    """Query parameter sent to Postgres as binary pgvector data (placeholder `%b::vector`)."""
+
+    data: bytes
+
+
+@functools.cache
+def _pgvector_binary_dumper() -> type:
+    # psycopg is an optional extra, so the dumper class is built on first Postgres use.
+    adapt = import_module("psycopg.adapt")
+    pq = import_module("psycopg.pq")
+
+    def dump(self: Any, obj: _PgVectorParam) -> bytes:
+        return obj.data
+
+    # The default oid 0 leaves the parameter type to the server, which takes it from
+    # the `::vector` cast and decodes the bytes with pgvector's binary receive function.
+    return type("_PgVectorBinaryDumper", (adapt.Dumper,), {"format": pq.Format.BINARY, "dump": dump})
 
 
 logger = logging.getLogger(__name__)
@@ -48,6 +73,11 @@ class RetrievedChunk:
     lexical_score: float
     vector_score: float
 
+    @functools.cached_property
+    def text_preview(self) -> str:
+        """Leading 240 chars shown by debug/explain payloads; kept with cached retrieval results."""
+        return self.text[:240]
+
 
 def effective_hybrid_weights(*, use_vector: bool) -> tuple[float, float]:
     """Return normalized lexical/vector weights for hybrid retrieval."""
@@ -178,10 +208,19 @@ def invalidate_cache() -> None:
         _CACHE_VERSION += 1
 
 
-def _load_corpus(conn: sqlite3.Connection) -> tuple[list[Chunk], np.ndarray, list[list[str]]]:
-    """Returns (chunks, embeddings_matrix, tokenized_chunks).
+def cache_version() -> int:
+    """Monotonic counter bumped by `invalidate_cache()` (i.e. on every index write)."""
+    return _CACHE_VERSION
+
+
+def _load_corpus(
+    conn: sqlite3.Connection,
+) -> tuple[list[Chunk], np.ndarray, list[list[str]], dict[str, Any]]:
+    """Returns (chunks, embeddings_matrix, tokenized_chunks, lexical_index).
 
-    embeddings_matrix has shape (n, dim) float32.
+    embeddings_matrix has shape (n, dim) float32. lexical_index starts empty and
+    holds the BM25 index once `_bm25_index` builds it, so the index lives and is
+    evicted with this cache entry.
     """
 
     key = "::".join(
@@ -214,22 +253,25 @@ def _load_corpus(conn: sqlite3.Connection) -> tuple[list[Chunk], np.ndarray, lis
             mat = np.zeros((len(chunk_ids), expected_dim), dtype=np.float32)
         else:
             dim = int(emb_rows[0][1]) if emb_rows else expected_dim
-            mats = []
-            for _, _, blob in emb_rows:
-                v = np.frombuffer(blob, dtype=np.float32)
-                if v.size != dim:
-                    v2 = np.zeros((dim,), dtype=np.float32)
-                    v2[: min(dim, v.size)] = v[: min(dim, v.size)]
-                    v = v2
-                mats.append(v)
-            mat = np.stack(mats, axis=0).astype(np.float32) if mats else np.zeros((0, dim), dtype=np.float32)
+            blobs = [blob for _, _, blob in emb_rows]
+            row_bytes = dim * 4
+            if all(len(blob) == row_bytes for blob in blobs):
+                # Common case: one contiguous copy, viewed (read-only) as the (n, dim) matrix.
+                mat = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), dim)
+            else:
+                # Slow path: zero-pad or truncate rows whose stored dim does not match.
+                mat = np.zeros((len(blobs), dim), dtype=np.float32)
+                for i, blob in enumerate(blobs):
+                    v = np.frombuffer(blob, dtype=np.float32)
+                    mat[i, : min(dim, v.size)] = v[: min(dim, v.size)]
 
     tokenized = [_tokenize(c.text) for c in chunks]
+    lexical_index: dict[str, Any] = {}
 
     with _CACHE_LOCK:
-        _CACHE[key] = (chunks, mat, tokenized)
+        _CACHE[key] = (chunks, mat, tokenized, lexical_index)
 
-    return chunks, mat, tokenized
+    return chunks, mat, tokenized, lexical_index
 
 
 def _lexical_scores_fts(conn: sqlite3.Connection, query: str, limit: int) -> Optional[dict[str, float]]:
@@ -321,13 +363,15 @@ def _pg_vector_scores(conn: Any, query: str, embedder: Embedder, limit: int) ->
 
     limit = max(1, min(int(limit), 2000))
     q_vec = embedder.embed([query]).reshape(-1).astype(np.float32)
-    q_lit = _vec_to_pgvector_literal(q_vec)
+    # Binary parameter: raw float4s instead of a text literal both sides must format/parse.
+    conn.adapters.register_dumper(_PgVectorParam, _pgvector_binary_dumper())
+    q_param = _PgVectorParam(_vec_to_pgvector_binary(q_vec))
     tenant_id = current_tenant_id()
 
     with conn.cursor() as cur:
         cur.execute(
             """
-            WITH q AS (SELECT %s::vector AS v)
+            WITH q AS (SELECT %b::vector AS v)
             SELECT e.chunk_id, (1 - (e.vec <=> q.v)) AS score
             FROM embeddings e
             JOIN chunks c ON c.chunk_id = e.chunk_id,
@@ -336,7 +380,7 @@ def _pg_vector_scores(conn: Any, query: str, embedder: Embedder, limit: int) ->
             ORDER BY e.vec <=> q.v
             LIMIT %s
             """,
-            (q_lit, tenant_id, limit),
+            (q_param, tenant_id, limit),
         )
         rows = cur.fetchall()
 
@@ -444,7 +488,30 @@ def _retrieve_postgres(
     )
     return scored[: max(1, min(int(top_k), 50))]
 
-def _lexical_scores_bm25(tokenized_chunks: list[list[str]], query: str) -> dict[int, float]:
+
+def _bm25_index(tokenized_chunks: list[list[str]], bm25_cls: Any, lexical_index: dict[str, Any] | None) -> Any:
+    """Return the BM25 index for a tokenized corpus, reusing the one stored in `lexical_index`.
+
+    `lexical_index` is the slot from the corpus's `_CACHE` entry, so
+    `invalidate_cache()` drops the index together with the corpus it was built from.
+    """
+
+    if lexical_index is None:
+        return bm25_cls(tokenized_chunks)
+    with _CACHE_LOCK:
+        bm25 = lexical_index.get("bm25")
+    if bm25 is None:
+        bm25 = bm25_cls(tokenized_chunks)
+        with _CACHE_LOCK:
+            lexical_index["bm25"] = bm25
+    return bm25
+
+
+def _lexical_scores_bm25(
+    tokenized_chunks: list[list[str]],
+    query: str,
+    lexical_index: dict[str, Any] | None = None,
+) -> dict[int, float]:
     """Fallback lexical scorer: BM25 via rank_bm25 over all chunks.
 
     Returns dict chunk_index -> lexical_score in [0,1].
@@ -467,10 +534,10 @@ def _lexical_scores_bm25(tokenized_chunks: list[list[str]], query: str) -> dict[
         m = max(scores.values())
         return {i: (s / m if m > 0 else s) for i, s in scores.items()}
 
-    bm25 = BM25Okapi(tokenized_chunks)
     q_toks = _tokenize(query)
     if not q_toks:
         return {}
+    bm25 = _bm25_index(tokenized_chunks, BM25Okapi, lexical_index)
     raw = np.array(bm25.get_scores(q_toks), dtype=np.float32)
     if raw.size == 0:
         return {}
@@ -505,7 +572,9 @@ def retrieve(
     lexical_weight, vector_weight = effective_hybrid_weights(use_vector=use_vector)
     embedder = _get_embedder()
 
-    with connect(settings.sqlite_path) as conn:
+    # Every query lands here; reuse the worker thread's connection so SQLite's page cache
+    # and prepared statements stay warm instead of reopening the file per request.
+    with connect_pooled(settings.sqlite_path) as conn:
         init_db(conn)
         now_i = int(time.time())
 
@@ -530,7 +599,7 @@ def retrieve(
         conn.commit()
         if rebuilt:
             invalidate_cache()
-        chunks, emb_mat, tokenized = _load_corpus(conn)
+        chunks, emb_mat, tokenized, lexical_index = _load_corpus(conn)
 
         if not chunks:
             return []
@@ -555,7 +624,9 @@ def retrieve(
             }
         else:
             lex_scores = {
-                i: s for i, s in _lexical_scores_bm25(tokenized, question).items() if i in active_chunk_index_set
+                i: s
+                for i, s in _lexical_scores_bm25(tokenized, question, lexical_index).items()
+                if i in active_chunk_index_set
             }
         lexical_ms = (time.perf_counter() - lexical_start) * 1000.0
 
@@ -571,9 +642,10 @@ def retrieve(
             if sims.size == 0:
                 sims = np.zeros((len(chunks),), dtype=np.float32)
 
-            sims = sims - float(sims.min())
-            if float(sims.max()) > 0:
-                sims = sims / float(sims.max())
+            sims = sims - sims.min()
+            sims_max = float(sims.max())
+            if sims_max > 0:
+                sims *= 1.0 / sims_max
             vector_ms = (time.perf_counter() - vector_start) * 1000.0
         else:
             sims = np.zeros((len(chunks),), dtype=np.float32)
@@ -586,7 +658,12 @@ def retrieve(
             cand_idx.update(i for i, _ in top_lex)
 
         if use_vector:
-            top_vec_idx = np.argsort(-sims)[:vector_limit].tolist()
+            # Only membership in the top `vector_limit` matters here (results are re-sorted
+            # below), so an O(n) partition replaces the O(n log n) full argsort.
+            if sims.size > vector_limit:
+                top_vec_idx = np.argpartition(sims, -vector_limit)[-vector_limit:].tolist()
+            else:
+                top_vec_idx = list(range(int(sims.size)))
             cand_idx.update(int(i) for i in top_vec_idx if int(i) in active_chunk_index_set)
 
         results: list[RetrievedChunk] = []
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 from dataclasses import dataclass
 from typing import List, Tuple
@@ -82,9 +83,12 @@ def detect_prompt_injection(text: str) -> InjectionCheck:
     if not t:
         return InjectionCheck(False, [])
 
-    reasons: List[str] = []
-    for name, pat in _INJECTION_PATTERNS:
-        if pat.search(t):
-            reasons.append(name)
+    reasons = _matched_patterns(t)
+    return InjectionCheck(len(reasons) > 0, list(reasons))
 
-    return InjectionCheck(len(reasons) > 0, sorted(set(reasons)))
+
+@functools.lru_cache(maxsize=4096)
+def _matched_patterns(text: str) -> Tuple[str, ...]:
+    # Repeated questions (retries, eval loops, polling clients) skip the regex scan.
+    # The patterns are static, so entries never go stale.
+    return tuple(sorted({name for name, pat in _INJECTION_PATTERNS if pat.search(text)}))
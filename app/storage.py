@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
+import threading
 import time
+import weakref
 from contextlib import contextmanager
 from dataclasses import dataclass
 from importlib import import_module
@@ -11,6 +12,7 @@ from pathlib import Path
 from typing import Any, Iterable, Iterator
 
 from .config import settings
+from .jsonutil import loads as json_loads
 from .migrations_runner import apply_postgres_migrations
 from .tenant import current_tenant_id, default_tenant_id, scope_doc_id
 
@@ -34,7 +36,7 @@ class Doc:
     @property
     def tags(self) -> list[str]:
         try:
-            v = json.loads(self.tags_json or "[]")
+            v = json_loads(self.tags_json or "[]")
             if isinstance(v, list):
                 return [str(x) for x in v if str(x).strip()]
         except Exception:
@@ -58,6 +60,16 @@ class Doc:
         }
 
 
+@dataclass(frozen=True)
+class DocRef:
+    """The doc fields shown next to citations and explain evidence."""
+
+    doc_id: str
+    title: str
+    source: str
+    doc_version: int
+
+
 @dataclass(frozen=True)
 class Chunk:
     chunk_id: str
@@ -102,7 +114,7 @@ class IngestEvent:
     @property
     def validation_errors(self) -> list[str]:
         try:
-            raw = json.loads(self.validation_errors_json or "[]")
+            raw = json_loads(self.validation_errors_json or "[]")
             if isinstance(raw, list):
                 return [str(x) for x in raw]
         except Exception:
@@ -171,7 +183,7 @@ class IngestEventView:
     @property
     def tags(self) -> list[str]:
         try:
-            v = json.loads(self.tags_json or "[]")
+            v = json_loads(self.tags_json or "[]")
             if isinstance(v, list):
                 return [str(x) for x in v if str(x).strip()]
         except Exception:
@@ -189,7 +201,7 @@ class IngestEventView:
     @property
     def validation_errors(self) -> list[str]:
         try:
-            raw = json.loads(self.validation_errors_json or "[]")
+            raw = json_loads(self.validation_errors_json or "[]")
             if isinstance(raw, list):
                 return [str(x) for x in raw]
         except Exception:
@@ -246,7 +258,7 @@ class IngestionRun:
     @property
     def trigger_payload(self) -> dict[str, object]:
         try:
-            raw = json.loads(self.trigger_payload_json or "{}")
+            raw = json_loads(self.trigger_payload_json or "{}")
         except Exception:
             raw = {}
         return raw if isinstance(raw, dict) else {}
@@ -254,7 +266,7 @@ class IngestionRun:
     @property
     def errors(self) -> list[str]:
         try:
-            raw = json.loads(self.errors_json or "[]")
+            raw = json_loads(self.errors_json or "[]")
             if isinstance(raw, list):
                 return [str(x) for x in raw if str(x).strip()]
         except Exception:
@@ -294,7 +306,7 @@ class AuditEvent:
     @property
     def metadata(self) -> dict[str, object]:
         try:
-            raw = json.loads(self.metadata_json or "{}")
+            raw = json_loads(self.metadata_json or "{}")
             if isinstance(raw, dict):
                 return {str(k): v for k, v in raw.items()}
         except Exception:
@@ -342,7 +354,7 @@ class EvalRun:
     @property
     def retrieval_config(self) -> dict[str, object]:
         try:
-            raw = json.loads(self.retrieval_config_json or "{}")
+            raw = json_loads(self.retrieval_config_json or "{}")
             if isinstance(raw, dict):
                 return {str(k): v for k, v in raw.items()}
         except Exception:
@@ -352,7 +364,7 @@ class EvalRun:
     @property
     def provider_config(self) -> dict[str, object]:
         try:
-            raw = json.loads(self.provider_config_json or "{}")
+            raw = json_loads(self.provider_config_json or "{}")
             if isinstance(raw, dict):
                 return {str(k): v for k, v in raw.items()}
         except Exception:
@@ -362,7 +374,7 @@ class EvalRun:
     @property
     def summary(self) -> dict[str, object]:
         try:
-            raw = json.loads(self.summary_json or "{}")
+            raw = json_loads(self.summary_json or "{}")
             if isinstance(raw, dict):
                 return {str(k): v for k, v in raw.items()}
         except Exception:
@@ -372,7 +384,7 @@ class EvalRun:
     @property
     def diff_from_prev(self) -> dict[str, object]:
         try:
-            raw = json.loads(self.diff_from_prev_json or "{}")
+            raw = json_loads(self.diff_from_prev_json or "{}")
             if isinstance(raw, dict):
                 return {str(k): v for k, v in raw.items()}
         except Exception:
@@ -382,7 +394,7 @@ class EvalRun:
     @property
     def details(self) -> list[dict[str, object]]:
         try:
-            raw = json.loads(self.details_json or "[]")
+            raw = json_loads(self.details_json or "[]")
             if isinstance(raw, list):
                 out: list[dict[str, object]] = []
                 for item in raw:
@@ -438,6 +450,17 @@ def _tenant_id() -> str:
 
 _PG_SCHEMA_INITIALIZED: set[str] = set()
 
+# SQLite database file -> schema_version observed right after init_db ran on it.
+_SQLITE_SCHEMA_INITIALIZED: dict[str, int] = {}
+
+
+def _sqlite_schema_key(conn: sqlite3.Connection) -> tuple[str, int]:
+    row = conn.execute(
+        "SELECT (SELECT file FROM pragma_database_list WHERE name = 'main'),"
+        " (SELECT schema_version FROM pragma_schema_version)"
+    ).fetchone()
+    return str(row[0] or ""), int(row[1] or 0)
+
 
 @contextmanager
 def connect(sqlite_path: str) -> Iterator[Any]:
@@ -467,6 +490,100 @@ def connect(sqlite_path: str) -> Iterator[Any]:
         conn.close()
 
 
+# Pooled connections live as long as their thread, and requests run on several
+# thread pools (AnyIO, the asyncio executor, background refreshes), so both the
+# number of pooled connections and each one's page cache are capped. Past the
+# cap, callers get a plain per-call connection.
+_POOL_MAX_CONNECTIONS = 16
+_POOL_CACHE_SIZE_KIB = 4000
+_pool_slots = threading.BoundedSemaphore(_POOL_MAX_CONNECTIONS)
+_pooled = threading.local()
+
+
+class _ThreadConns:
+    """One thread's pooled connections; their pool slots are released when the thread exits."""
+
+    __slots__ = ("conns", "slots", "__weakref__")
+
+    def __init__(self) -> None:
+        self.conns: dict[str, sqlite3.Connection] = {}
+        self.slots: dict[str, weakref.finalize] = {}
+
+
+@contextmanager
+def connect_pooled(sqlite_path: str) -> Iterator[Any]:
+    """Like `connect()`, but reuses one SQLite connection per thread and path.
+
+    Meant for read-mostly paths served from the threadpool (read endpoints, probes,
+    query retrieval), where opening a connection dominates the query itself. Any
+    uncommitted transaction is rolled back on exit so the next user starts
+    clean; a connection that raised a SQLite error is closed and dropped.
+    At most `_POOL_MAX_CONNECTIONS` connections are pooled process-wide; other
+    threads and Postgres deployments fall through to `connect()`.
+    """
+
+    if settings.database_url:
+        with connect(sqlite_path) as pg_conn:
+            yield pg_conn
+        return
+
+    pool: _ThreadConns | None = getattr(_pooled, "pool", None)
+    if pool is None:
+        pool = _ThreadConns()
+        _pooled.pool = pool
+
+    conn = pool.conns.get(sqlite_path)
+    if conn is None:
+        slots = _pool_slots
+        if not slots.acquire(blocking=False):
+            with connect(sqlite_path) as unpooled:
+                yield unpooled
+            return
+        _ensure_parent_dir(sqlite_path)
+        try:
+            # Long-lived connections keep prepared statements for constant query text (e.g. chunk search).
+            conn = sqlite3.connect(sqlite_path, cached_statements=128)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            # Connection-local tuning; these do not change the database file.
+            conn.execute(f"PRAGMA cache_size = -{_POOL_CACHE_SIZE_KIB}")
+            conn.execute("PRAGMA temp_store = MEMORY")
+        except BaseException:
+            slots.release()
+            raise
+        pool.conns[sqlite_path] = conn
+        pool.slots[sqlite_path] = weakref.finalize(pool, slots.release)
+
+    try:
+        yield conn
+    except sqlite3.Error:
+        pool.conns.pop(sqlite_path, None)
+        slot = pool.slots.pop(sqlite_path, None)
+        if slot is not None:
+            slot()
+        conn.close()
+        raise
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    if conn.in_transaction:
+        conn.rollback()
+
+
+def begin_immediate(conn: Any) -> None:
+    """Open a write transaction, taking SQLite's write lock up front.
+
+    A deferred transaction only upgrades to a write lock at its first write, where a
+    concurrent writer makes it fail with "database is locked" instead of waiting.
+    Postgres transactions begin implicitly, so this is a no-op there.
+    """
+
+    if _is_postgres_conn(conn) or conn.in_transaction:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+
+
 def _existing_columns(conn: sqlite3.Connection, table: str) -> set[str]:
     try:
         cur = conn.execute(f"PRAGMA table_info({table})")
@@ -499,9 +616,22 @@ def init_db(conn: Any) -> None:
         return
 
     # SQLite path:
+    # Every request handler calls init_db, so skip the DDL batch once this process has
+    # initialized the file. schema_version changes whenever the schema does (including a
+    # file recreated at the same path), which sends that connection through init again.
+    db_file, schema_version = _sqlite_schema_key(conn)
+    if db_file and _SQLITE_SCHEMA_INITIALIZED.get(db_file) == schema_version:
+        return
+
     # This project is intentionally simple (SQLite + single-process cache). To keep upgrades safe,
     # `init_db` includes basic forward-only migrations for additive schema changes.
 
+    # WAL lets the read endpoints' pooled connections keep reading while a write commits,
+    # instead of queueing threadpool workers behind the writer. The mode is persistent in
+    # the database file and cannot be switched inside a transaction.
+    if not conn.in_transaction:
+        conn.execute("PRAGMA journal_mode = WAL")
+
     # --- Base tables (latest schema) ---
     conn.execute(
         """
@@ -639,6 +769,33 @@ def init_db(conn: Any) -> None:
         );
         """
     )
+    # Normalized copy of docs.tags_json (one row per doc/tag) so tag aggregates
+    # are an index scan instead of parsing JSON for every doc. Maintained by
+    # upsert_doc / update_doc_metadata.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS doc_tags (
+            doc_id TEXT NOT NULL,
+            tenant_id TEXT NOT NULL DEFAULT 'default',
+            tag TEXT NOT NULL,
+            PRIMARY KEY (doc_id, tag),
+            FOREIGN KEY(doc_id) REFERENCES docs(doc_id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    # Pre-aggregated doc counts per (tenant, dimension, value) for /api/stats.
+    # Kept current by triggers on docs/doc_tags (created below, once all columns exist).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS stats_agg (
+            tenant_id TEXT NOT NULL,
+            dim TEXT NOT NULL,
+            value TEXT NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tenant_id, dim, value)
+        ) WITHOUT ROWID;
+        """
+    )
 
     # --- Forward migrations for older DBs ---
     def _cols(table: str) -> set[str]:
@@ -730,6 +887,8 @@ def init_db(conn: Any) -> None:
 
     # --- Indexes ---
     conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_tenant ON docs(tenant_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_tenant_classification ON docs(tenant_id, classification)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_tenant_retention ON docs(tenant_id, retention)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_tenant_doc ON chunks(tenant_id, doc_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(doc_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc_idx ON chunks(doc_id, idx)")
@@ -740,6 +899,10 @@ def init_db(conn: Any) -> None:
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_tenant_doc_ver ON ingest_events(tenant_id, doc_id, doc_version)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ingested_at ON ingest_events(ingested_at)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_tenant_ingested_at ON ingest_events(tenant_id, ingested_at)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_tenant_doc_ingested_at ON ingest_events(tenant_id, doc_id, ingested_at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_doc_tags_tenant_tag ON doc_tags(tenant_id, tag)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_validation_status ON ingest_events(validation_status)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_events_run_id ON ingest_events(run_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_ingestion_runs_tenant_started_at ON ingestion_runs(tenant_id, started_at)")
@@ -850,7 +1013,169 @@ def init_db(conn: Any) -> None:
         # FTS5 not available; lexical retrieval will fall back to rank_bm25
         pass
 
+    for stmt in _SQLITE_STATS_AGG_TRIGGERS:
+        conn.execute(stmt)
+
+    # Populate doc_tags once for DBs created before the table existed.
+    if get_meta(conn, "doc_tags.backfilled") is None:
+        for row in conn.execute("SELECT doc_id, tenant_id, tags_json FROM docs").fetchall():
+            _replace_doc_tags(conn, str(row["doc_id"]), str(row["tenant_id"]), row["tags_json"])
+        set_meta(conn, "doc_tags.backfilled", "1")
+
+    # Likewise rebuild stats_agg once; from then on the triggers maintain it.
+    if get_meta(conn, "stats_agg.backfilled") is None:
+        conn.execute("DELETE FROM stats_agg")
+        conn.execute(
+            """
+            INSERT INTO stats_agg (tenant_id, dim, value, n)
+            SELECT tenant_id, 'classification', classification, COUNT(1) FROM docs GROUP BY tenant_id, classification
+            UNION ALL
+            SELECT tenant_id, 'retention', retention, COUNT(1) FROM docs GROUP BY tenant_id, retention
+            UNION ALL
+            SELECT tenant_id, 'tag', tag, COUNT(1) FROM doc_tags GROUP BY tenant_id, tag
+            """
+        )
+        set_meta(conn, "stats_agg.backfilled", "1")
+
     conn.commit()
+    if db_file:
+        _SQLITE_SCHEMA_INITIALIZED[db_file] = _sqlite_schema_key(conn)[1]
+
+
+def _stats_agg_sql(op: str, tenant: str, dim: str, value: str) -> str:
+    if op == "+":
+        return (
+            f"INSERT INTO stats_agg (tenant_id, dim, value, n) VALUES ({tenant}, '{dim}', {value}, 1) "
+            "ON CONFLICT(tenant_id, dim, value) DO UPDATE SET n = n + 1;"
+        )
+    return (
+        f"UPDATE stats_agg SET n = n - 1 WHERE tenant_id = {tenant} AND dim = '{dim}' AND value = {value};"
+        f"DELETE FROM stats_agg WHERE tenant_id = {tenant} AND dim = '{dim}' AND value = {value} AND n <= 0;"
+    )
+
+
+_SQLITE_STATS_AGG_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS docs_stats_ai AFTER INSERT ON docs BEGIN
+        {_stats_agg_sql("+", "new.tenant_id", "classification", "new.classification")}
+        {_stats_agg_sql("+", "new.tenant_id", "retention", "new.retention")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS docs_stats_ad AFTER DELETE ON docs BEGIN
+        {_stats_agg_sql("-", "old.tenant_id", "classification", "old.classification")}
+        {_stats_agg_sql("-", "old.tenant_id", "retention", "old.retention")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS docs_stats_au AFTER UPDATE OF tenant_id, classification, retention ON docs
+    WHEN old.tenant_id IS NOT new.tenant_id
+      OR old.classification IS NOT new.classification
+      OR old.retention IS NOT new.retention
+    BEGIN
+        {_stats_agg_sql("-", "old.tenant_id", "classification", "old.classification")}
+        {_stats_agg_sql("-", "old.tenant_id", "retention", "old.retention")}
+        {_stats_agg_sql("+", "new.tenant_id", "classification", "new.classification")}
+        {_stats_agg_sql("+", "new.tenant_id", "retention", "new.retention")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS doc_tags_stats_ai AFTER INSERT ON doc_tags BEGIN
+        {_stats_agg_sql("+", "new.tenant_id", "tag", "new.tag")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS doc_tags_stats_ad AFTER DELETE ON doc_tags BEGIN
+        {_stats_agg_sql("-", "old.tenant_id", "tag", "old.tag")}
+    END;
+    """,
+)
+
+
+# Postgres groups on read instead: trigger-maintained counters would make every
+# docs/doc_tags write upsert shared per-tenant rows, serializing concurrent ingests.
+_PG_STATS_BREAKDOWN_SQL = """
+SELECT 'classification' AS dim, classification AS value, COUNT(*) AS n
+FROM docs WHERE tenant_id=%s GROUP BY classification
+UNION ALL
+SELECT 'retention' AS dim, retention AS value, COUNT(*) AS n
+FROM docs WHERE tenant_id=%s GROUP BY retention
+"""
+
+
+def get_stats_agg(conn: Any, *, tenant_id: str | None = None) -> dict[str, dict[str, int]]:
+    """Doc counts for the tenant as {"classification": {...}, "retention": {...}}.
+
+    SQLite reads the trigger-maintained `stats_agg` table; Postgres runs GROUP BYs.
+    """
+    tid = tenant_id or _tenant_id()
+    out: dict[str, dict[str, int]] = {"classification": {}, "retention": {}}
+    if _is_postgres_conn(conn):
+        cur = conn.execute(_PG_STATS_BREAKDOWN_SQL, (tid, tid))
+    else:
+        cur = conn.execute(
+            """
+            SELECT dim, value, n FROM stats_agg
+            WHERE tenant_id=? AND dim IN ('classification', 'retention') AND n > 0
+            """,
+            (tid,),
+        )
+    for r in cur.fetchall():
+        out[str(r["dim"])][str(r["value"])] = int(r["n"])
+    return out
+
+
+def _doc_tag_keys(tags_json: str | None) -> list[str]:
+    """Distinct tag keys from a tags_json array: stripped and lowercased, blanks dropped."""
+    try:
+        tags = json_loads(tags_json or "[]")
+    except Exception:
+        return []
+    if not isinstance(tags, list):
+        return []
+    keys = (str(t).strip().lower() for t in tags if not isinstance(t, (dict, list)) and t is not None)
+    return list(dict.fromkeys(k for k in keys if k))
+
+
+def _replace_doc_tags(conn: Any, doc_id: str, tenant_id: str, tags_json: str | None) -> None:
+    ph = _ph(conn)
+    conn.execute(f"DELETE FROM doc_tags WHERE doc_id={ph}", (doc_id,))
+    rows = [(doc_id, tenant_id, tag) for tag in _doc_tag_keys(tags_json)]
+    if not rows:
+        return
+    sql = f"INSERT INTO doc_tags (doc_id, tenant_id, tag) VALUES ({ph}, {ph}, {ph})"
+    if _is_postgres_conn(conn):
+        with conn.cursor() as cur:
+            cur.executemany(sql, rows)
+        return
+    conn.executemany(sql, rows)
+
+
+def top_doc_tags(conn: Any, *, tenant_id: str | None = None, limit: int = 25) -> list[tuple[str, int]]:
+    """Most common tags across the tenant's docs as (tag, doc_count), ties broken by tag.
+
+    SQLite reads the trigger-maintained `stats_agg` rows derived from `doc_tags`;
+    Postgres groups `doc_tags` directly (see `_PG_STATS_BREAKDOWN_SQL`).
+    """
+    if _is_postgres_conn(conn):
+        sql = """
+        SELECT tag, COUNT(*) AS n
+        FROM doc_tags
+        WHERE tenant_id=%s
+        GROUP BY tag
+        ORDER BY n DESC, tag ASC
+        LIMIT %s
+        """
+    else:
+        sql = """
+        SELECT value AS tag, n
+        FROM stats_agg
+        WHERE tenant_id=? AND dim = 'tag' AND n > 0
+        ORDER BY n DESC, value ASC
+        LIMIT ?
+        """
+    cur = conn.execute(sql, (tenant_id or _tenant_id(), int(limit)))
+    return [(str(r["tag"]), int(r["n"])) for r in cur.fetchall()]
 
 
 def upsert_doc(
@@ -909,6 +1234,7 @@ def upsert_doc(
                 now,
             ),
         )
+        _replace_doc_tags(conn, doc_id, tenant_id, tags_json)
         return
 
     conn.execute(
@@ -949,6 +1275,7 @@ def upsert_doc(
             now,
         ),
     )
+    _replace_doc_tags(conn, doc_id, tenant_id, tags_json)
 
 
 def update_doc_metadata(
@@ -996,7 +1323,9 @@ def update_doc_metadata(
         return
 
     params.extend([doc_id, tenant_id])
-    conn.execute(f"UPDATE docs SET {', '.join(sets)} WHERE doc_id={ph} AND tenant_id={ph}", params)
+    cur = conn.execute(f"UPDATE docs SET {', '.join(sets)} WHERE doc_id={ph} AND tenant_id={ph}", params)
+    if tags_json is not None and cur.rowcount:
+        _replace_doc_tags(conn, doc_id, tenant_id, tags_json)
 
 
 def get_doc(conn: Any, doc_id: str) -> Doc | None:
@@ -1041,9 +1370,37 @@ def delete_doc(conn: Any, doc_id: str) -> None:
     ph = _ph(conn)
     delete_doc_contents(conn, doc_id)
     conn.execute(f"DELETE FROM ingest_events WHERE doc_id={ph} AND tenant_id={ph}", (doc_id, tenant_id))
+    conn.execute(f"DELETE FROM doc_tags WHERE doc_id={ph} AND tenant_id={ph}", (doc_id, tenant_id))
     conn.execute(f"DELETE FROM docs WHERE doc_id={ph} AND tenant_id={ph}", (doc_id, tenant_id))
 
 
+def purge_docs_by_ids(conn: Any, doc_ids: list[str], *, batch_size: int = 500) -> int:
+    """Delete many docs (and their chunks, embeddings, events, tags) in batches.
+
+    Each batch is one write transaction with one bulk DELETE per table, committed
+    before the next batch so the write lock is never held for the whole purge.
+    Returns the number of doc rows deleted.
+    """
+
+    tenant_id = _tenant_id()
+    ph = _ph(conn)
+    ids = [scope_doc_id(d) for d in doc_ids]
+    deleted = 0
+    for start in range(0, len(ids), max(1, int(batch_size))):
+        batch = tuple(ids[start : start + max(1, int(batch_size))])
+        where = f"doc_id IN ({','.join([ph] * len(batch))}) AND tenant_id={ph}"
+        params = batch + (tenant_id,)
+        begin_immediate(conn)
+        conn.execute(f"DELETE FROM embeddings WHERE chunk_id IN (SELECT chunk_id FROM chunks WHERE {where})", params)
+        conn.execute(f"DELETE FROM chunks WHERE {where}", params)
+        conn.execute(f"DELETE FROM ingest_events WHERE {where}", params)
+        conn.execute(f"DELETE FROM doc_tags WHERE {where}", params)
+        cur = conn.execute(f"DELETE FROM docs WHERE {where}", params)
+        deleted += max(0, int(cur.rowcount or 0))
+        conn.commit()
+    return deleted
+
+
 def insert_chunks(conn: Any, chunks: Iterable[Chunk]) -> None:
     tenant_id = _tenant_id()
     rows = [(c.chunk_id, tenant_id, scope_doc_id(c.doc_id), c.idx, c.text) for c in chunks]
@@ -1183,6 +1540,55 @@ def insert_ingest_event(conn: Any, e: IngestEvent) -> None:
     )
 
 
+def latest_ingest_note_for_source(conn: Any, source: str) -> tuple[str, str] | None:
+    """Return (doc_id, notes) of the most recent ingest event for docs with `source`, if any."""
+    tenant_id = _tenant_id()
+    ph = _ph(conn)
+    cur = conn.execute(
+        f"""
+        SELECT e.doc_id, e.notes
+        FROM docs d
+        JOIN ingest_events e ON e.doc_id = d.doc_id AND e.tenant_id = d.tenant_id
+        WHERE d.tenant_id={ph} AND d.source={ph}
+        ORDER BY e.ingested_at DESC, e.doc_version DESC
+        LIMIT 1
+        """,
+        (tenant_id, source),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return str(row["doc_id"]), str(row["notes"] or "")
+
+
+def get_latest_chunk_overlap(conn: Any, doc_id: str) -> int | None:
+    """chunk_overlap_chars of the doc's latest ingest event (same order as `list_ingest_events`)."""
+    doc_id = scope_doc_id(doc_id)
+    tenant_id = _tenant_id()
+    if _is_postgres_conn(conn):
+        cur = conn.execute(
+            """
+            SELECT chunk_overlap_chars FROM ingest_events
+            WHERE doc_id=%s AND tenant_id=%s
+            ORDER BY ingested_at DESC, doc_version DESC, event_id DESC
+            LIMIT 1
+            """,
+            (doc_id, tenant_id),
+        )
+    else:
+        cur = conn.execute(
+            """
+            SELECT chunk_overlap_chars FROM ingest_events
+            WHERE doc_id=? AND tenant_id=?
+            ORDER BY ingested_at DESC, rowid DESC
+            LIMIT 1
+            """,
+            (doc_id, tenant_id),
+        )
+    row = cur.fetchone()
+    return int(row["chunk_overlap_chars"]) if row is not None else None
+
+
 def list_ingest_events(conn: Any, doc_id: str, *, limit: int = 50) -> list[IngestEvent]:
     doc_id = scope_doc_id(doc_id)
     tenant_id = _tenant_id()
@@ -1824,6 +2230,57 @@ def list_docs(conn: Any) -> list[Doc]:
     return [Doc(**dict(r)) for r in cur.fetchall()]
 
 
+def _expired_docs_query(conn: Any, columns: str, cutoffs: dict[str, int]) -> tuple[str, tuple[Any, ...]]:
+    ph = _ph(conn)
+    policy_sql = " OR ".join([f"(retention={ph} AND updated_at<={ph})"] * len(cutoffs))
+    params: tuple[Any, ...] = (_tenant_id(),)
+    for retention, cutoff in cutoffs.items():
+        params += (retention, int(cutoff))
+    sql = f"SELECT {columns} FROM docs WHERE tenant_id={ph} AND ({policy_sql}) ORDER BY updated_at DESC"
+    return sql, params
+
+
+def list_expired_docs(conn: Any, cutoffs: dict[str, int]) -> list[Doc]:
+    """Return docs whose `updated_at` is at or before the cutoff for their retention.
+
+    `cutoffs` maps a retention value to its cutoff timestamp; docs with any other
+    retention value are never returned.
+    """
+    if not cutoffs:
+        return []
+    sql, params = _expired_docs_query(
+        conn,
+        "doc_id, tenant_id, title, source, classification, retention, tags_json, "
+        "content_sha256, content_bytes, num_chunks, doc_version, created_at, updated_at",
+        cutoffs,
+    )
+    return [Doc(**dict(r)) for r in conn.execute(sql, params).fetchall()]
+
+
+def list_expired_doc_ids(conn: Any, cutoffs: dict[str, int]) -> list[str]:
+    """Like `list_expired_docs`, but only fetches the doc ids."""
+    if not cutoffs:
+        return []
+    sql, params = _expired_docs_query(conn, "doc_id", cutoffs)
+    return [str(r["doc_id"]) for r in conn.execute(sql, params).fetchall()]
+
+
+def get_doc_refs_by_ids(conn: Any, doc_ids: list[str]) -> dict[str, DocRef]:
+    if not doc_ids:
+        return {}
+    tenant_id = _tenant_id()
+    ph = _ph(conn)
+    placeholders = ",".join([ph] * len(doc_ids))
+    cur = conn.execute(
+        f"SELECT doc_id, title, source, doc_version FROM docs WHERE doc_id IN ({placeholders}) AND tenant_id={ph}",
+        tuple(doc_ids) + (tenant_id,),
+    )
+    return {
+        str(r["doc_id"]): DocRef(str(r["doc_id"]), str(r["title"]), str(r["source"]), int(r["doc_version"]))
+        for r in cur
+    }
+
+
 def list_chunks(conn: Any) -> list[Chunk]:
     tenant_id = _tenant_id()
     ph = _ph(conn)
@@ -1880,6 +2337,33 @@ def get_chunk(conn: Any, chunk_id: str) -> Chunk | None:
     return Chunk(**dict(row)) if row is not None else None
 
 
+def get_chunk_with_doc(conn: Any, chunk_id: str) -> tuple[Chunk, str | None, str | None] | None:
+    """Return (chunk, doc_title, doc_source) in one query; doc fields are None if the doc row is missing."""
+    ph = _ph(conn)
+    tenant_id = _tenant_id()
+    cur = conn.execute(
+        f"""
+        SELECT c.chunk_id, c.doc_id, c.idx, c.text, c.tenant_id,
+               d.title AS doc_title, d.source AS doc_source
+        FROM chunks c
+        LEFT JOIN docs d ON d.doc_id = c.doc_id AND d.tenant_id = c.tenant_id
+        WHERE c.chunk_id={ph} AND c.tenant_id={ph}
+        """,
+        (chunk_id, tenant_id),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    chunk = Chunk(
+        chunk_id=row["chunk_id"],
+        doc_id=row["doc_id"],
+        idx=row["idx"],
+        text=row["text"],
+        tenant_id=row["tenant_id"],
+    )
+    return chunk, row["doc_title"], row["doc_source"]
+
+
 def list_chunks_for_doc(
     conn: Any,
     doc_id: str,
@@ -1932,6 +2416,41 @@ def list_all_chunks_for_doc(
     return [Chunk(**dict(r)) for r in cur.fetchall()]
 
 
+def count_chunks_for_doc(conn: Any, doc_id: str) -> int:
+    doc_id = scope_doc_id(doc_id)
+    tenant_id = _tenant_id()
+    ph = _ph(conn)
+    cur = conn.execute(f"SELECT COUNT(*) AS n FROM chunks WHERE doc_id={ph} AND tenant_id={ph}", (doc_id, tenant_id))
+    row = cur.fetchone()
+    return int(row["n"]) if row is not None else 0
+
+
+def list_chunk_texts_for_doc(
+    conn: Any,
+    doc_id: str,
+    *,
+    after_idx: int = -1,
+    limit: int = 500,
+    tenant_id: str | None = None,
+) -> list[tuple[int, str]]:
+    """Return (idx, text) for the next `limit` chunks after `after_idx` (keyset pagination).
+
+    Used by streaming export, which pages through a doc in small batches rather
+    than holding one cursor (and connection) open while the client reads.
+    `tenant_id` may be passed explicitly when called outside the request context.
+    """
+
+    tenant = tenant_id or _tenant_id()
+    doc_id = scope_doc_id(doc_id, tenant_id=tenant)
+    limit = max(1, min(int(limit), 5000))
+    ph = _ph(conn)
+    cur = conn.execute(
+        f"SELECT idx, text FROM chunks WHERE doc_id={ph} AND tenant_id={ph} AND idx > {ph} ORDER BY idx LIMIT {ph}",
+        (doc_id, tenant, int(after_idx), limit),
+    )
+    return [(int(r["idx"]), str(r["text"])) for r in cur.fetchall()]
+
+
 def get_meta(conn: Any, key: str) -> str | None:
     ph = _ph(conn)
     cur = conn.execute(f"SELECT value FROM meta WHERE key={ph}", (key,))
@@ -1941,6 +2460,20 @@ def get_meta(conn: Any, key: str) -> str | None:
     return str(row["value"])
 
 
+def get_meta_many(conn: Any, keys: Iterable[str]) -> dict[str, str | None]:
+    """Batch form of `get_meta`: one query, `None` for missing keys."""
+
+    wanted = list(keys)
+    out: dict[str, str | None] = dict.fromkeys(wanted)
+    if not wanted:
+        return out
+    ph = _ph(conn)
+    placeholders = ", ".join([ph] * len(wanted))
+    for row in conn.execute(f"SELECT key, value FROM meta WHERE key IN ({placeholders})", wanted).fetchall():
+        out[str(row["key"])] = str(row["value"])
+    return out
+
+
 def set_meta(conn: Any, key: str, value: str) -> None:
     if _is_postgres_conn(conn):
         conn.execute(
@@ -206,3 +206,26 @@ def test_delete_eval_and_connector_actions_are_audited(tmp_path, monkeypatch: py
     flattened = str([delete_event["metadata"], eval_event["metadata"], sync_event["metadata"]]).lower()
     assert "do not copy this content" not in flattened
     assert "x-api-key" not in flattened
+
+
+def test_audit_metadata_sanitizer_redacts_nested_keys_and_caps_sizes(tmp_path):
+    main = _reload_app(str(tmp_path / "audit-sanitize.sqlite"))
+
+    sanitized = main._sanitize_audit_metadata(
+        {
+            "doc_id": "d1",
+            "API_Key": "k",
+            "nested": {"items": [{"Auth_Token": "t", "count": 3}, "x" * 600], "ok": True},
+            "many": list(range(150)),
+            "obj": object,
+        }
+    )
+
+    assert sanitized["doc_id"] == "d1"
+    assert sanitized["API_Key"] == "[redacted]"
+    assert sanitized["nested"]["items"][0] == {"Auth_Token": "[redacted]", "count": 3}
+    assert sanitized["nested"]["items"][1] == "x" * 500
+    assert sanitized["nested"]["ok"] is True
+    assert sanitized["many"] == list(range(100))
+    assert sanitized["obj"] == str(object)
+    assert list(sanitized) == ["doc_id", "API_Key", "nested", "many", "obj"]
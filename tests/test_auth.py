@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+import json
 import os
 
 import pytest
@@ -173,6 +174,18 @@ def test_meta_reports_metadata_edit_enabled_by_role(tmp_path):
     assert admin.json()["metadata_edit_enabled"] is True
 
 
+def _auth_denied_events(logs: str) -> list[dict[str, object]]:
+    events: list[dict[str, object]] = []
+    for line in logs.splitlines():
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and payload.get("event") == "auth.denied":
+            events.append(payload)
+    return events
+
+
 def test_missing_key_logs_structured_auth_denied_event(tmp_path, capsys):
     main = _reload_app(str(tmp_path / "auth_missing_log.sqlite"))
     client = TestClient(main.app)
@@ -181,10 +194,10 @@ def test_missing_key_logs_structured_auth_denied_event(tmp_path, capsys):
     r = client.get("/api/docs")
     assert r.status_code == 401
 
-    logs = capsys.readouterr().err
-    assert '"event": "auth.denied"' in logs
-    assert '"path": "/api/docs"' in logs
-    assert '"reason": "Missing API key"' in logs
+    denied = _auth_denied_events(capsys.readouterr().err)
+    assert {"path": "/api/docs", "reason": "Missing API key"} in [
+        {"path": e.get("path"), "reason": e.get("reason")} for e in denied
+    ]
 
 
 def test_forbidden_role_logs_structured_auth_denied_event(tmp_path, capsys):
@@ -204,7 +217,7 @@ def test_forbidden_role_logs_structured_auth_denied_event(tmp_path, capsys):
     )
     assert ingest_res.status_code == 403
 
-    logs = capsys.readouterr().err
-    assert '"event": "auth.denied"' in logs
-    assert '"path": "/api/ingest/text"' in logs
-    assert '"reason": "editor role required"' in logs
+    denied = _auth_denied_events(capsys.readouterr().err)
+    assert {"path": "/api/ingest/text", "reason": "editor role required"} in [
+        {"path": e.get("path"), "reason": e.get("reason")} for e in denied
+    ]
@@ -87,3 +87,66 @@ def test_meta_reports_query_payload_limit(tmp_path):
         assert meta.json()["max_query_payload_bytes"] == 16384
     finally:
         _restore_env(before)
+
+
+def test_meta_snapshot_refreshes_after_ingest(tmp_path):
+    before = {k: os.environ.get(k) for k in _ENV_KEYS}
+    try:
+        main = _reload_app(str(tmp_path / "meta_snapshot.sqlite"), max_query_payload_bytes=32768)
+        client = TestClient(main.app)
+
+        first = client.get("/api/meta")
+        assert first.status_code == 200, first.text
+        assert first.json()["stats"]["docs"] == 0
+        # Repeated polls inside the TTL are served from the snapshot.
+        assert client.get("/api/meta").json()["stats"] == first.json()["stats"]
+
+        ingest = client.post(
+            "/api/ingest/text",
+            json={"title": "Snapshot", "source": "unit-test", "text": "Snapshots refresh after writes."},
+        )
+        assert ingest.status_code == 200, ingest.text
+
+        after = client.get("/api/meta")
+        assert after.json()["stats"]["docs"] == 1
+        assert after.json()["stats"]["chunks"] >= 1
+        assert after.json()["stats"]["embeddings"] == after.json()["stats"]["chunks"]
+        signature = after.json()["index_signature"]
+        assert set(signature) == set(main._INDEX_SIGNATURE_KEYS)
+        assert signature["index.embeddings_backend"] == main.settings.embeddings_backend
+
+        assert client.get("/ready").json()["ready"] is True
+        assert client.get("/ready").json()["ready"] is True
+    finally:
+        _restore_env(before)
+
+
+def test_slow_stats_snapshot_does_not_block_other_tenants(tmp_path, monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    before = {k: os.environ.get(k) for k in _ENV_KEYS}
+    try:
+        main = _reload_app(str(tmp_path / "stats_snapshot.sqlite"), max_query_payload_bytes=32768)
+        started, release = threading.Event(), threading.Event()
+        real_compute = main._compute_stats
+
+        def compute(tenant_id):
+            if tenant_id == "slow":
+                started.set()
+                assert release.wait(5)
+            return real_compute(tenant_id)
+
+        monkeypatch.setattr(main, "_compute_stats", compute)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            slow = pool.submit(main._stats_snapshot, "slow")
+            try:
+                assert started.wait(5)
+                # Neither another tenant's stats nor /api/meta waits on the slow computation.
+                assert pool.submit(main._stats_snapshot, "fast").result(timeout=2).docs == 0
+                assert pool.submit(main._meta_index_snapshot, "fast").result(timeout=2)["stats"]["docs"] == 0
+            finally:
+                release.set()
+            assert slow.result(timeout=5).docs == 0
+    finally:
+        _restore_env(before)
@@ -3,14 +3,40 @@ from __future__ import annotations
 import importlib
 import os
 
+import pytest
 from fastapi.testclient import TestClient
 
 
+_ENV_KEYS = [
+    "SQLITE_PATH",
+    "PUBLIC_DEMO_MODE",
+    "AUTH_MODE",
+    "ALLOW_UPLOADS",
+    "ALLOW_CHUNK_VIEW",
+    "API_KEYS_JSON",
+    "API_KEYS",
+    "API_KEY",
+    "BOOTSTRAP_DEMO_CORPUS",
+]
+
+
+@pytest.fixture(autouse=True)
+def _restore_env_after_test():
+    before = {k: os.environ.get(k) for k in _ENV_KEYS}
+    yield
+    for key, value in before.items():
+        if value is None:
+            os.environ.pop(key, None)
+            continue
+        os.environ[key] = value
+
+
 def _reload_app(sqlite_path: str, *, public_demo_mode: bool, allow_uploads: bool) -> object:
     os.environ["SQLITE_PATH"] = sqlite_path
     os.environ["PUBLIC_DEMO_MODE"] = "1" if public_demo_mode else "0"
     os.environ["AUTH_MODE"] = "none"
     os.environ["ALLOW_UPLOADS"] = "1" if allow_uploads else "0"
+    os.environ["ALLOW_CHUNK_VIEW"] = "1"
     os.environ.pop("API_KEYS_JSON", None)
     os.environ.pop("API_KEYS", None)
     os.environ.pop("API_KEY", None)
@@ -85,3 +111,112 @@ def test_doc_update_updates_metadata_without_touching_updated_at(tmp_path):
     assert r4.status_code == 200
     after = r4.json()["doc"]["updated_at"]
     assert after == before
+
+
+def test_stats_reports_counts_and_tag_breakdown(tmp_path):
+    main = _reload_app(str(tmp_path / "db.sqlite"), public_demo_mode=False, allow_uploads=True)
+    client = TestClient(main.app)
+
+    docs = [
+        ("public", ["alpha", "beta"]),
+        ("internal", ["alpha"]),
+        ("internal", ["alpha", "beta", "gamma"]),
+    ]
+    for i, (classification, tags) in enumerate(docs):
+        r = client.post(
+            "/api/ingest/text",
+            json={
+                "title": f"Doc {i}",
+                "source": "unit-test",
+                "text": f"stats document number {i}",
+                "classification": classification,
+                "tags": tags,
+            },
+        )
+        assert r.status_code == 200, r.text
+
+    r = client.get("/api/stats")
+    assert r.status_code == 200, r.text
+    stats = r.json()
+    assert stats["docs"] == 3
+    assert stats["chunks"] >= 3
+    assert stats["embeddings"] == stats["chunks"]
+    assert stats["ingest_events"] == 3
+    assert stats["by_classification"] == {"public": 1, "internal": 2}
+    assert [(t["tag"], t["count"]) for t in stats["top_tags"]] == [("alpha", 3), ("beta", 2), ("gamma", 1)]
+
+    # Served from the snapshot until the next write bumps the cache version.
+    r = client.post(
+        "/api/ingest/text",
+        json={"title": "Doc 3", "source": "unit-test", "text": "one more stats document", "tags": ["beta"]},
+    )
+    assert r.status_code == 200, r.text
+    stats = client.get("/api/stats").json()
+    assert stats["docs"] == 4
+    assert [(t["tag"], t["count"]) for t in stats["top_tags"]][:2] == [("alpha", 3), ("beta", 3)]
+
+
+def test_deoverlap_chunk_texts_drops_repeated_prefix(tmp_path):
+    main = _reload_app(str(tmp_path / "db.sqlite"), public_demo_mode=False, allow_uploads=True)
+    texts = ["alpha beta gamma", "gamma\ndelta epsilon", "silon zeta", "   ", "unrelated"]
+
+    assert list(main._deoverlap_chunk_texts(texts, 5)) == ["alpha beta gamma", "delta epsilon", "zeta", "unrelated"]
+
+
+def test_deoverlap_chunk_texts_without_overlap_only_strips(tmp_path):
+    main = _reload_app(str(tmp_path / "db.sqlite"), public_demo_mode=False, allow_uploads=True)
+
+    assert list(main._deoverlap_chunk_texts([" a ", "", "b\n"], 0)) == ["a", "b"]
+
+
+def test_chunk_detail_and_text_export(tmp_path):
+    main = _reload_app(str(tmp_path / "db.sqlite"), public_demo_mode=False, allow_uploads=True)
+    client = TestClient(main.app)
+
+    r = client.post(
+        "/api/ingest/text",
+        json={"title": "Runbook", "source": "unit-test", "text": "Restart the worker.\n\nThen check the queue depth."},
+    )
+    assert r.status_code == 200, r.text
+    doc_id = r.json()["doc_id"]
+
+    chunks = client.get(f"/api/docs/{doc_id}/chunks").json()["chunks"]
+    detail = client.get(f"/api/chunks/{chunks[0]['chunk_id']}")
+    assert detail.status_code == 200, detail.text
+    chunk = detail.json()["chunk"]
+    assert chunk["doc_id"] == doc_id
+    assert chunk["doc_title"] == "Runbook"
+    assert chunk["doc_source"] == "unit-test"
+
+    assert client.get("/api/chunks/missing").status_code == 404
+
+    export = client.get(f"/api/docs/{doc_id}/text")
+    assert export.status_code == 200, export.text
+    assert "Title: Runbook" in export.text
+    assert "Then check the queue depth." in export.text
+
+
+def test_text_export_streams_across_batches(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHUNK_SIZE_CHARS", "200")
+    monkeypatch.setenv("CHUNK_OVERLAP_CHARS", "40")
+    main = _reload_app(str(tmp_path / "db.sqlite"), public_demo_mode=False, allow_uploads=True)
+    monkeypatch.setattr(main, "_DOC_EXPORT_BATCH", 2)
+    client = TestClient(main.app)
+
+    paragraphs = [f"Paragraph {i}: " + " ".join(f"word{i}_{j}" for j in range(25)) for i in range(8)]
+    r = client.post("/api/ingest/text", json={"title": "Long", "source": "unit-test", "text": "\n\n".join(paragraphs)})
+    assert r.status_code == 200, r.text
+    doc_id = r.json()["doc_id"]
+
+    chunks = client.get(f"/api/docs/{doc_id}/chunks?limit=500").json()["chunks"]
+    assert len(chunks) > 2 * main._DOC_EXPORT_BATCH
+
+    export = client.get(f"/api/docs/{doc_id}/text")
+    assert export.status_code == 200, export.text
+    assert export.headers["content-type"].startswith("text/plain")
+    assert "WARNING" not in export.text
+    texts = [client.get(f"/api/chunks/{c['chunk_id']}").json()["chunk"]["text"] for c in chunks]
+    expected_body = "\n\n".join(main._deoverlap_chunk_texts(texts, 40))
+    assert export.text.endswith("Export overlap_chars=40\n" + expected_body + "\n")
+    for i in range(8):
+        assert f"word{i}_24" in export.text
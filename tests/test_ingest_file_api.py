@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import importlib
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+_ENV_KEYS = [
+    "SQLITE_PATH",
+    "PUBLIC_DEMO_MODE",
+    "AUTH_MODE",
+    "API_KEYS_JSON",
+    "ALLOW_UPLOADS",
+    "ALLOW_CHUNK_VIEW",
+    "BOOTSTRAP_DEMO_CORPUS",
+    "MAX_UPLOAD_BYTES",
+]
+
+
+@pytest.fixture(autouse=True)
+def _restore_env_after_test():
+    before = {k: os.environ.get(k) for k in _ENV_KEYS}
+    yield
+    for key, value in before.items():
+        if value is None:
+            os.environ.pop(key, None)
+            continue
+        os.environ[key] = value
+
+
+def _reload_app(
+    sqlite_path: str,
+    *,
+    public_demo_mode: bool,
+    allow_uploads: bool,
+    max_upload_bytes: int = 10_000_000,
+) -> object:
+    os.environ["SQLITE_PATH"] = sqlite_path
+    os.environ["PUBLIC_DEMO_MODE"] = "1" if public_demo_mode else "0"
+    os.environ["AUTH_MODE"] = "api_key"
+    os.environ["API_KEYS_JSON"] = '{"reader-key":"reader","editor-key":"editor","admin-key":"admin"}'
+    os.environ["ALLOW_UPLOADS"] = "1" if allow_uploads else "0"
+    os.environ["ALLOW_CHUNK_VIEW"] = "1"
+    os.environ["BOOTSTRAP_DEMO_CORPUS"] = "0"
+    os.environ["MAX_UPLOAD_BYTES"] = str(max_upload_bytes)
+
+    import app.auth as auth
+    import app.config as config
+    import app.ingestion as ingestion
+    import app.main as main
+    import app.retrieval as retrieval
+    import app.storage as storage
+
+    importlib.reload(config)
+    importlib.reload(auth)
+    importlib.reload(storage)
+    importlib.reload(ingestion)
+    importlib.reload(retrieval)
+    importlib.reload(main)
+    return main
+
+
+def test_file_ingest_text_upload_limits_and_newlines(tmp_path):
+    main = _reload_app(
+        str(tmp_path / "file_text.sqlite"),
+        public_demo_mode=False,
+        allow_uploads=True,
+        max_upload_bytes=64,
+    )
+    client = TestClient(main.app)
+    headers = {"X-API-Key": "editor-key"}
+
+    too_big = client.post(
+        "/api/ingest/file",
+        headers=headers,
+        files={"file": ("big.txt", b"x" * 65, "text/plain")},
+    )
+    assert too_big.status_code == 413
+
+    res = client.post(
+        "/api/ingest/file",
+        headers=headers,
+        data={"title": "Notes", "source": "unit-test"},
+        files={"file": ("notes.md", b"line one\r\nline two\r\n", "text/markdown")},
+    )
+    assert res.status_code == 200, res.text
+    doc_id = res.json()["doc_id"]
+
+    chunks = client.get(f"/api/docs/{doc_id}/chunks", headers={"X-API-Key": "admin-key"})
+    assert chunks.status_code == 200, chunks.text
+    previews = [str(c.get("text_preview", "")) for c in chunks.json()["chunks"]]
+    assert previews and not any("\r" in p for p in previews)
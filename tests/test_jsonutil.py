@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+import app.jsonutil as jsonutil
+
+
+def test_dumps_bytes_fallback_matches_starlette_rendering(monkeypatch):
+    from starlette.responses import JSONResponse
+
+    monkeypatch.setattr(jsonutil, "_orjson", None)
+    payload = {"answer": "café", "scores": [1, 0.5], "nested": {"ok": True}}
+
+    assert jsonutil.dumps_bytes(payload) == JSONResponse(payload).body
+    assert jsonutil.dumps_bytes(payload) == b'{"answer":"caf\xc3\xa9","scores":[1,0.5],"nested":{"ok":true}}'
+    with pytest.raises(ValueError):
+        jsonutil.dumps_bytes({"score": math.nan})
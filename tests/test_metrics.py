@@ -70,7 +70,33 @@ def test_query_path_records_http_and_stage_metrics(tmp_path):
     assert query.status_code == 200, query.text
     assert query.json().get("refused") is False
 
-    assert any(call.get("path") == "/api/query" for call in metric_calls["http"])
+    assert any(call.get("route") == "/api/query" for call in metric_calls["http"])
     assert len(metric_calls["safety"]) >= 1
     assert len(metric_calls["retrieval"]) >= 1
     assert len(metric_calls["generation"]) >= 1
+
+
+def test_http_metrics_use_route_templates(tmp_path):
+    main = _reload_app(str(tmp_path / "metrics_routes.sqlite"))
+    client = TestClient(main.app)
+    routes: list[tuple[str, int]] = []
+    main.record_http_request_metric = lambda **kw: routes.append((kw["route"], kw["status_code"]))
+
+    ingest = client.post(
+        "/api/ingest/text",
+        json={"title": "Route Doc", "source": "unit-test", "text": "Route templates keep metrics bounded."},
+    )
+    assert ingest.status_code == 200, ingest.text
+    doc_id = ingest.json()["doc_id"]
+    assert client.get(f"/api/docs/{doc_id}").status_code == 200
+    assert client.get("/api/docs/does-not-exist").status_code == 404
+    # Rejected by the middleware before routing; the template is still resolved.
+    too_big = client.post("/api/query", content=b"x" * (main.settings.max_query_payload_bytes + 1))
+    assert too_big.status_code == 413
+
+    assert routes == [
+        ("/api/ingest/text", 200),
+        ("/api/docs/{doc_id}", 200),
+        ("/api/docs/{doc_id}", 404),
+        ("/api/query", 413),
+    ]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import logging.handlers
+
+import app.observability as observability
+
+
+def test_async_logging_writes_preserialized_lines_on_listener(monkeypatch) -> None:
+    raw = io.BytesIO()
+    stream = io.TextIOWrapper(raw, encoding="utf-8")
+    monkeypatch.setenv("LOG_ASYNC", "1")
+    monkeypatch.setattr(
+        observability.JSONLineHandler, "__init__", lambda self: logging.StreamHandler.__init__(self, stream)
+    )
+    try:
+        observability.configure_logging()
+        logger = logging.getLogger("gkp")
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+        logger.info(b'{"event":"bytes"}')
+        logger.info("plain %s", "formatted")
+        # Stopping the listener drains everything queued so far.
+        observability._stop_log_listener()
+    finally:
+        monkeypatch.undo()
+        observability.configure_logging()
+
+    stream.flush()
+    lines = raw.getvalue().decode("utf-8").splitlines()
+    assert json.loads(lines[0]) == {"event": "bytes"}
+    assert lines[1] == "plain formatted"
+
+
+def test_cloud_trace_resource_uses_cached_project_prefix(monkeypatch) -> None:
+    monkeypatch.delenv("GCP_PROJECT", raising=False)
+    monkeypatch.delenv("PROJECT_ID", raising=False)
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", " demo-project ")
+    observability._log_static_fields.cache_clear()
+    try:
+        assert observability._cloud_trace_resource("abc123") == "projects/demo-project/traces/abc123"
+        assert observability._cloud_trace_resource(None) is None
+
+        # The prefix is resolved once per process; env changes need a cache reset.
+        monkeypatch.delenv("GOOGLE_CLOUD_PROJECT")
+        assert observability._cloud_trace_resource("abc123") == "projects/demo-project/traces/abc123"
+        observability._log_static_fields.cache_clear()
+        assert observability._cloud_trace_resource("abc123") is None
+    finally:
+        observability._log_static_fields.cache_clear()
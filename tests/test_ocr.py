@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+import pytest
+
+import app.ocr as ocr
+
+_NATIVE_TEXT = "Native text layer with plenty of characters on this page."
+
+
+def _scanned_pdf(path) -> None:
+    """Pages: native text, image, blank, image, image."""
+    image = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+    image.clear_with(200)
+    doc = fitz.open()
+    for kind in ("text", "image", "blank", "image", "image"):
+        page = doc.new_page()
+        if kind == "text":
+            page.insert_text((72, 72), _NATIVE_TEXT)
+        elif kind == "image":
+            page.insert_image(fitz.Rect(72, 72, 200, 200), pixmap=image)
+    doc.save(str(path))
+    doc.close()
+
+
+def _ocr_settings(monkeypatch, **overrides) -> None:
+    values = {"ocr_enabled": True, "ocr_min_chars": 20, "ocr_max_pages": 10, "ocr_require_image": True}
+    values.update(overrides)
+    monkeypatch.setattr(ocr, "settings", dataclasses.replace(ocr.settings, **values))
+
+
+def test_ocr_skips_image_less_pages_and_counts_max_pages_skips(tmp_path, monkeypatch):
+    pdf = tmp_path / "scan.pdf"
+    _scanned_pdf(pdf)
+    _ocr_settings(monkeypatch, ocr_max_pages=1, ocr_workers=1)
+    seen: list[int] = []
+
+    def _fake_ocr_page(page, **_kwargs):
+        seen.append(page.number)
+        return f"ocr text {page.number}"
+
+    monkeypatch.setattr(ocr, "_ocr_page", _fake_ocr_page)
+
+    res = ocr.extract_text_from_pdf(pdf)
+
+    # The blank page has no image, so only pages 1, 3 and 4 qualify; the cap keeps page 1.
+    assert seen == [1]
+    assert res.pages == 5
+    assert res.ocr_pages == 1
+    assert res.text == f"{_NATIVE_TEXT}\n\nocr text 1"
+    assert res.warnings == ("ocr_skipped_pages=2", "empty_pages=3")
+
+
+def test_ocr_without_image_requirement_includes_blank_pages(tmp_path, monkeypatch):
+    pdf = tmp_path / "scan.pdf"
+    _scanned_pdf(pdf)
+    _ocr_settings(monkeypatch, ocr_require_image=False, ocr_workers=1)
+    monkeypatch.setattr(ocr, "_ocr_page", lambda page, **_kwargs: f"ocr text {page.number}")
+
+    res = ocr.extract_text_from_pdf(pdf)
+
+    assert res.ocr_pages == 4
+    assert res.warnings == ()
+
+
+def test_parallel_ocr_reassembles_pages_in_document_order(tmp_path, monkeypatch):
+    pdf = tmp_path / "scan.pdf"
+    _scanned_pdf(pdf)
+    _ocr_settings(monkeypatch, ocr_workers=3)
+    calls: list[tuple[str, int]] = []
+
+    class _ThreadPool(ThreadPoolExecutor):
+        def __init__(self, max_workers, mp_context=None):
+            assert max_workers == 3
+            super().__init__(max_workers=max_workers)
+
+    def _fake_ocr_page_by_index(pdf_path, index, dpi, lang):
+        calls.append((pdf_path, index))
+        return f"ocr text {index}" if index != 3 else "   "
+
+    monkeypatch.setattr(ocr, "ProcessPoolExecutor", _ThreadPool)
+    monkeypatch.setattr(ocr, "_ocr_page_by_index", _fake_ocr_page_by_index)
+    monkeypatch.setattr(ocr, "_ocr_page", lambda *_a, **_k: pytest.fail("in-process OCR used"))
+
+    res = ocr.extract_text_from_pdf(pdf)
+
+    assert sorted(calls) == [(str(pdf), 1), (str(pdf), 3), (str(pdf), 4)]
+    # Whitespace-only OCR output leaves the page empty.
+    assert res.text == f"{_NATIVE_TEXT}\n\nocr text 1\n\nocr text 4"
+    assert res.ocr_pages == 2
+    assert res.warnings == ("empty_pages=2",)
+
+
+def test_ocr_worker_count_is_opt_in_and_capped(monkeypatch):
+    _ocr_settings(monkeypatch, ocr_workers=1)
+    assert ocr._ocr_worker_count(10) == 1
+
+    _ocr_settings(monkeypatch, ocr_workers=0)
+    monkeypatch.setattr(ocr.os, "sched_getaffinity", lambda _pid: set(range(64)), raising=False)
+    assert ocr._ocr_worker_count(10) == ocr._OCR_AUTO_MAX_WORKERS
+    assert ocr._ocr_worker_count(2) == 2
@@ -16,6 +16,12 @@ class _FakeCursor:
 
     def execute(self, sql: str, params=None) -> None:
         stmt = " ".join((sql or "").strip().split()).lower()
+        if stmt.startswith("select pg_advisory_xact_lock"):
+            locks = self._state.setdefault("locks", [])
+            if not isinstance(locks, list):
+                raise AssertionError("invalid fake state: locks must be a list")
+            locks.append(params[0])
+            return
         if stmt.startswith("create table if not exists schema_migrations"):
             return
         if stmt.startswith("select filename from schema_migrations"):
@@ -67,6 +73,7 @@ def test_apply_postgres_migrations_tracks_filenames_in_sorted_order(tmp_path):
         "-- 010_last\nSELECT 10;",
     ]
     assert conn.commit_count == 1
+    assert len(conn.state["locks"]) == 1
 
     second = apply_postgres_migrations(conn, migrations_dir=tmp_path)
     assert second == []
@@ -82,7 +82,9 @@ def _patch_gcs_download(monkeypatch: pytest.MonkeyPatch, *, files: dict[str, str
     monkeypatch.setattr(gcs, "download_object_to_file", _fake_download)
 
 
-def _attrs_payload(*, message_id: str, bucket: str, object_name: str, event_type: str = "OBJECT_FINALIZE") -> dict[str, Any]:
+def _attrs_payload(
+    *, message_id: str, bucket: str, object_name: str, event_type: str = "OBJECT_FINALIZE", generation: str = "1"
+) -> dict[str, Any]:
     return {
         "message": {
             "messageId": message_id,
@@ -90,7 +92,7 @@ def _attrs_payload(*, message_id: str, bucket: str, object_name: str, event_type
                 "eventType": event_type,
                 "bucketId": bucket,
                 "objectId": object_name,
-                "objectGeneration": "1",
+                "objectGeneration": generation,
                 "objectSize": "12",
             },
         },
@@ -120,7 +122,8 @@ def test_pubsub_notify_ingests_object_and_is_idempotent(tmp_path: Path, monkeypa
     run1 = str(body1["run_id"])
     assert body1["result"] == "changed"
 
-    payload2 = _attrs_payload(message_id="msg-2", bucket="demo-bucket", object_name="knowledge/a.txt")
+    # A new generation with identical bytes is downloaded and recorded as an unchanged run.
+    payload2 = _attrs_payload(message_id="msg-2", bucket="demo-bucket", object_name="knowledge/a.txt", generation="2")
     res2 = client.post("/api/connectors/gcs/notify", headers={"X-API-Key": "admin-key"}, json=payload2)
     assert res2.status_code == 202, res2.text
     body2 = res2.json()
@@ -142,6 +145,35 @@ def test_pubsub_notify_ingests_object_and_is_idempotent(tmp_path: Path, monkeypa
     assert run2_summary["docs_unchanged"] == 1
 
 
+def test_pubsub_notify_redelivery_of_ingested_generation_skips_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = _reload_app(str(tmp_path / "pubsub_redelivery.sqlite"), public_demo_mode=False, allow_connectors=True)
+    _patch_gcs_download(monkeypatch, files={"knowledge/a.txt": "alpha"})
+    client = TestClient(main.app)
+
+    payload = _attrs_payload(message_id="msg-1", bucket="demo-bucket", object_name="knowledge/a.txt")
+    first = client.post("/api/connectors/gcs/notify", headers={"X-API-Key": "admin-key"}, json=payload)
+    assert first.status_code == 202, first.text
+    assert first.json()["result"] == "changed"
+
+    import app.connectors.gcs as gcs
+
+    def _no_download(**_kwargs: Any) -> None:
+        raise AssertionError("redelivered generation should not be downloaded")
+
+    monkeypatch.setattr(gcs, "download_object_to_file", _no_download)
+    again = client.post("/api/connectors/gcs/notify", headers={"X-API-Key": "admin-key"}, json=payload)
+    assert again.status_code == 202, again.text
+    body = again.json()
+    assert body["result"] == "unchanged"
+    assert body["run_id"] is None
+    assert body["doc_id"] == first.json()["doc_id"]
+
+    runs = client.get("/api/ingestion-runs?limit=10", headers={"X-API-Key": "reader-key"}).json()["runs"]
+    assert len(runs) == 1
+
+
 def test_pubsub_notify_parses_base64_message_data_fallback(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     main = _reload_app(str(tmp_path / "pubsub_notify_data.sqlite"), public_demo_mode=False, allow_connectors=True)
     _patch_gcs_download(monkeypatch, files={"knowledge/b.txt": "bravo"})
@@ -150,3 +150,59 @@ def test_query_stream_done_includes_explain_and_refusal_category(tmp_path):
     explain = done.get("explain")
     assert isinstance(explain, dict)
     assert explain.get("refusal", {}).get("category") == "evidence"
+
+
+def test_repeat_query_reuses_cached_retrieval_until_index_changes(tmp_path):
+    main = _reload_app(str(tmp_path / "retrieval_cache.sqlite"), public_demo_mode=False)
+    calls: list[str] = []
+
+    def _retrieve(question, top_k=5):
+        calls.append(question)
+        return _mock_retrieved()[:top_k]
+
+    main.retrieve = _retrieve
+    main.get_answerer = lambda: _mock_answerer()
+    client = TestClient(main.app)
+    payload = {"question": "How does Cloud Run scale?", "top_k": 3}
+
+    for _ in range(3):
+        res = client.post("/api/query", json=payload)
+        assert res.status_code == 200, res.text
+        assert res.json()["citations"]
+    assert len(calls) == 1
+
+    main.invalidate_cache()
+    assert client.post("/api/query", json=payload).status_code == 200
+    assert len(calls) == 2
+
+
+def test_query_runs_blocking_work_in_the_anyio_threadpool(tmp_path):
+    import threading
+
+    main = _reload_app(str(tmp_path / "query_threads.sqlite"), public_demo_mode=False)
+    threads: dict[str, str] = {}
+    answerer = _mock_answerer()
+    real_answer = answerer.answer
+
+    def _retrieve(_question, top_k=5):
+        threads["retrieve"] = threading.current_thread().name
+        return _mock_retrieved()[:top_k]
+
+    def _get_answerer():
+        threads["get_answerer"] = threading.current_thread().name
+        return answerer
+
+    def _answer(question, context):
+        threads["answer"] = threading.current_thread().name
+        return real_answer(question, context)
+
+    answerer.answer = _answer
+    main.retrieve = _retrieve
+    main.get_answerer = _get_answerer
+    client = TestClient(main.app)
+
+    res = client.post("/api/query", json={"question": "How does Cloud Run scale?", "top_k": 3})
+    assert res.status_code == 200, res.text
+    # Same limiter as sync endpoints, not the asyncio default executor.
+    assert set(threads) == {"retrieve", "get_answerer", "answer"}
+    assert all(name == "AnyIO worker thread" for name in threads.values()), threads
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import app.ratelimit as ratelimit
+
+
+def _clock(monkeypatch, start: float) -> list[float]:
+    now = [start]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_sliding_window_counter_weights_previous_window(monkeypatch):
+    now = _clock(monkeypatch, 1000.0)
+    limiter = ratelimit.SlidingWindowRateLimiter(window_s=10, max_requests=4)
+    client, other = ratelimit.client_key("1.2.3.4"), ratelimit.client_key("5.6.7.8")
+
+    assert all(limiter.allow(client) for _ in range(4))
+    assert limiter.allow(client) is False
+    # Other keys have their own budget.
+    assert limiter.allow(other) is True
+
+    # Halfway into the next window, the previous 4 hits still count as 2.
+    now[0] = 1015.0
+    assert limiter.allow(client) is True
+    assert limiter.allow(client) is True
+    assert limiter.allow(client) is False
+
+    # Two windows later the old counts no longer overlap.
+    now[0] = 1030.0
+    assert all(limiter.allow(client) for _ in range(4))
+    assert limiter.allow(client) is False
+
+
+def test_sliding_window_counter_evicts_idle_keys(monkeypatch):
+    now = _clock(monkeypatch, 1000.0)
+    limiter = ratelimit.SlidingWindowRateLimiter(window_s=10, max_requests=2)
+
+    for i in range(50):
+        limiter.allow(ratelimit.client_key(f"10.0.0.{i}"))
+    assert len(limiter._buckets) == 50
+
+    now[0] = 1030.0
+    limiter.allow(ratelimit.client_key("10.0.1.1"))
+    assert set(limiter._buckets) == {ratelimit.client_key("10.0.1.1")}
+
+
+def test_client_key_is_stable_64_bit_digest():
+    key = ratelimit.client_key("203.0.113.7")
+    assert key == ratelimit.client_key("203.0.113.7")
+    assert key != ratelimit.client_key("203.0.113.8")
+    assert 0 <= key < 2**64
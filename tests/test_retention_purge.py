@@ -59,3 +59,77 @@ def test_retention_purge_dry_run_and_apply(tmp_path) -> None:
         ids_apply = purge_expired_docs(conn, now=now, apply=True)
         assert ids_apply == ["d1"]
         assert {d.doc_id for d in list_docs(conn)} == {"d2"}
+
+
+def test_find_expired_docs_matches_in_memory_filter_at_boundaries(tmp_path) -> None:
+    from app.maintenance import RETENTION_TTLS_SECONDS, iter_expired_docs
+
+    db_path = tmp_path / "retention.sqlite"
+    now = 2_000_000_000
+
+    with connect(str(db_path)) as conn:
+        init_db(conn)
+        for i, (retention, age) in enumerate(
+            [
+                ("30d", RETENTION_TTLS_SECONDS["30d"]),
+                ("30d", RETENTION_TTLS_SECONDS["30d"] - 1),
+                ("90d", RETENTION_TTLS_SECONDS["90d"] + 5),
+                ("1y", RETENTION_TTLS_SECONDS["1y"] - 5),
+                ("none", 10 * RETENTION_TTLS_SECONDS["1y"]),
+                ("bogus", 10 * RETENTION_TTLS_SECONDS["1y"]),
+            ]
+        ):
+            upsert_doc(
+                conn,
+                doc_id=f"d{i}",
+                title=f"Doc {i}",
+                source="unit-test",
+                classification="public",
+                retention=retention,
+                tags_json="[]",
+                content_sha256=f"{i}" * 64,
+                content_bytes=1,
+                num_chunks=0,
+                doc_version=1,
+            )
+            conn.execute("UPDATE docs SET updated_at=? WHERE doc_id=?", (now - age, f"d{i}"))
+        conn.commit()
+
+        expired = {d.doc_id for d in find_expired_docs(conn, now=now)}
+        assert expired == {"d0", "d2"}
+        assert expired == {d.doc_id for d in iter_expired_docs(list_docs(conn), now=now)}
+
+
+def test_purge_docs_by_ids_deletes_children_in_batches(tmp_path) -> None:
+    from app.storage import Chunk, insert_chunks, insert_embeddings, purge_docs_by_ids
+
+    with connect(str(tmp_path / "purge.sqlite")) as conn:
+        init_db(conn)
+        for i in range(5):
+            upsert_doc(
+                conn,
+                doc_id=f"d{i}",
+                title=f"Doc {i}",
+                source="unit-test",
+                classification="public",
+                retention="30d",
+                tags_json='["test"]',
+                content_sha256=f"{i}" * 64,
+                content_bytes=1,
+                num_chunks=1,
+                doc_version=1,
+            )
+            insert_chunks(conn, [Chunk(chunk_id=f"c{i}", doc_id=f"d{i}", idx=0, text=f"text {i}")])
+            insert_embeddings(conn, [(f"c{i}", 2, b"\x00" * 8)])
+        conn.commit()
+
+        assert purge_docs_by_ids(conn, ["d0", "d1", "d2", "missing"], batch_size=2) == 3
+
+        assert {d.doc_id for d in list_docs(conn)} == {"d3", "d4"}
+        chunk_ids = {r["chunk_id"] for r in conn.execute("SELECT chunk_id FROM chunks")}
+        assert chunk_ids == {"c3", "c4"}
+        emb_ids = {r["chunk_id"] for r in conn.execute("SELECT chunk_id FROM embeddings")}
+        assert emb_ids == {"c3", "c4"}
+        tagged = {r["doc_id"] for r in conn.execute("SELECT doc_id FROM doc_tags")}
+        assert tagged == {"d3", "d4"}
+        assert not conn.in_transaction
@@ -112,3 +112,48 @@ def test_retrieval_tie_break_sort_is_deterministic(tmp_path):
 
     ordered = sorted(rows, key=retrieval._retrieval_sort_key)
     assert [r.chunk_id for r in ordered] == ["chunk-a", "chunk-b"]
+
+
+def test_pgvector_binary_encoding_matches_vector_recv_layout():
+    import struct
+
+    import numpy as np
+
+    from app.retrieval import _vec_to_pgvector_binary
+
+    vec = np.array([3.0, 4.0, 0.0], dtype=np.float64)
+    data = _vec_to_pgvector_binary(vec)
+
+    dim, unused = struct.unpack(">hh", data[:4])
+    assert (dim, unused) == (3, 0)
+    assert struct.unpack(">3f", data[4:]) == pytest.approx((0.6, 0.8, 0.0))
+    assert len(_vec_to_pgvector_binary(np.zeros(384))) == 4 + 384 * 4
+
+
+def test_bm25_index_is_reused_until_cache_invalidated(tmp_path, monkeypatch):
+    os.environ["EMBEDDINGS_BACKEND"] = "hash"
+    retrieval, _main = _reload_modules(str(tmp_path / "retrieval_bm25.sqlite"))
+    import app.ingestion as ingestion
+    import rank_bm25
+
+    importlib.reload(ingestion)
+    ingestion.ingest_text(title="Pumps", source="src", text="Centrifugal pumps move water through pipes.")
+
+    builds: list[int] = []
+
+    class _CountingBM25(rank_bm25.BM25Okapi):
+        def __init__(self, corpus):
+            builds.append(len(corpus))
+            super().__init__(corpus)
+
+    monkeypatch.setattr(rank_bm25, "BM25Okapi", _CountingBM25)
+    monkeypatch.setattr(retrieval, "_lexical_scores_fts", lambda conn, query, limit: None)
+
+    retrieval.invalidate_cache()
+    assert retrieval.retrieve("pumps water")
+    assert retrieval.retrieve("pipes")
+    assert len(builds) == 1
+
+    retrieval.invalidate_cache()
+    assert retrieval.retrieve("pumps")
+    assert len(builds) == 2
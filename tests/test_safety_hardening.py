@@ -143,3 +143,42 @@ def test_query_returns_internal_error_refusal_on_answerer_exception(tmp_path) ->
     assert body["refused"] is True
     assert body["refusal_reason"] == "internal_error"
     assert body["citations"] == []
+
+
+def test_citation_strength_matches_whole_tokens_and_substrings(tmp_path) -> None:
+    main = _reload_app(str(tmp_path / "citation_strength.sqlite"))
+
+    variants = main._question_term_variants("How do deployments roll back?")
+    assert main._citations_are_weak(variants, [{"quote": "Deployments roll back automatically."}]) is False
+    assert main._citations_are_weak(variants, [{"quote": "Each deploymentset is versioned."}]) is False
+    assert main._citations_are_weak(variants, [{"quote": "tiny"}]) is True
+    assert main._citations_are_weak(variants, []) is True
+    assert main._citations_are_weak(frozenset(), [{"quote": "anything"}]) is False
+
+
+def test_unrelated_question_scan_keeps_substring_semantics(tmp_path) -> None:
+    main = _reload_app(str(tmp_path / "unrelated_scan.sqlite"))
+
+    class _Chunk:
+        def __init__(self, text: str) -> None:
+            self.text = text
+
+    def _naive_hits(question: str, text: str) -> int:
+        lowered = text.lower()
+        return sum(1 for t in main._extract_key_terms(question) if any(v in lowered for v in main._term_variants(t)))
+
+    cases = [
+        ("compare cloud and cloudrun limits", "Cloudrun limits differ."),
+        ("policies for retention", "The retention policy applies to every doc."),
+        ("postgres replicas", "Nothing relevant here."),
+    ]
+    for question, text in cases:
+        terms = main._extract_key_terms(question)
+        pattern, implied = main._term_matcher(tuple(terms))
+        matched: set[str] = set()
+        for m in pattern.finditer(text.lower()):
+            matched |= implied[m.group(1)]
+        assert sum(1 for t in terms if t in matched) == _naive_hits(question, text)
+
+    assert main._is_unrelated_question("postgres replicas", [_Chunk("Nothing relevant here.")]) is True
+    assert main._is_unrelated_question("retention policies", [_Chunk("The retention policy applies.")]) is False
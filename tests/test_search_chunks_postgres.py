@@ -21,9 +21,9 @@ class _FakePostgresConn:
     def __init__(self) -> None:
         self.in_failed_txn = False
         self.rollback_calls = 0
+        self.fallback_params: tuple[Any, ...] | None = None
 
     def execute(self, sql: str, params: tuple[Any, ...] | None = None) -> _FakeCursor:
-        _ = params
         query = " ".join(str(sql).split())
 
         if "to_tsvector('english', c.text)" in query and "plainto_tsquery('english'" in query:
@@ -31,9 +31,10 @@ class _FakePostgresConn:
             self.in_failed_txn = True
             raise RuntimeError("fts query failed")
 
-        if "FROM chunks c" in query and "ORDER BY d.updated_at DESC, c.idx ASC" in query:
+        if "FROM chunks c" in query and "c.text ILIKE" in query:
             if self.in_failed_txn:
                 raise RuntimeError("current transaction is aborted")
+            self.fallback_params = params
             return _FakeCursor(
                 [
                     {
@@ -64,6 +65,7 @@ def test_search_chunks_rolls_back_failed_postgres_search_before_fallback(monkeyp
         yield conn
 
     monkeypatch.setattr(main, "connect", _fake_connect)
+    monkeypatch.setattr(main, "connect_pooled", _fake_connect)
     monkeypatch.setattr(main, "init_db", lambda _conn: None)
 
     response = main.search_chunks(
@@ -79,3 +81,39 @@ def test_search_chunks_rolls_back_failed_postgres_search_before_fallback(monkeyp
     assert row.chunk_id == "doc-1__00001"
     assert row.doc_id == "doc-1"
     assert row.tags == ["ops"]
+    # The fallback filters candidates in SQL with one pattern per term and no row limit.
+    assert conn.fallback_params == ("default", "%tenant%", "%policy%")
+
+
+def test_lexical_fallback_keeps_true_matches_among_substring_hits(tmp_path, monkeypatch):
+    import sqlite3
+
+    conn = sqlite3.connect(str(tmp_path / "lexical.sqlite"))
+    conn.row_factory = sqlite3.Row
+    main.init_db(conn)
+    # The true match is the oldest doc, so it sorts after every substring-only chunk.
+    conn.execute("INSERT INTO docs(doc_id, title, source, updated_at) VALUES ('match', 'Cat', 'unit-test', 1)")
+    conn.execute("INSERT INTO chunks(chunk_id, doc_id, idx, text) VALUES ('match__0', 'match', 0, 'the cat sat')")
+    for i in range(40):
+        conn.execute(
+            "INSERT INTO docs(doc_id, title, source, updated_at) VALUES (?, 'Catalog', 'unit-test', ?)",
+            (f"flood-{i}", 100 + i),
+        )
+        conn.execute(
+            "INSERT INTO chunks(chunk_id, doc_id, idx, text) VALUES (?, ?, 0, 'category catalog scattered')",
+            (f"flood-{i}__0", f"flood-{i}"),
+        )
+    conn.commit()
+
+    @contextmanager
+    def _fake_connect(_sqlite_path: str):
+        yield conn
+
+    monkeypatch.setattr(main, "connect_pooled", _fake_connect)
+    # Force the lexical fallback even where FTS5 is available.
+    monkeypatch.setattr(main, "_FTS_CHUNK_SQL", "SELECT * FROM no_such_table")
+
+    response = main.search_chunks(q="cat", limit=1, _auth=SimpleNamespace(tenant_id="default"))
+
+    assert [r.chunk_id for r in response.results] == ["match__0"]
+    assert response.results[0].score == 1.0
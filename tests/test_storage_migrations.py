@@ -1,7 +1,7 @@
 import sqlite3
 from pathlib import Path
 
-from app.storage import connect, init_db
+from app.storage import connect, delete_doc, get_stats_agg, init_db, top_doc_tags, update_doc_metadata, upsert_doc
 
 
 def test_init_db_migrates_older_docs_schema(tmp_path: Path):
@@ -29,7 +29,9 @@ def test_init_db_migrates_older_docs_schema(tmp_path: Path):
     with connect(str(db_path)) as c:
         init_db(c)
         cols = {r["name"] for r in c.execute("PRAGMA table_info(docs)").fetchall()}
+        journal_mode = c.execute("PRAGMA journal_mode").fetchone()[0]
 
+    assert journal_mode == "wal"
     # Newer columns should be present after migration.
     assert "classification" in cols
     assert "retention" in cols
@@ -158,3 +160,114 @@ def test_init_db_creates_eval_runs_table(tmp_path: Path):
     assert "diff_from_prev_json" in cols
     assert "details_json" in cols
     assert "error" in cols
+
+
+def test_init_db_backfills_doc_tags_and_keeps_them_in_sync(tmp_path: Path):
+    db_path = tmp_path / "doc_tags.sqlite"
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE docs (
+            doc_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            source TEXT NOT NULL,
+            tags_json TEXT NOT NULL DEFAULT '[]',
+            created_at INTEGER NOT NULL
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO docs(doc_id, title, source, tags_json, created_at) VALUES(?, ?, ?, ?, ?)",
+        [
+            ("doc1", "One", "s", '["Ops", "runbook"]', 1700000000),
+            ("doc2", "Two", "s", '["ops", " "]', 1700000000),
+            ("doc3", "Three", "s", "not json", 1700000000),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    with connect(str(db_path)) as c:
+        init_db(c)
+        assert top_doc_tags(c) == [("ops", 2), ("runbook", 1)]
+
+        update_doc_metadata(c, doc_id="doc2", tags_json='["runbook", "faq"]')
+        assert top_doc_tags(c) == [("runbook", 2), ("faq", 1), ("ops", 1)]
+
+        delete_doc(c, "doc1")
+        c.commit()
+        assert top_doc_tags(c) == [("faq", 1), ("runbook", 1)]
+
+
+def test_stats_agg_tracks_doc_writes(tmp_path: Path):
+    with connect(str(tmp_path / "stats_agg.sqlite")) as c:
+        init_db(c)
+        upsert_doc(c, doc_id="a", title="A", source="s", classification="public", retention="30d")
+        upsert_doc(c, doc_id="b", title="B", source="s", classification="internal", retention="30d")
+        assert get_stats_agg(c) == {
+            "classification": {"public": 1, "internal": 1},
+            "retention": {"30d": 2},
+        }
+
+        # Re-ingest (upsert conflict) and metadata updates move counts between values.
+        upsert_doc(c, doc_id="a", title="A2", source="s", classification="internal", retention="30d")
+        update_doc_metadata(c, doc_id="b", retention="indefinite")
+        assert get_stats_agg(c) == {
+            "classification": {"internal": 2},
+            "retention": {"30d": 1, "indefinite": 1},
+        }
+
+        delete_doc(c, "a")
+        assert get_stats_agg(c) == {"classification": {"internal": 1}, "retention": {"indefinite": 1}}
+
+
+def test_init_db_skips_ddl_once_file_is_initialized(tmp_path: Path):
+    db_path = tmp_path / "guard.sqlite"
+
+    with connect(str(db_path)) as c:
+        init_db(c)
+        statements: list[str] = []
+        c.set_trace_callback(statements.append)
+        init_db(c)
+        c.set_trace_callback(None)
+    assert not any("CREATE" in s for s in statements)
+
+    # A file recreated at the same path starts at schema_version 0 and is initialized again.
+    db_path.unlink()
+    with connect(str(db_path)) as c:
+        init_db(c)
+        tables = {r["name"] for r in c.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+    assert {"docs", "chunks", "doc_tags", "stats_agg"} <= tables
+
+
+def test_stats_breakdowns_group_on_read_for_postgres():
+    class _Cursor:
+        def __init__(self, rows):
+            self._rows = rows
+
+        def fetchall(self):
+            return self._rows
+
+    class _FakePostgresConn:
+        __module__ = "psycopg.fake"
+
+        def __init__(self):
+            self.queries: list[str] = []
+
+        def execute(self, sql, params=None):
+            self.queries.append(" ".join(sql.split()))
+            if "FROM doc_tags" in sql:
+                return _Cursor([{"tag": "ops", "n": 2}])
+            return _Cursor(
+                [
+                    {"dim": "classification", "value": "internal", "n": 2},
+                    {"dim": "retention", "value": "30d", "n": 2},
+                ]
+            )
+
+    conn = _FakePostgresConn()
+    assert get_stats_agg(conn, tenant_id="t") == {"classification": {"internal": 2}, "retention": {"30d": 2}}
+    assert top_doc_tags(conn, tenant_id="t") == [("ops", 2)]
+    assert not any("stats_agg" in q for q in conn.queries)
+    assert all("GROUP BY" in q for q in conn.queries)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+
+from app.storage import connect_pooled, init_db
+
+
+def test_connect_pooled_reuses_connection_per_thread_and_rolls_back(tmp_path):
+    db_path = str(tmp_path / "pooled.sqlite")
+
+    with connect_pooled(db_path) as conn:
+        init_db(conn)
+        conn.execute("INSERT INTO meta(key, value) VALUES ('pool.committed', '1')")
+        conn.commit()
+        first = conn
+
+    with connect_pooled(db_path) as conn:
+        assert conn is first
+        # Left uncommitted on purpose: the pool must not leak this write.
+        conn.execute("INSERT INTO meta(key, value) VALUES ('pool.uncommitted', '1')")
+
+    with connect_pooled(db_path) as conn:
+        keys = {r["key"] for r in conn.execute("SELECT key FROM meta WHERE key LIKE 'pool.%'").fetchall()}
+    assert keys == {"pool.committed"}
+
+    other: list[object] = []
+
+    def _worker() -> None:
+        with connect_pooled(db_path) as c:
+            other.append(c)
+
+    t = threading.Thread(target=_worker)
+    t.start()
+    t.join()
+    assert other and other[0] is not first
+
+
+def test_connect_pooled_caps_pooled_connections(tmp_path, monkeypatch):
+    import gc
+
+    import app.storage as storage
+
+    db_path = str(tmp_path / "capped.sqlite")
+    monkeypatch.setattr(storage, "_pool_slots", threading.BoundedSemaphore(1))
+    holder_ready, holder_done = threading.Event(), threading.Event()
+    seen: dict[str, list[object]] = {"holder": [], "overflow": [], "later": []}
+
+    def _use(name: str) -> None:
+        for _ in range(2):
+            with connect_pooled(db_path) as c:
+                init_db(c)
+                seen[name].append(c)
+
+    def _holder() -> None:
+        _use("holder")
+        holder_ready.set()
+        holder_done.wait(5)
+
+    holder = threading.Thread(target=_holder)
+    holder.start()
+    assert holder_ready.wait(5)
+
+    # The only slot is taken, so this thread gets a fresh connection per call.
+    overflow = threading.Thread(target=_use, args=("overflow",))
+    overflow.start()
+    overflow.join()
+    assert seen["holder"][0] is seen["holder"][1]
+    assert seen["overflow"][0] is not seen["overflow"][1]
+
+    # The slot is returned once the holding thread exits.
+    holder_done.set()
+    holder.join()
+    gc.collect()
+    later = threading.Thread(target=_use, args=("later",))
+    later.start()
+    later.join()
+    assert seen["later"][0] is seen["later"][1]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import importlib
 import json
 import os
+import threading
 
+import pytest
 from fastapi.testclient import TestClient
 
 
@@ -97,9 +100,9 @@ def test_sse_event_helper_emits_well_formed_frame(tmp_path):
     main = _reload_app(str(tmp_path / "stream_frame.sqlite"), citations_required=True)
     frame = main._sse_event("token", {"text": "hello"})
 
-    assert frame.startswith("event: token\n")
-    assert frame.endswith("\n\n")
-    assert _parse_sse(frame) == [("token", {"text": "hello"})]
+    assert frame.startswith(b"event: token\n")
+    assert frame.endswith(b"\n\n")
+    assert _parse_sse(frame.decode("utf-8")) == [("token", {"text": "hello"})]
 
 
 def test_query_stream_preserves_citations_required_refusal(tmp_path):
@@ -162,9 +165,47 @@ def test_query_stream_prefers_provider_native_stream_when_available(tmp_path):
 
     events = _parse_sse(body)
     token_texts = [str(payload.get("text", "")) for name, payload in events if name == "token" and isinstance(payload, dict)]
-    assert token_texts[:3] == ["Cloud", " Run", " streams."]
+    # The first delta is sent on its own; later ones may be coalesced into fewer frames.
+    assert token_texts[0] == "Cloud"
+    assert "".join(token_texts) == "Cloud Run streams."
 
     done = events[-1][1]
     assert isinstance(done, dict)
     assert done.get("provider") == "mock-stream-provider"
     assert done.get("refused") is False
+
+
+def test_coalesced_stream_flushes_buffer_while_provider_stalls(tmp_path):
+    main = _reload_app(str(tmp_path / "stream_stall.sqlite"), citations_required=True)
+    release = threading.Event()
+
+    def _provider():
+        yield "first"
+        yield " second"
+        # Stall without sending another delta; buffered text must not wait for it.
+        assert release.wait(5)
+        yield " third"
+
+    async def _run() -> list[str]:
+        pieces = main._coalesce_stream_pieces(_provider())
+        out = [await pieces.__anext__()]
+        out.append(await asyncio.wait_for(pieces.__anext__(), timeout=1.0))
+        release.set()
+        out.extend([p async for p in pieces])
+        return out
+
+    assert asyncio.run(_run()) == ["first", " second", " third"]
+
+
+def test_coalesced_stream_reraises_provider_errors(tmp_path):
+    main = _reload_app(str(tmp_path / "stream_error.sqlite"), citations_required=True)
+
+    def _provider():
+        yield "partial"
+        raise RuntimeError("provider failed")
+
+    async def _run() -> list[str]:
+        return [p async for p in main._coalesce_stream_pieces(_provider())]
+
+    with pytest.raises(RuntimeError, match="provider failed"):
+        asyncio.run(_run())
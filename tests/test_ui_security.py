@@ -1,7 +1,14 @@
 from pathlib import Path
 
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
 
 
 def test_ui_fallback_blocks_path_traversal(tmp_path, monkeypatch):
@@ -20,22 +27,60 @@ def test_ui_fallback_blocks_path_traversal(tmp_path, monkeypatch):
     monkeypatch.setattr(main, "DIST_DIR", Path(dist).resolve())
 
     # A traversal attempt should never return the secret file.
-    resp = main.ui_fallback("../secret.txt")
+    resp = main.ui_fallback("../secret.txt", _request())
 
     # The SPA fallback should serve index.html instead.
-    try:
-        path = Path(getattr(resp, "path"))
-    except Exception:
-        pytest.fail("ui_fallback did not return a FileResponse-like object")
-
-    assert path.resolve() == (dist / "index.html").resolve()
+    assert resp.status_code == 200
+    assert resp.body == b"INDEX"
+    for attempt in ("assets/../../secret.txt", str(secret), "..", "./../secret.txt"):
+        assert main.ui_fallback(attempt, _request()).body == b"INDEX"
 
     # A normal asset should be served from dist.
-    resp2 = main.ui_fallback("favicon.svg")
+    resp2 = main.ui_fallback("favicon.svg", _request())
     path2 = Path(getattr(resp2, "path")).resolve()
     assert path2 == (dist / "favicon.svg").resolve()
 
 
+def test_ui_fallback_reserves_api_roots_by_segment(tmp_path, monkeypatch):
+    from app import main
+
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text("INDEX", encoding="utf-8")
+    monkeypatch.setattr(main, "DIST_DIR", Path(dist).resolve())
+
+    for path in ("api", "api/missing", "openapi.json", "redoc", "health/x"):
+        with pytest.raises(HTTPException) as exc:
+            main.ui_fallback(path, _request())
+        assert exc.value.status_code == 404
+
+    # Client-side routes that merely start with a reserved word are SPA routes.
+    for path in ("apiary", "healthcheck-guide", "docs/api"):
+        assert main.ui_fallback(path, _request()).body == b"INDEX"
+
+
+def test_ui_index_is_cached_with_etag(tmp_path, monkeypatch):
+    from app import main
+
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text("INDEX v1", encoding="utf-8")
+    monkeypatch.setattr(main, "DIST_DIR", Path(dist).resolve())
+
+    resp = main.ui_index(_request())
+    etag = resp.headers["etag"]
+    assert resp.body == b"INDEX v1"
+    assert resp.headers["cache-control"] == "no-cache"
+
+    assert main.ui_index(_request({"If-None-Match": etag})).status_code == 304
+
+    # A rebuild is picked up without a restart.
+    (dist / "index.html").write_text("INDEX v2!", encoding="utf-8")
+    resp2 = main.ui_index(_request({"If-None-Match": etag}))
+    assert resp2.status_code == 200
+    assert resp2.body == b"INDEX v2!"
+
+
 def test_swagger_csp_allows_fastapi_default_cdn_assets():
     from app import main
 
@@ -47,3 +92,52 @@ def test_swagger_csp_allows_fastapi_default_cdn_assets():
     # FastAPI's default Swagger UI template references jsDelivr assets.
     assert "https://cdn.jsdelivr.net" in csp
     assert "script-src" in csp
+
+
+def test_ui_index_serves_precompressed_gzip(tmp_path, monkeypatch):
+    import gzip
+
+    from app import main
+
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    html = "<html>" + "<script src='/assets/app.js'></script>" * 50 + "</html>"
+    (dist / "index.html").write_text(html, encoding="utf-8")
+    monkeypatch.setattr(main, "DIST_DIR", Path(dist).resolve())
+
+    plain = main.ui_index(_request())
+    assert plain.body == html.encode("utf-8")
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    gz = main.ui_index(_request({"Accept-Encoding": "gzip, br"}))
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(gz.body) == html.encode("utf-8")
+    assert gz.headers["etag"] != plain.headers["etag"]
+
+    not_modified = main.ui_index(_request({"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]}))
+    assert not_modified.status_code == 304
+    assert main.ui_index(_request({"If-None-Match": gz.headers["etag"]})).status_code == 200
+
+
+def test_hashed_assets_are_served_immutable(tmp_path):
+    from starlette.applications import Starlette
+
+    from app import main
+
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-3f2a1b.js").write_text("console.log(1)", encoding="utf-8")
+
+    app = Starlette()
+    app.mount("/assets", main._ImmutableStaticFiles(directory=str(assets)), name="assets")
+    client = TestClient(app)
+
+    r = client.get("/assets/index-3f2a1b.js")
+    assert r.status_code == 200
+    assert r.text == "console.log(1)"
+    assert r.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    revalidate = client.get("/assets/index-3f2a1b.js", headers={"If-None-Match": r.headers["etag"]})
+    assert revalidate.status_code == 304
+    assert client.get("/assets/missing.js").status_code == 404